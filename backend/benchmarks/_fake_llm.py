@@ -0,0 +1,170 @@
+"""Deterministic stand-in for Gemini, for offline benchmark runs.
+
+`ScriptedLlm` answers like the production agents would on a happy path,
+without a network call: the supervisor sets the language and transfers to
+a sub-agent chosen by keywords, and each sub-agent calls its tool once
+and then replies, or hands a message meant for another agent back to the
+supervisor. Responses depend only on the request, so runs are
+repeatable and the framework's own overhead can be measured.
+"""
+
+import asyncio
+import re
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from src.tools.status_fast_path import detect_language
+
+SUPERVISOR = "supervisor_agent"
+
+# Keyword routes of the supervisor, checked in order
+ROUTES = (
+    (
+        re.compile(r"status|ticket|GEN-?\d+|තත්ත්වය|நிலை", re.IGNORECASE),
+        "status_check_agent",
+    ),
+    (
+        re.compile(r"complain|problem|not working|refund", re.IGNORECASE),
+        "complaint_flow_agent",
+    ),
+)
+DEFAULT_ROUTE = "knowledge_base_agent"
+ROUTED_AGENTS = {agent for _, agent in ROUTES} | {DEFAULT_ROUTE}
+
+# Tool call made by each sub-agent, with arguments built from the message
+TOOL_CALLS = {
+    "knowledge_base_agent": lambda message, user_id: (
+        "query_knowledge_base",
+        {"query": message},
+    ),
+    "knowledge_base_agent_multi": lambda message, user_id: (
+        "query_knowledge_base",
+        {"query": message},
+    ),
+    "status_check_agent": lambda message, user_id: (
+        "get_user_tickets",
+        {"user_id": user_id},
+    ),
+    "complaint_flow_agent": lambda message, user_id: (
+        "create_jira_ticket",
+        {
+            "user_id": user_id,
+            "summary": message[:60],
+            "description": message,
+            "issue_type": "Task",
+        },
+    ),
+}
+
+_CONTEXT_PREFIX = "For context:"
+
+
+def route(message: str) -> str:
+    """Return the sub-agent the supervisor transfers a message to."""
+    for pattern, agent in ROUTES:
+        if pattern.search(message):
+            return agent
+    return DEFAULT_ROUTE
+
+
+class ScriptedLlm(BaseLlm):
+    """Scripted model for one agent of the tree.
+
+    Attributes:
+        agent_name: Agent this model answers for
+        user_id: User ID passed to ticket tools
+        latency_seconds: Simulated time to first token
+        calls: Number of requests answered
+    """
+
+    agent_name: str
+    user_id: str = "offline-user"
+    latency_seconds: float = 0.0
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Answer the request with the next scripted step."""
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        part = self._next_part(llm_request)
+        prompt_chars = sum(
+            len(p.text or "")
+            for content in llm_request.contents
+            for p in content.parts or []
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_chars // 4 + 1,
+                candidates_token_count=len(part.text or "") // 4 + 1,
+            ),
+        )
+
+    def _next_part(self, llm_request: LlmRequest) -> types.Part:
+        """Decide the next step from the last message and tool response."""
+        message = _customer_message(llm_request) or ""
+        response = _last_function_response(llm_request)
+
+        if self.agent_name == SUPERVISOR:
+            if response == "set_language":
+                return types.Part.from_function_call(
+                    name="transfer_to_agent",
+                    args={"agent_name": route(message)},
+                )
+            return types.Part.from_function_call(
+                name="set_language",
+                args={"language": detect_language(message)},
+            )
+
+        if (
+            response is None
+            and self.agent_name in ROUTED_AGENTS
+            and route(message) != self.agent_name
+        ):
+            return types.Part.from_function_call(
+                name="transfer_to_agent", args={"agent_name": SUPERVISOR}
+            )
+
+        tool_call = TOOL_CALLS.get(self.agent_name)
+        if tool_call is None or response is not None:
+            return types.Part.from_text(
+                text=f"[{self.agent_name}] Here is what I found for: "
+                f"{message[:80]}"
+            )
+        name, args = tool_call(message, self.user_id)
+        return types.Part.from_function_call(name=name, args=args)
+
+
+def _customer_message(llm_request: LlmRequest) -> Optional[str]:
+    """Return the latest message written by the customer.
+
+    Other agents' turns are also sent as user content, starting with a
+    "For context:" part, and are skipped.
+    """
+    for content in reversed(llm_request.contents):
+        parts = content.parts or []
+        if content.role != "user" or not parts:
+            continue
+        if parts[0].text and parts[0].text.startswith(_CONTEXT_PREFIX):
+            continue
+        for part in parts:
+            if part.text:
+                return part.text
+    return None
+
+
+def _last_function_response(llm_request: LlmRequest) -> Optional[str]:
+    """Return the tool name if the request ends with its response."""
+    if not llm_request.contents:
+        return None
+    for part in llm_request.contents[-1].parts or []:
+        if part.function_response is not None:
+            return part.function_response.name
+    return None
@@ -0,0 +1,116 @@
+"""Run the real agent App offline, for benchmarks.
+
+The App keeps its agents, callbacks, plugins and tools; only the edges
+that leave the process are replaced: each agent's Gemini model by a
+`ScriptedLlm`, the Jira session by a `LocalJiraSession` and the RAG
+corpus query by a canned answer, each with a configurable latency.
+"""
+
+import contextlib
+import os
+import sys
+import time
+from typing import Any, Iterator
+from unittest.mock import patch
+
+OFFLINE_ENV = {
+    "OBSERVABILITY_ENABLED": "false",
+    "JIRA_PROJECT": "GEN",
+    "JIRA_CLOUD": "offline",
+    "JIRA_TOKEN": "offline",
+    "JIRA_EMAIL": "offline@example.com",
+    "PROJECT": "offline-project",
+    "CORPUS_ID": "offline-corpus",
+}
+
+KB_ANSWER = (
+    "Found 1 relevant results:\n\nResult 1 (relevance: 0.92):\n"
+    "Settlements are made to the registered bank account within two "
+    "working days of the transaction."
+)
+
+
+def walk_agents(agent: Any) -> Iterator[Any]:
+    """Yield an agent and all of its sub-agents."""
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from walk_agents(sub_agent)
+
+
+@contextlib.contextmanager
+def offline_app(
+    model_latency: float = 0.0,
+    jira_latency: float = 0.0,
+    rag_latency: float = 0.0,
+    user_id: str = "offline-user",
+) -> Iterator[Any]:
+    """Patch the agent App to run without network calls.
+
+    Args:
+        model_latency: Seconds each model call waits before answering
+        jira_latency: Seconds each Jira request blocks, as `requests` does
+        rag_latency: Seconds each corpus query blocks
+        user_id: User ID the scripted models pass to the ticket tools
+
+    Yields:
+        The App, with every change undone on exit
+    """
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch.dict(os.environ, OFFLINE_ENV))
+        from benchmarks._fake_llm import ScriptedLlm
+
+        from src.agents.agent import app
+        from src.utils.local_clients import LocalJiraSession
+
+        # The agents import the tools through the `tools` package path
+        get_config = sys.modules["tools.config"].get_config
+        get_config.cache_clear()
+        stack.callback(get_config.cache_clear)
+        ticket = sys.modules["tools.ticket"]
+        rag_engine = sys.modules["tools.rag_engine"]
+
+        def query_corpus(query: str, config: Any) -> str:
+            if rag_latency:
+                time.sleep(rag_latency)
+            return KB_ANSWER
+
+        jira = LocalJiraSession(latency=jira_latency)
+        stack.enter_context(patch.object(ticket, "_http", lambda: jira))
+        stack.enter_context(
+            patch.object(rag_engine, "_query_corpus", query_corpus)
+        )
+        rag_engine._results.clear()
+        stack.callback(rag_engine._results.clear)
+
+        for agent in walk_agents(app.root_agent):
+            model = ScriptedLlm(
+                model=agent.model,
+                agent_name=agent.name,
+                user_id=user_id,
+                latency_seconds=model_latency,
+            )
+            stack.enter_context(patch.object(agent, "model", model))
+        yield app
+
+
+async def send(runner: Any, user_id: str, session_id: str, text: str) -> list:
+    """Send one customer message and collect the events of the turn.
+
+    Args:
+        runner: Runner serving the App
+        user_id: Session user
+        session_id: Existing session
+        text: Customer message
+
+    Returns:
+        Events yielded by the runner, each paired with its arrival time
+    """
+    from google.genai import types
+
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    events = []
+    async for event in runner.run_async(
+        user_id=user_id, session_id=session_id, new_message=message
+    ):
+        events.append((time.perf_counter(), event))
+    return events
@@ -0,0 +1,44 @@
+"""Synthetic agent spans shared by the benchmarks."""
+
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+
+def make_turn_spans(
+    turns: int = 20, spans_per_turn: int = 40, prompt_chars: int = 4000
+) -> list[ReadableSpan]:
+    """Create finished spans resembling agent turns.
+
+    Args:
+        turns: Number of traces (agent turns) to create
+        spans_per_turn: Spans per turn, including the root span
+        prompt_chars: Size of the LLM prompt attribute on model spans
+
+    Returns:
+        Finished spans in end order
+    """
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    tracer = provider.get_tracer("benchmark")
+
+    for turn in range(turns):
+        with tracer.start_as_current_span("invocation") as root:
+            root.set_attribute("gen_ai.operation.name", "invoke_agent")
+            for i in range(spans_per_turn - 1):
+                with tracer.start_as_current_span(f"call_llm {i}") as span:
+                    span.set_attributes(
+                        {
+                            "gcp.vertex.agent.invocation_id": f"e-{turn}",
+                            "gen_ai.request.model": "gemini-2.5-flash",
+                            "gcp.vertex.agent.llm_request": "p" * prompt_chars,
+                            "gcp.vertex.agent.llm_response": "r"
+                            * (prompt_chars // 4),
+                            "gen_ai.usage.input_tokens": 1200,
+                        }
+                    )
+
+    return list(memory.get_finished_spans())
@@ -0,0 +1,130 @@
+"""Benchmark the agent App end to end without network calls.
+
+Runs the real App (supervisor, sub-agents, callbacks, plugins and tools)
+with scripted models and local Jira and RAG stand-ins, see `_offline.py`.
+SESSIONS simulated customers talk concurrently, TURNS messages each,
+cycling through knowledge-base, complaint, status and Sinhala or Tamil
+messages. Reports:
+
+- turns per second over the whole run;
+- p50/p95 latency per agent hop: the time from the previous event of the
+  turn to each event, attributed to the agent that authored it;
+- memory growth: how much the peak resident set size of the process
+  grew during the run and, with --tracemalloc (about 10x slower), the
+  Python allocations still held after it.
+
+With zero simulated latency the numbers measure the framework and this
+repo's own per-turn overhead; raise the latencies to see how it behaves
+while waiting on I/O.
+
+Usage:
+    python backend/benchmarks/bench_agent_throughput.py [--tracemalloc]
+"""
+
+import asyncio
+import logging
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks._offline import offline_app, send
+
+SESSIONS = 50
+TURNS = 8
+MODEL_LATENCY = 0.0
+JIRA_LATENCY = 0.0
+RAG_LATENCY = 0.0
+
+MESSAGES = (
+    "How long does a settlement take to reach my bank account?",
+    "My card payment is not working, I want a refund",
+    "What is the status of my tickets?",
+    "මගේ ගෙවීම් ගිණුමට බැර වන්නේ කවදාද?",
+    "How do I change the registered mobile number?",
+    "என் டிக்கெட் நிலை என்ன?",
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def customer(runner, index: int, hops: dict) -> int:
+    """Hold one session for TURNS messages and record hop latencies."""
+    user_id = f"customer-{index}"
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id
+    )
+    for turn in range(TURNS):
+        text = MESSAGES[(index + turn) % len(MESSAGES)]
+        previous = time.perf_counter()
+        for arrived, event in await send(runner, user_id, session.id, text):
+            hops[event.author].append(arrived - previous)
+            previous = arrived
+    return TURNS
+
+
+def max_rss_mib() -> float:
+    """Return the peak resident set size of the process in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(app, trace_memory: bool) -> dict:
+    """Run all sessions concurrently and collect the measurements."""
+    from google.adk.runners import InMemoryRunner
+
+    runner = InMemoryRunner(app=app)
+    hops: dict[str, list[float]] = defaultdict(list)
+
+    # One untimed session loads lazily imported modules and fills caches
+    await customer(runner, -1, defaultdict(list))
+
+    rss_before = max_rss_mib()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    turns = await asyncio.gather(
+        *(customer(runner, i, hops) for i in range(SESSIONS))
+    )
+    elapsed = time.perf_counter() - started
+    result = {
+        "turns_per_second": sum(turns) / elapsed,
+        "hops": hops,
+        "rss_growth_mib": max_rss_mib() - rss_before,
+    }
+    if trace_memory:
+        result["held_mib"] = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+    return result
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    trace_memory = "--tracemalloc" in sys.argv
+    print(
+        f"{SESSIONS} sessions x {TURNS} turns, latency: model "
+        f"{MODEL_LATENCY * 1000:.0f} ms, Jira {JIRA_LATENCY * 1000:.0f} ms, "
+        f"RAG {RAG_LATENCY * 1000:.0f} ms"
+    )
+    with offline_app(MODEL_LATENCY, JIRA_LATENCY, RAG_LATENCY) as app:
+        result = asyncio.run(run(app, trace_memory))
+
+    print(f"  throughput  {result['turns_per_second']:8.1f} turns/s")
+    for author, times in sorted(result["hops"].items()):
+        print(
+            f"  {author:24} {len(times):6d} events  "
+            f"p50 {statistics.median(times) * 1000:6.2f} ms  "
+            f"p95 {percentile(times, 95) * 1000:6.2f} ms"
+        )
+    memory = f"  memory      +{result['rss_growth_mib']:.1f} MiB peak RSS"
+    if trace_memory:
+        memory += f", {result['held_mib']:.1f} MiB held by Python objects"
+    print(memory)
@@ -0,0 +1,74 @@
+"""Benchmark the cold-start cost of importing the agent package.
+
+Compares the previous import-time setup (blocking Langfuse auth check and
+ADK instrumentation while importing `agents.agent`) with the current lazy
+setup, each in a fresh interpreter. Langfuse points at an unreachable
+host to show the stall a network outage used to cause.
+
+Usage:
+    python backend/benchmarks/bench_import_time.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+RUNS = 3
+
+ENV = {
+    "JIRA_PROJECT": "GEN",
+    "JIRA_CLOUD": "example",
+    "JIRA_TOKEN": "token",
+    "JIRA_EMAIL": "bench@example.com",
+    "LANGFUSE_PUBLIC_KEY": "pk-lf-bench",
+    "LANGFUSE_SECRET_KEY": "sk-lf-bench",
+    # Non-routable address: connections hang until the client times out
+    "LANGFUSE_BASE_URL": "http://10.255.255.1",
+}
+
+EAGER = """
+import time
+started = time.perf_counter()
+import agents.agent
+from langfuse import get_client
+from openinference.instrumentation.google_adk import GoogleADKInstrumentor
+try:
+    get_client().auth_check()
+except Exception:
+    pass
+GoogleADKInstrumentor().instrument()
+print(time.perf_counter() - started)
+"""
+
+LAZY = """
+import time
+started = time.perf_counter()
+import agents.agent
+print(time.perf_counter() - started)
+"""
+
+
+def measure(code: str) -> float:
+    """Return the median seconds reported by fresh interpreters."""
+    env = os.environ | ENV
+    samples = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    print(f"Importing agents.agent, median of {RUNS} fresh interpreters")
+    for label, code in (("eager setup", EAGER), ("lazy setup", LAZY)):
+        print(f"  {label:<12} {measure(code) * 1000:8.0f} ms")
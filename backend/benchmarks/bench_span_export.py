@@ -0,0 +1,54 @@
+"""Benchmark span export against a local fake Cloud Logging client.
+
+Compares one write per span (max_batch_entries=1, the previous behaviour)
+with batched writes per export call.
+
+Usage:
+    python backend/benchmarks/bench_span_export.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks._spans import make_turn_spans
+
+from src.utils.local_clients import LocalLoggingClient, LocalStorageClient
+from src.utils.tracing import CloudTraceLoggingSpanExporter
+
+# Simulated round trip of one entries.write request
+API_LATENCY = 0.005
+EXPORT_BATCH = 512  # BatchSpanProcessor default max_export_batch_size
+
+
+def run(max_batch_entries: int) -> tuple[float, int]:
+    """Export the synthetic spans and return (seconds, API calls)."""
+    spans = make_turn_spans()
+    logging_client = LocalLoggingClient(latency=API_LATENCY)
+    exporter = CloudTraceLoggingSpanExporter(
+        project_id="benchmark",
+        logging_client=logging_client,
+        storage_client=LocalStorageClient(),
+        max_batch_entries=max_batch_entries,
+    )
+
+    started = time.perf_counter()
+    for i in range(0, len(spans), EXPORT_BATCH):
+        exporter.export(spans[i : i + EXPORT_BATCH])
+    elapsed = time.perf_counter() - started
+
+    assert len(logging_client.entries) == len(spans)
+    return elapsed, logging_client.api_calls
+
+
+if __name__ == "__main__":
+    spans = len(make_turn_spans())
+    print(f"Exporting {spans} spans, {API_LATENCY * 1000:.0f} ms per API call")
+    for label, entries in (("per span", 1), ("batched", 1000)):
+        elapsed, calls = run(entries)
+        print(
+            f"  {label:<9} {elapsed * 1000:8.1f} ms  {calls:4d} API calls  "
+            f"{elapsed / spans * 1e6:8.1f} us/span"
+        )
@@ -0,0 +1,66 @@
+"""Benchmark span serialization in the Cloud Logging exporter.
+
+Compares the previous JSON round trip (`to_json()` + `json.loads`, then
+`json.dumps` to measure the attributes and the entry) with `span_to_dict`,
+reporting CPU time and allocations per span.
+
+Usage:
+    python backend/benchmarks/bench_span_serialization.py
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks._spans import make_turn_spans
+
+from src.utils.tracing import span_to_dict
+
+ROUNDS = 5
+
+
+def round_trip(span: Any) -> int:
+    """Serialize a span the way the exporter used to."""
+    span_dict = json.loads(span.to_json())
+    len(json.dumps(span_dict["attributes"]).encode())
+    return len(json.dumps(span_dict))
+
+
+def single_pass(span: Any) -> int:
+    """Serialize a span with span_to_dict."""
+    return span_to_dict(span)[2]
+
+
+def measure(convert: Callable[[Any], int], spans: list) -> tuple[float, int]:
+    """Return CPU microseconds and peak bytes allocated per span."""
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        for span in spans:
+            convert(span)
+    cpu = (time.process_time() - started) / (ROUNDS * len(spans))
+
+    tracemalloc.start()
+    allocated = 0
+    for span in spans:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        convert(span)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return cpu * 1e6, allocated // len(spans)
+
+
+if __name__ == "__main__":
+    spans = make_turn_spans()
+    print(f"Serializing {len(spans)} spans, {ROUNDS} rounds")
+    for label, convert in (
+        ("round trip", round_trip),
+        ("single pass", single_pass),
+    ):
+        cpu, allocated = measure(convert, spans)
+        print(f"  {label:<12} {cpu:8.1f} us/span  {allocated:8d} B peak/span")
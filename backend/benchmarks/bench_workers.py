@@ -0,0 +1,80 @@
+"""Benchmark agent throughput against the number of worker processes.
+
+Each worker process stands in for one Agent Engine worker (NUM_WORKERS)
+and runs the real App offline, see `_offline.py`: the supervisor,
+sub-agents, callbacks, plugins and tools, with scripted models and local
+Jira and RAG stand-ins that wait the configured latencies. SESSIONS
+simulated customers are split across the workers and talk concurrently,
+TURNS messages each, as in `bench_agent_throughput.py`. Added workers add
+capacity until the per-turn CPU work of the framework and this repo, which
+holds the GIL within a worker, saturates the available cores.
+
+Usage:
+    python backend/benchmarks/bench_workers.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks._offline import offline_app
+from benchmarks.bench_agent_throughput import TURNS, customer
+
+SESSIONS = 48
+MODEL_LATENCY = 0.05
+JIRA_LATENCY = 0.05
+RAG_LATENCY = 0.05
+WORKER_COUNTS = (1, 2, 4)
+
+
+async def _serve(app, sessions: int) -> int:
+    """Run `sessions` customers concurrently, returning the turns served."""
+    from google.adk.runners import InMemoryRunner
+
+    runner = InMemoryRunner(app=app)
+    hops: dict[str, list[float]] = defaultdict(list)
+    turns = await asyncio.gather(
+        *(customer(runner, i, hops) for i in range(sessions))
+    )
+    return sum(turns)
+
+
+def worker(sessions: int) -> int:
+    """Run one worker process, returning the turns it served."""
+    logging.disable(logging.INFO)
+    with offline_app(MODEL_LATENCY, JIRA_LATENCY, RAG_LATENCY) as app:
+        return asyncio.run(_serve(app, sessions))
+
+
+def throughput(workers: int) -> float:
+    """Return turns per second served by `workers` processes."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start the processes and run one session each before timing, so
+        # imports and lazily built state are not measured
+        list(pool.map(worker, [1] * workers))
+        started = time.perf_counter()
+        turns = sum(pool.map(worker, [SESSIONS // workers] * workers))
+        return turns / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    print(
+        f"{SESSIONS} sessions x {TURNS} turns, latency: model "
+        f"{MODEL_LATENCY * 1000:.0f} ms, Jira {JIRA_LATENCY * 1000:.0f} ms, "
+        f"RAG {RAG_LATENCY * 1000:.0f} ms, {os.cpu_count()} CPUs"
+    )
+    baseline = None
+    for workers in WORKER_COUNTS:
+        rate = throughput(workers)
+        baseline = baseline or rate
+        print(
+            f"  NUM_WORKERS={workers}  {rate:8.1f} turns/s  "
+            f"({rate / baseline:.2f}x)"
+        )
@@ -0,0 +1,199 @@
+"""Profile and check the cold-start import cost of the agent package.
+
+Imports `agents.agent` in fresh interpreters with `-X importtime` and
+prints the slowest top-level packages. With `--check` it fails when the
+import exceeds the deterministic budget recorded in `import_budget.json`:
+
+- `max_modules`: number of modules in `sys.modules` after the import.
+  Catches a new eager dependency on any machine.
+- `lazy_modules`: modules that must only be imported on first use.
+
+The budget also records `max_ms`, the median wall-clock import time on
+the machine that recorded it. Timing depends on the machine and its
+load, so exceeding it is only reported as a warning.
+
+Usage:
+    python backend/benchmarks/import_budget.py            # profile
+    python backend/benchmarks/import_budget.py --check    # regression check
+    python backend/benchmarks/import_budget.py --record   # update budget
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+BUDGET_FILE = Path(__file__).parent / "import_budget.json"
+RUNS = 5
+# Kept small so that the budget stays below the module count of the
+# release before the imports were made lazy (3542)
+MODULE_HEADROOM = 1.01
+
+ENV = {
+    "JIRA_PROJECT": "GEN",
+    "JIRA_CLOUD": "example",
+    "JIRA_TOKEN": "token",
+    "JIRA_EMAIL": "bench@example.com",
+    # Setup runs on the first invocation, not on import
+    "OBSERVABILITY_ENABLED": "false",
+}
+
+LAZY_MODULES = [
+    "langfuse",
+    "openinference.instrumentation.google_adk",
+    "google.cloud.logging",
+    "utils.tracing",
+    "utils.jsonl_exporter",
+    # Opt-in plugins, disabled by default
+    "plugins.speculative_retrieval",
+]
+
+CODE = """
+import json, sys, time
+started = time.perf_counter()
+import agents.agent
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_import(importtime: bool = False) -> tuple[dict, str]:
+    """Import the agent package in a fresh interpreter.
+
+    Args:
+        importtime: Also collect the `-X importtime` report
+
+    Returns:
+        Tuple of (measurement, importtime report on stderr)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(
+        [*command, "-c", CODE],
+        cwd=SRC,
+        env=os.environ | ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def top_packages(report: str, limit: int = 15) -> list[tuple[str, float]]:
+    """Sum self import time by top-level package.
+
+    Args:
+        report: Output of `python -X importtime`
+        limit: Number of packages to return
+
+    Returns:
+        List of (package, milliseconds), slowest first
+    """
+    totals: dict[str, float] = defaultdict(float)
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        parts = name.strip().split(".")
+        # google.* is a namespace package; group by its subpackage
+        package = ".".join(parts[:2] if parts[0] == "google" else parts[:1])
+        totals[package] += int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def measure() -> dict:
+    """Return the median import time and the imported modules."""
+    samples = []
+    modules: list[str] = []
+    for _ in range(RUNS):
+        result, _ = run_import()
+        samples.append(result["seconds"] * 1000)
+        modules = result["modules"]
+    return {
+        "ms": statistics.median(samples),
+        "modules": modules,
+    }
+
+
+def check(budget: dict, measured: dict) -> list[str]:
+    """Compare a measurement with the deterministic limits of the budget.
+
+    Returns:
+        One message per exceeded limit
+    """
+    failures = []
+    if len(measured["modules"]) > budget["max_modules"]:
+        failures.append(
+            f"{len(measured['modules'])} modules imported, "
+            f"budget is {budget['max_modules']}"
+        )
+    for name in budget["lazy_modules"]:
+        if name in measured["modules"]:
+            failures.append(f"{name} is imported eagerly")
+    return failures
+
+
+def advise(budget: dict, measured: dict) -> list[str]:
+    """Compare a measurement with the machine-dependent time budget.
+
+    Returns:
+        One message per exceeded limit, not failing the check
+    """
+    if "max_ms" in budget and measured["ms"] > budget["max_ms"]:
+        return [
+            f"import took {measured['ms']:.0f} ms, "
+            f"recorded budget is {budget['max_ms']:.0f} ms"
+        ]
+    return []
+
+
+def main() -> int:
+    """Profile, check or record the import budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true")
+    mode.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    measured = measure()
+    print(
+        f"agents.agent: {measured['ms']:.0f} ms (median of {RUNS}), "
+        f"{len(measured['modules'])} modules"
+    )
+
+    if args.record:
+        budget = {
+            "max_ms": round(measured["ms"]),
+            "max_modules": round(len(measured["modules"]) * MODULE_HEADROOM),
+            "lazy_modules": LAZY_MODULES,
+        }
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Recorded budget in {BUDGET_FILE.name}: {budget}")
+        return 0
+
+    if args.check:
+        budget = json.loads(BUDGET_FILE.read_text())
+        failures = check(budget, measured)
+        for failure in failures:
+            print(f"  OVER BUDGET: {failure}")
+        for advice in advise(budget, measured):
+            print(f"  WARNING (not checked): {advice}")
+        if not failures:
+            print("  within budget")
+        return 1 if failures else 0
+
+    _, report = run_import(importtime=True)
+    print("Slowest packages (self time):")
+    for package, ms in top_packages(report):
+        print(f"  {package:<40} {ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,82 +1,37 @@
 """Agent Engine App - Deploy agent to Google Cloud."""
 
-import copy
 import datetime
 import json
 import os
+import sys
 from pathlib import Path
-from typing import Any
 
 import vertexai
 from google.adk.artifacts import GcsArtifactService
-from google.cloud import logging as google_cloud_logging
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider, export
 from vertexai import agent_engines
-from vertexai.preview.reasoning_engines import AdkApp
 
-from src.utils.gcs import create_bucket_if_not_exists
-from src.utils.tracing import CloudTraceLoggingSpanExporter
-from src.utils.typing import Feedback
 from src.deployment_config import (
     config,
     get_deployment_config,
     initialize_vertex_ai,
 )
+from src.utils.gcs import create_bucket_if_not_exists
 
 # Initialize Vertex AI before importing agents
 initialize_vertex_ai(config)
 
-from src.agents.agent import app
-
+# The app and the agents are imported through the source directory, as in
+# deploy.py and in the deployed workers, so both scripts deploy the same
+# `engine_app.AgentEngineApp` and share one copy of the agents' state
+sys.path.insert(0, str(Path(__file__).parent))
 
-class AgentEngineApp(AdkApp):
-    """ADK Application wrapper for Agent Engine deployment."""
-
-    def set_up(self) -> None:
-        """Set up logging and tracing."""
-        super().set_up()
-        logging_client = google_cloud_logging.Client()
-        self.logger = logging_client.logger(__name__)
-        provider = TracerProvider()
-        processor = export.BatchSpanProcessor(
-            CloudTraceLoggingSpanExporter(
-                project_id=os.environ.get("GOOGLE_CLOUD_PROJECT"),
-                service_name=f"{config.deployment_name}-service",
-            )
-        )
-        provider.add_span_processor(processor)
-        trace.set_tracer_provider(provider)
-        self.enable_tracing = True
-
-    def register_feedback(self, feedback: dict[str, Any]) -> None:
-        """Collect and log feedback from users."""
-        feedback_obj = Feedback.model_validate(feedback)
-        self.logger.log_struct(feedback_obj.model_dump(), severity="INFO")
-
-    def register_operations(self) -> dict[str, list[str]]:
-        """Register available operations."""
-        operations = super().register_operations()
-        operations[""] = operations[""] + ["register_feedback"]
-        return operations
-
-    def clone(self) -> "AgentEngineApp":
-        """Create a copy of this application."""
-        template_attributes = self._tmpl_attrs
-
-        return self.__class__(
-            agent=copy.deepcopy(template_attributes["agent"]),
-            enable_tracing=bool(
-                template_attributes.get("enable_tracing", False)
-            ),
-            session_service_builder=template_attributes.get(
-                "session_service_builder"
-            ),
-            artifact_service_builder=template_attributes.get(
-                "artifact_service_builder"
-            ),
-            env_vars=template_attributes.get("env_vars"),
-        )
+from agents.agent import app, root_agent
+from engine_app import (
+    AgentEngineApp,
+    bounded_session_service,
+    forwarded_env_vars,
+)
+from tools.config import get_config
 
 
 def deploy_agent_engine_app() -> agent_engines.AgentEngine:
@@ -94,25 +49,29 @@ def deploy_agent_engine_app() -> agent_engines.AgentEngine:
     print(f"📋 Staging bucket: {deployment_config.staging_bucket}")
 
     env_vars = {
-        "NUM_WORKERS": "1",
+        # Worker processes per instance; each has its own clients and caches
+        "NUM_WORKERS": str(deployment_config.num_workers),
         "GOOGLE_GENAI_USE_VERTEXAI": "True",
+        "PYTHONPATH": "/code/backend/src",
     }
 
     if deployment_config.corpus_id:
         env_vars["CORPUS_ID"] = deployment_config.corpus_id
         print(f"📋 Corpus ID: {deployment_config.corpus_id}")
-    
+
+    env_vars.update(forwarded_env_vars())
+
     # Add Langfuse credentials if available
     langfuse_secret = os.environ.get("LANGFUSE_SECRET_KEY")
     langfuse_public = os.environ.get("LANGFUSE_PUBLIC_KEY")
     langfuse_url = os.environ.get("LANGFUSE_BASE_URL")
-    
+
     if langfuse_secret and langfuse_public:
         env_vars["LANGFUSE_SECRET_KEY"] = langfuse_secret
         env_vars["LANGFUSE_PUBLIC_KEY"] = langfuse_public
         if langfuse_url:
             env_vars["LANGFUSE_BASE_URL"] = langfuse_url
-    
+
     # Add JIRA credentials if available
     jira_project = os.environ.get("JIRA_PROJECT")
     if jira_project:
@@ -143,8 +102,18 @@ def deploy_agent_engine_app() -> agent_engines.AgentEngine:
     with open(deployment_config.requirements_file) as f:
         requirements = f.read().strip().split("\n")
 
+    # Sessions live in each worker, with bounded memory, instead of the
+    # managed session service
+    session_service_builder = None
+    if get_config().session_store == "bounded":
+        session_service_builder = bounded_session_service
+
+    # AdkApp runs an agent, not an App: pass the App's plugins explicitly
     agent_engine = AgentEngineApp(
-        agent=app,
+        agent=root_agent,
+        plugins=app.plugins,
+        service_name=f"{config.deployment_name}-service",
+        session_service_builder=session_service_builder,
         artifact_service_builder=lambda: GcsArtifactService(
             bucket_name=artifacts_bucket_name
         ),
@@ -1,10 +1,11 @@
 """Supervisor Agent - Root agent for trilingual customer service."""
 
+import atexit
 import logging
 import sys
 import warnings
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 # Suppress telemetry warnings
 warnings.filterwarnings('ignore', message='Invalid type NoneType')
@@ -12,42 +13,48 @@ logging.getLogger('opentelemetry').setLevel(logging.ERROR)
 
 from google.adk.agents import Agent
 from google.adk.apps.app import App
-from google.adk.agents.context_cache_config import ContextCacheConfig
-from google.adk.plugins.context_filter_plugin import ContextFilterPlugin
 from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
-from langfuse import get_client
-from openinference.instrumentation.google_adk import GoogleADKInstrumentor
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_SRC_DIR = str(Path(__file__).parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
+from prompts.knowledge_base_prompt import KNOWLEDGE_BASE_PROMPT
+from prompts.render import prerender_prompts
 from prompts.supervisor_prompt_multi import SUPERVISOR_PROMPT
 from agents.sub_agents.knowledge_base_agent.agent import knowledge_base_agent
 from agents.sub_agents.knowledge_base_agent_multi.agent import knowledge_base_agent_multi
 from agents.sub_agents.complaint_flow_agent.agent import complaint_flow_agent
 from agents.sub_agents.status_check_agent.agent import status_check_agent
+from plugins.admission_control import (
+    KNOWLEDGE_BASE_MULTI,
+    TICKET_CREATION,
+    AdmissionController,
+)
+from plugins.cache_policy import DEFAULT_CONTEXT_CACHE_CONFIG
+from plugins.turn_deadline import TurnDeadlinePlugin
+from plugins.usage_accounting import UsageAccountingPlugin
+from tools.config import get_config
+from tools.deadline import set_deadline
+from tools.rag_engine import query_knowledge_base, warm_up_rag
 from tools.set_language import set_language
+from tools.status_fast_path import (
+    is_status_request,
+    status_fast_path_callback,
+)
+from tools.ticket import warm_up_jira
+from utils.metrics import record_tool_result
 
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from utils.warmup import WarmUp
 
-# Prevent double initialization using module-level flag
-_initialized = False
-if not _initialized:
-    #Setup langfuse observability
-    langfuse = get_client()
-     
-    # Verify connection
-    if langfuse.auth_check():
-        print("Langfuse client is authenticated and ready!")
-    else:
-        print("Authentication failed. Please check your credentials and host.")
+logger = logging.getLogger(__name__)
 
+# Langfuse and OpenTelemetry are set up on the first run (or by the deployed
+# app's set_up), so importing the agents makes no network calls
 
-    #Setup opentelemtry instrumentation
-    GoogleADKInstrumentor().instrument()
-    logger.info("OpenTelemetry instrumentation setup complete.")
-    _initialized = True
 
 async def after_tool_callback(
     tool: BaseTool,
@@ -56,6 +63,7 @@ async def after_tool_callback(
     tool_response: Dict,
 ) -> Optional[Dict]:
     """Write language to state after set_language tool is called."""
+    record_tool_result(tool.name, tool_response)
     if tool.name == "set_language":
         language = args.get("language")
         if language:
@@ -76,8 +84,107 @@ async def after_tool_callback(
 
     return None
 
+
+# Shared so the deployed app can expose the aggregated usage
+usage_accounting = UsageAccountingPlugin(
+    log_interval_seconds=get_config().usage_log_interval_seconds
+)
+
+# Shared so the deployed app can expose the deadline overruns
+turn_deadline = TurnDeadlinePlugin(
+    deadline_seconds=get_config().turn_deadline_seconds,
+    set_deadline=set_deadline,
+)
+
+
+def build_admission_control() -> AdmissionController:
+    """Build the admission controller from the config."""
+    config = get_config()
+    return AdmissionController(
+        enabled=config.admission_control,
+        user_per_minute=config.admission_user_per_minute,
+        user_burst=config.admission_user_burst,
+        global_per_minute=config.admission_global_per_minute,
+        global_burst=config.admission_global_burst,
+        max_concurrent=config.admission_max_concurrent,
+        path_per_minute={
+            TICKET_CREATION: config.admission_tickets_per_minute,
+            KNOWLEDGE_BASE_MULTI: config.admission_kb_multi_per_minute,
+        },
+    )
+
+
+# Shared by the deployed app's entry points and the tool-path plugin
+admission_control = build_admission_control()
+
+
+def build_plugins() -> list:
+    """Build the App plugins, including opt-in ones enabled by env vars.
+
+    Plugin modules are imported here, so the opt-in ones that are disabled
+    are never imported.
+    """
+    from plugins.token_budget_compaction import TokenBudgetCompactionPlugin
+    from utils.observability import ObservabilityPlugin
+
+    config = get_config()
+    # Compact history by size instead of keeping a fixed number of turns
+    plugins = [
+        ObservabilityPlugin(config),
+        TokenBudgetCompactionPlugin(max_tokens=config.context_token_budget),
+        usage_accounting,
+    ]
+
+    # Keep each turn, including its model and tool calls, within a budget
+    if config.turn_deadline_seconds > 0:
+        plugins.append(turn_deadline)
+
+    # Limit expensive tool paths per merchant
+    if config.admission_control:
+        from plugins.admission_control import AdmissionControlPlugin
+
+        plugins.append(AdmissionControlPlugin(admission_control))
+
+    # Tune cache TTL, intervals and min size per agent from observed hits
+    if config.adaptive_cache_policy:
+        from plugins.cache_policy import AdaptiveCachePolicyPlugin
+
+        plugins.append(AdaptiveCachePolicyPlugin())
+
+    # Start knowledge-base retrieval while the supervisor is still routing
+    if config.speculative_retrieval:
+        from plugins.speculative_retrieval import SpeculativeRetrievalPlugin
+
+        speculative_retrieval = SpeculativeRetrievalPlugin(
+            retrieve=query_knowledge_base, skip=is_status_request
+        )
+        atexit.register(speculative_retrieval.close)
+        plugins.append(speculative_retrieval)
+
+    return plugins
+
+
+def build_warm_up(queries: list[str]) -> "WarmUp":
+    """Build the warm-up steps for this agent's prompts and tools.
+
+    Args:
+        queries: Frequent knowledge-base questions to prime the RAG cache
+
+    Returns:
+        WarmUp to which the app can add its own steps before running it
+    """
+    from utils.warmup import WarmUp
+
+    warm_up = WarmUp()
+    warm_up.add_step(
+        "prompts", lambda: prerender_prompts([KNOWLEDGE_BASE_PROMPT])
+    )
+    warm_up.add_step("jira_connection", warm_up_jira)
+    warm_up.add_step("rag_cache", lambda: warm_up_rag(queries))
+    return warm_up
+
 # Only create agents if not already created
-if not _initialized or 'root_agent' not in dir():
+if 'root_agent' not in dir():
     root_agent = Agent(
         name="supervisor_agent",
         model="gemini-2.5-flash",
@@ -90,6 +197,7 @@ if not _initialized or 'root_agent' not in dir():
             knowledge_base_agent_multi,
         ],
         tools=[set_language],
+        before_agent_callback=status_fast_path_callback,
         after_tool_callback=after_tool_callback,
         generate_content_config=types.GenerationConfig(
             temperature=0.3,
@@ -103,18 +211,12 @@ if not _initialized or 'root_agent' not in dir():
     app = App(
         name="agents",
         root_agent=root_agent,
-        context_cache_config=ContextCacheConfig(
-            min_tokens=1500,
-            ttl_seconds=600,  # 10 mins for conversation
-            cache_intervals=5,  # Maximum invocations before cache refresh
-        ),
+        context_cache_config=DEFAULT_CONTEXT_CACHE_CONFIG,
         # events_compaction_config=EventsCompactionConfig(
         #     compaction_interval=3,
         #     overlap_size=1
         # ),
-        plugins=[
-            ContextFilterPlugin(num_invocations_to_keep=5)
-        ]
+        plugins=build_plugins(),
     )
 else:
     # Module already initialized, agents already exist
@@ -9,10 +9,14 @@ from google.adk.agents import LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+_SRC_DIR = str(Path(__file__).parent.parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from prompts.complaint_flow_prompt import COMPLAINT_FLOW_PROMPT
+from prompts.render import render_prompt
 from tools.ticket import create_jira_ticket
+from utils.metrics import agent_finished, agent_started, timed_tool
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +25,15 @@ def before_agent_callback(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
     """Read language from state and update instruction."""
+    agent_started(callback_context)
     state = callback_context.state
     if "language" not in state:
         state["language"] = "english"
 
     language = state.get("language", "english")
     user_id = state.get("user_id", None)
-    callback_context.instruction = COMPLAINT_FLOW_PROMPT.format(
-        language=language, user_id=user_id
+    callback_context.instruction = render_prompt(
+        COMPLAINT_FLOW_PROMPT, language, user_id
     )
     logger.info(
         f"ComplaintFlow Agent - Language: {language}, User ID: {user_id}"
@@ -41,8 +46,9 @@ complaint_flow_agent = LlmAgent(
     model="gemini-2.5-flash",
     instruction=COMPLAINT_FLOW_PROMPT,
     description="Agent for handling customer complaints",
-    tools=[create_jira_ticket],
+    tools=[timed_tool(create_jira_ticket)],
     before_agent_callback=before_agent_callback,
+    after_agent_callback=agent_finished,
     generate_content_config=types.GenerationConfig(
         temperature=0.3,
         top_k=40,
@@ -9,10 +9,14 @@ from google.adk.agents import LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+_SRC_DIR = str(Path(__file__).parent.parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from tools.rag_engine import query_knowledge_base
 from prompts.knowledge_base_prompt import KNOWLEDGE_BASE_PROMPT
+from prompts.render import render_prompt
+from utils.metrics import agent_finished, agent_started, timed_tool
 
 logger = logging.getLogger(__name__)
 # amazonq-ignore-next-line
@@ -21,13 +25,14 @@ def before_agent_callback(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
     """Read language from state and update instruction."""
+    agent_started(callback_context)
     state = callback_context.state
     if "language" not in state:
         state["language"] = "english"
 
     language = state.get("language", "english")
-    callback_context.instruction = KNOWLEDGE_BASE_PROMPT.format(
-        language=language
+    callback_context.instruction = render_prompt(
+        KNOWLEDGE_BASE_PROMPT, language
     )
     logger.info(f"KnowledgeBase Agent - Language: {language}")
 
@@ -38,8 +43,9 @@ knowledge_base_agent = LlmAgent(
     model="gemini-2.5-flash-lite",
     instruction=KNOWLEDGE_BASE_PROMPT,
     description="Agent for handling general inquiries",
-    tools=[query_knowledge_base],
+    tools=[timed_tool(query_knowledge_base)],
     before_agent_callback=before_agent_callback,
+    after_agent_callback=agent_finished,
     generate_content_config=types.GenerationConfig(
         temperature=0.4,
         top_k=40,
@@ -9,29 +9,39 @@ from google.adk.agents import LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+_SRC_DIR = str(Path(__file__).parent.parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
+from tools.status_fast_path import status_fast_path_callback
 from tools.ticket import get_user_tickets, get_ticket_by_key
 from prompts.status_check_prompt import STATUS_CHECK_PROMPT
+from prompts.render import render_prompt
+from utils.metrics import agent_finished, agent_started, timed_tool
 
 logger = logging.getLogger(__name__)
 
-def before_agent_callback(
+async def before_agent_callback(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
     """Read language from state and update instruction."""
+    agent_started(callback_context)
     state = callback_context.state
     if "language" not in state:
         state["language"] = "english"
 
     language = state.get("language", "english")
     user_id = state.get("user_id", None)
-    callback_context.instruction = STATUS_CHECK_PROMPT.format(
-        language=language, user_id=user_id
+    callback_context.instruction = render_prompt(
+        STATUS_CHECK_PROMPT, language, user_id
     )
     logger.info(f"StatusCheck Agent - Language: {language}, User ID: {user_id}")
 
-    return None
+    reply = await status_fast_path_callback(callback_context)
+    if reply is not None:
+        # The after-agent callback does not run when the turn ends here
+        agent_finished(callback_context)
+    return reply
 
 
 status_check_agent = LlmAgent(
@@ -39,8 +49,9 @@ status_check_agent = LlmAgent(
     model="gemini-2.5-flash",
     instruction=STATUS_CHECK_PROMPT,
     before_agent_callback=before_agent_callback,
+    after_agent_callback=agent_finished,
     description="Agent for checking ticket status",
-    tools=[get_user_tickets, get_ticket_by_key],
+    tools=[timed_tool(get_user_tickets), timed_tool(get_ticket_by_key)],
     generate_content_config=types.GenerationConfig(
         temperature=0.3,
         top_k=40,
@@ -1,10 +1,11 @@
-"""Configuration settings for the application."""
+"""Configuration settings for the application.
+
+The `.env` file is loaded once, by `tools.config.get_config()`, together
+with the settings used by tools and agents.
+"""
 
 import os
 from typing import Literal
-from dotenv import load_dotenv
-
-load_dotenv()
 
 
 class Settings:
@@ -1,60 +1,26 @@
 """Deployment script for Agent Engine."""
 
-import copy
 import datetime
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Any
 
 import vertexai
-from google.adk.agents.context_cache_config import ContextCacheConfig
 from google.adk.artifacts import GcsArtifactService
-from google.adk.plugins.context_filter_plugin import ContextFilterPlugin
 from vertexai import agent_engines
-from vertexai.preview.reasoning_engines import AdkApp
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from agents.agent import build_plugins, root_agent
 from deployment_config import config, get_deployment_config
+from engine_app import (
+    AgentEngineApp,
+    bounded_session_service,
+    forwarded_env_vars,
+)
+from tools.config import get_config
 from utils.gcs import create_bucket_if_not_exists
-from agents.agent import root_agent
-
-
-class AgentEngineApp(AdkApp):
-    """ADK Application wrapper with App-level configurations."""
-
-    def __init__(
-        self,
-        agent: Any,
-        context_cache_config: ContextCacheConfig | None = None,
-        plugins: list | None = None,
-        **kwargs: Any,
-    ) -> None:
-        """Initialize with agent and App-level configs."""
-        super().__init__(agent=agent, **kwargs)
-        self._context_cache_config = context_cache_config
-        self._plugins = plugins
-
-    def clone(self) -> "AgentEngineApp":
-        """Create a copy of this application."""
-        template_attributes = self._tmpl_attrs
-        return self.__class__(
-            agent=copy.deepcopy(template_attributes["agent"]),
-            context_cache_config=self._context_cache_config,
-            plugins=self._plugins,
-            enable_tracing=bool(
-                template_attributes.get("enable_tracing", False)
-            ),
-            session_service_builder=template_attributes.get(
-                "session_service_builder"
-            ),
-            artifact_service_builder=template_attributes.get(
-                "artifact_service_builder"
-            ),
-            env_vars=template_attributes.get("env_vars"),
-        )
 
 
 def deploy_agent_engine_app() -> agent_engines.AgentEngine:
@@ -68,7 +34,8 @@ def deploy_agent_engine_app() -> agent_engines.AgentEngine:
     print(f"📋 Staging bucket: {deployment_config.staging_bucket}")
 
     env_vars = {
-        "NUM_WORKERS": "1",
+        # Worker processes per instance; each has its own clients and caches
+        "NUM_WORKERS": str(deployment_config.num_workers),
         "GOOGLE_GENAI_USE_VERTEXAI": "True",
         "PYTHONPATH": "/code/backend/src",
         # "GCP_PROJECT": deployment_config.project,
@@ -82,7 +49,9 @@ def deploy_agent_engine_app() -> agent_engines.AgentEngine:
         print(f"📋 Corpus ID: {deployment_config.corpus_id}")
         print(f"📋 Project: {deployment_config.project}")
         print(f"📋 Location: {deployment_config.location}")
-        
+
+
+    env_vars.update(forwarded_env_vars())
 
     # Add Langfuse credentials if available
     langfuse_secret = os.environ.get("LANGFUSE_SECRET_KEY")
@@ -125,14 +94,17 @@ def deploy_agent_engine_app() -> agent_engines.AgentEngine:
     with open(deployment_config.requirements_file) as f:
         requirements = f.read().strip().split("\n")
 
+    # Sessions live in each worker, with bounded memory, instead of the
+    # managed session service
+    session_service_builder = None
+    if get_config().session_store == "bounded":
+        session_service_builder = bounded_session_service
+
     agent_engine = AgentEngineApp(
         agent=root_agent,
-        context_cache_config=ContextCacheConfig(
-            min_tokens=1500,
-            ttl_seconds=600,
-            cache_intervals=5,
-        ),
-        plugins=[ContextFilterPlugin(num_invocations_to_keep=5)],
+        plugins=build_plugins(),
+        service_name=f"{config.deployment_name}-service",
+        session_service_builder=session_service_builder,
         artifact_service_builder=lambda: GcsArtifactService(
             bucket_name=artifacts_bucket_name
         ),
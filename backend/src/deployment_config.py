@@ -89,6 +89,7 @@ class DeploymentConfiguration:
     extra_packages: list[str]
     staging_bucket: str
     corpus_id: str | None
+    num_workers: int
 
 
 def initialize_vertex_ai(config: AgentConfiguration) -> None:
@@ -153,6 +154,13 @@ def get_deployment_config() -> DeploymentConfiguration:
     if not extra_packages:
         raise ValueError("❌ No extra packages specified")
 
+    num_workers_str = os.environ.get("NUM_WORKERS", "1")
+    if not num_workers_str.isdigit() or int(num_workers_str) < 1:
+        raise ValueError(
+            "❌ NUM_WORKERS must be a positive integer, "
+            f"got {num_workers_str!r}"
+        )
+
     return DeploymentConfiguration(
         project=project_id,
         location=config.location,
@@ -161,6 +169,7 @@ def get_deployment_config() -> DeploymentConfiguration:
         extra_packages=extra_packages,
         staging_bucket=config.staging_bucket,
         corpus_id=config.corpus_id,
+        num_workers=int(num_workers_str),
     )
 
 
@@ -0,0 +1,384 @@
+"""Agent Engine application shared by the deployment scripts.
+
+Both `deploy.py` and `agent_engine_app.py` deploy `AgentEngineApp`, so the
+admission control, warm-up, buffered feedback and trace pipeline set up
+here apply whichever script deploys the agent. The deployed code imports
+the agents through their package paths (PYTHONPATH is the source
+directory), and so does this module.
+"""
+
+import atexit
+import json
+import os
+import sys
+from collections.abc import AsyncIterable, Iterable
+from pathlib import Path
+from typing import Any
+
+from google.adk.events import Event
+from google.cloud import logging as google_cloud_logging
+from google.genai import types
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider, export
+from vertexai.preview.reasoning_engines import AdkApp
+from vertexai.preview.reasoning_engines.templates.adk import (
+    _StreamingRunResponse,
+)
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.agent import (
+    admission_control,
+    build_warm_up,
+    turn_deadline,
+    usage_accounting,
+)
+from plugins.admission_control import busy_message
+from tools.config import get_config
+from tools.status_fast_path import detect_language
+from tools.ticket import ticket_mirror, ticket_outbox
+from utils.export_queue import QueueingSpanExporter
+from utils.feedback import FeedbackBuffer
+from utils.jsonl_exporter import jsonl_exporter_from_config
+from utils.metrics import REGISTRY as metrics_registry
+from utils.observability import setup_observability
+from utils.sampling import TailSamplingSpanProcessor
+from utils.session_store import (
+    BoundedSessionService,
+    bounded_session_service_from_config,
+)
+from utils.tracing import CloudTraceLoggingSpanExporter
+from utils.typing import Feedback
+
+DEFAULT_SERVICE_NAME = "customer-service-agent-service"
+
+# Settings passed from the deploying environment to the deployed workers
+FORWARDED_ENV_VARS = (
+    "SPECULATIVE_RETRIEVAL",
+    "CONTEXT_TOKEN_BUDGET",
+    "USAGE_LOG_INTERVAL_SECONDS",
+    "ADAPTIVE_CACHE_POLICY",
+    "RAG_TOP_K",
+    "RAG_DISTANCE_THRESHOLD",
+    "OBSERVABILITY_ENABLED",
+    "LANGFUSE_AUTH_CHECK",
+    "LANGFUSE_AUTH_CHECK_TIMEOUT",
+    "TRACE_SAMPLE_RATE",
+    "TRACE_SLOW_SECONDS",
+    "TRACE_BUFFER_MAX_MB",
+    "TRACE_EXPORTER",
+    "TRACE_JSONL_DIR",
+    "TRACE_JSONL_MAX_MB",
+    "TRACE_JSONL_ROTATE_SECONDS",
+    "TRACE_JSONL_GZIP",
+    "SPAN_QUEUE_MAX_MB",
+    "FEEDBACK_BATCH_SIZE",
+    "FEEDBACK_FLUSH_SECONDS",
+    "WARMUP_ENABLED",
+    "WARMUP_BUDGET_SECONDS",
+    "WARMUP_QUERIES",
+    "RAG_CACHE_TTL_SECONDS",
+    "RAG_CACHE_MAX_ENTRIES",
+    "RAG_MAX_CONCURRENT_QUERIES",
+    "TURN_DEADLINE_SECONDS",
+    "ADMISSION_CONTROL",
+    "ADMISSION_USER_PER_MINUTE",
+    "ADMISSION_USER_BURST",
+    "ADMISSION_GLOBAL_PER_MINUTE",
+    "ADMISSION_GLOBAL_BURST",
+    "ADMISSION_MAX_CONCURRENT",
+    "ADMISSION_TICKETS_PER_MINUTE",
+    "ADMISSION_KB_MULTI_PER_MINUTE",
+    "SESSION_STORE",
+    "SESSION_MAX_MB",
+    "SESSION_MAX_EVENTS",
+    "SESSION_IDLE_SECONDS",
+    "SESSION_SPILL_PATH",
+    "TICKET_OUTBOX_PATH",
+    "TICKET_MIRROR_PATH",
+    "TICKET_MIRROR_MAX_STALENESS_SECONDS",
+    "TICKET_MIRROR_POLL_SECONDS",
+    "TICKET_WEBHOOK_PORT",
+    "TICKET_WEBHOOK_SECRET",
+)
+
+
+class AgentEngineApp(AdkApp):
+    """ADK Application wrapper for Agent Engine deployment."""
+
+    def __init__(
+        self,
+        *,
+        service_name: str = DEFAULT_SERVICE_NAME,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the application.
+
+        Args:
+            service_name: Service name of the exported traces
+            **kwargs: Arguments of `AdkApp`
+        """
+        super().__init__(**kwargs)
+        self._tmpl_attrs["service_name"] = service_name
+
+    def set_up(self) -> None:
+        """Set up logging and tracing."""
+        super().set_up()
+        app_config = get_config()
+        # Exporters are configured below; only instrument and check Langfuse
+        setup_observability(app_config, local_exporters=False)
+        logging_client = google_cloud_logging.Client()
+        self.logger = logging_client.logger(__name__)
+        self.feedback_buffer = FeedbackBuffer(
+            self.logger,
+            max_batch_size=app_config.feedback_batch_size,
+            flush_interval_seconds=app_config.feedback_flush_seconds,
+        )
+        # The writer is a daemon thread: write what is queued before exiting
+        atexit.register(self.feedback_buffer.close)
+        provider = TracerProvider()
+        self.span_exporter = (
+            jsonl_exporter_from_config(app_config)
+            or CloudTraceLoggingSpanExporter(
+                project_id=app_config.project_id,
+                service_name=self._tmpl_attrs["service_name"],
+            )
+        )
+        # Bounded by bytes rather than span count; export only enqueues
+        self.span_queue = QueueingSpanExporter(
+            self.span_exporter,
+            max_queue_bytes=int(app_config.span_queue_max_mb * 1024 * 1024),
+        )
+        self.trace_sampler = TailSamplingSpanProcessor(
+            export.SimpleSpanProcessor(self.span_queue),
+            sample_rate=app_config.trace_sample_rate,
+            slow_threshold_seconds=app_config.trace_slow_seconds,
+            max_buffered_bytes=int(
+                app_config.trace_buffer_max_mb * 1024 * 1024
+            ),
+        )
+        provider.add_span_processor(self.trace_sampler)
+        trace.set_tracer_provider(provider)
+        self.enable_tracing = True
+
+        # Resume filing complaints queued before the instance restarted,
+        # and start syncing the ticket mirror
+        ticket_outbox()
+        ticket_mirror()
+
+        # Pay the first-request costs before the instance reports ready
+        self.warm_up = build_warm_up(list(app_config.warmup_queries))
+        if isinstance(self.span_exporter, CloudTraceLoggingSpanExporter):
+            self.warm_up.add_step("gcs_bucket", self.span_exporter.warm_up)
+        if app_config.warmup_enabled:
+            self.warm_up.run(app_config.warmup_budget_seconds)
+
+    def stream_query(
+        self,
+        *,
+        message: str | dict[str, Any],
+        user_id: str,
+        **kwargs: Any,
+    ) -> Iterable[dict[str, Any]]:
+        """Stream the reply to a message, if admitted within rate limits."""
+        if admission_control.try_admit(user_id) is not None:
+            yield _busy_event(message)
+            return
+        try:
+            yield from super().stream_query(
+                message=message, user_id=user_id, **kwargs
+            )
+        finally:
+            admission_control.release()
+
+    async def async_stream_query(
+        self,
+        *,
+        message: str | dict[str, Any],
+        user_id: str,
+        **kwargs: Any,
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Stream the reply to a message, if admitted within rate limits."""
+        if admission_control.try_admit(user_id) is not None:
+            yield _busy_event(message)
+            return
+        try:
+            async for event in super().async_stream_query(
+                message=message, user_id=user_id, **kwargs
+            ):
+                yield event
+        finally:
+            admission_control.release()
+
+    def streaming_agent_run_with_events(
+        self, request_json: str
+    ) -> Iterable[dict[str, Any]]:
+        """Stream the events of a run, if admitted within rate limits."""
+        request = json.loads(request_json)
+        user_id = request.get("user_id") or request.get("userId", "")
+        if admission_control.try_admit(user_id) is not None:
+            response = _StreamingRunResponse(
+                events=[_busy_reply(request.get("message") or "")],
+                artifacts=[],
+                session_id=request.get("session_id"),
+            )
+            yield response.dump()
+            return
+        try:
+            yield from super().streaming_agent_run_with_events(request_json)
+        finally:
+            admission_control.release()
+
+    def register_feedback(self, feedback: dict[str, Any]) -> None:
+        """Validate feedback and queue it for a batched write."""
+        feedback_obj = Feedback.model_validate(feedback)
+        self.feedback_buffer.submit(feedback_obj.model_dump())
+
+    def get_feedback_metrics(self) -> dict[str, int]:
+        """Return counters of queued, written and dropped feedback."""
+        return self.feedback_buffer.stats()
+
+    def get_warmup_report(self) -> dict[str, Any]:
+        """Return the status and duration of each warm-up step."""
+        return self.warm_up.report()
+
+    def get_admission_metrics(self) -> dict[str, int]:
+        """Return counters of admitted and rejected turns and tool calls."""
+        return admission_control.stats()
+
+    def get_deadline_metrics(self) -> dict[str, Any]:
+        """Return counters of turns past their deadline and the overrun."""
+        return turn_deadline.stats()
+
+    def get_ticket_outbox_metrics(self) -> dict[str, int]:
+        """Return counts of queued, filed and rejected complaints."""
+        outbox = ticket_outbox()
+        if outbox is None:
+            return {}
+        return outbox.stats()
+
+    def get_ticket_mirror_metrics(self) -> dict[str, Any]:
+        """Return sync counters, ticket count and age of the ticket mirror."""
+        mirror = ticket_mirror()
+        if mirror is None:
+            return {}
+        return mirror.stats()
+
+    def get_session_metrics(self) -> dict[str, int]:
+        """Return session counts and memory of the bounded session store."""
+        session_service = self._tmpl_attrs.get("session_service")
+        if not isinstance(session_service, BoundedSessionService):
+            return {}
+        return session_service.stats()
+
+    def get_usage_metrics(self) -> list[dict[str, Any]]:
+        """Return token and latency usage grouped by agent, language, intent."""
+        return usage_accounting.snapshot()
+
+    def get_span_upload_metrics(self) -> dict[str, Any]:
+        """Return latency and failure counters of span payload uploads."""
+        if not isinstance(self.span_exporter, CloudTraceLoggingSpanExporter):
+            return {}
+        return self.span_exporter.upload_metrics()
+
+    def get_metrics(self) -> str:
+        """Return tool and agent latency metrics in OpenMetrics text."""
+        return metrics_registry.render()
+
+    def get_span_export_metrics(self) -> dict[str, int]:
+        """Return export queue size and dropped spans by reason."""
+        return self.span_queue.stats()
+
+    def get_trace_sampling_metrics(self) -> dict[str, int]:
+        """Return counters of kept and dropped traces."""
+        return self.trace_sampler.stats()
+
+    def register_operations(self) -> dict[str, list[str]]:
+        """Register available operations."""
+        operations = super().register_operations()
+        operations[""] = operations[""] + [
+            "register_feedback",
+            "get_feedback_metrics",
+            "get_warmup_report",
+            "get_admission_metrics",
+            "get_deadline_metrics",
+            "get_ticket_outbox_metrics",
+            "get_ticket_mirror_metrics",
+            "get_session_metrics",
+            "get_usage_metrics",
+            "get_metrics",
+            "get_span_upload_metrics",
+            "get_trace_sampling_metrics",
+            "get_span_export_metrics",
+        ]
+        return operations
+
+    def clone(self) -> "AgentEngineApp":
+        """Create a copy of this application.
+
+        The agent tree, its prompts and the plugins are shared, not deep
+        copied: they are not modified after import, and per-request state
+        lives in sessions. Clients and exporters are created per copy in
+        `set_up`.
+        """
+        template_attributes = self._tmpl_attrs
+        return self.__class__(
+            agent=template_attributes["agent"],
+            plugins=template_attributes.get("plugins"),
+            service_name=template_attributes["service_name"],
+            enable_tracing=bool(
+                template_attributes.get("enable_tracing", False)
+            ),
+            session_service_builder=template_attributes.get(
+                "session_service_builder"
+            ),
+            artifact_service_builder=template_attributes.get(
+                "artifact_service_builder"
+            ),
+            env_vars=template_attributes.get("env_vars"),
+        )
+
+
+def forwarded_env_vars() -> dict[str, str]:
+    """Return the settings to pass to the deployed workers.
+
+    Returns:
+        Values of `FORWARDED_ENV_VARS` set in the deploying environment
+    """
+    return {
+        key: os.environ[key]
+        for key in FORWARDED_ENV_VARS
+        if os.environ.get(key)
+    }
+
+
+def bounded_session_service() -> BoundedSessionService:
+    """Build the bounded session service from the worker's config."""
+    return bounded_session_service_from_config(get_config())
+
+
+def _busy_reply(message: str | dict[str, Any]) -> Event:
+    """Build the final event of a turn rejected by admission control.
+
+    It is returned at once, without creating or updating the session, in
+    the language of the message.
+    """
+    if isinstance(message, dict):
+        content = types.Content.model_validate(message)
+        parts = content.parts or []
+        message = " ".join(part.text for part in parts if part.text)
+    return Event(
+        author="supervisor_agent",
+        invocation_id="",
+        content=types.Content(
+            role="model",
+            parts=[types.Part(text=busy_message(detect_language(message)))],
+        ),
+        finish_reason=types.FinishReason.STOP,
+    )
+
+
+def _busy_event(message: str | dict[str, Any]) -> dict[str, Any]:
+    """Return the busy reply to a message as a JSON event."""
+    event = _busy_reply(message)
+    return json.loads(event.model_dump_json(exclude_none=True))
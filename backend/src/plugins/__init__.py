@@ -0,0 +1 @@
+"""ADK plugins for the agent app."""
@@ -0,0 +1,274 @@
+"""Per-merchant admission control with token buckets."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Expensive paths, limited per user on top of the per-turn limits: each
+# ticket is a Jira write, and the multi-language knowledge base agent
+# runs the larger model
+TICKET_CREATION = "ticket_creation"
+KNOWLEDGE_BASE_MULTI = "knowledge_base_multi"
+
+BUSY_MESSAGES = {
+    "english": (
+        "We are receiving a lot of requests right now. Please wait a "
+        "moment and send your message again."
+    ),
+    "sinhala": (
+        "අපට මේ මොහොතේ ඉල්ලීම් විශාල ප්‍රමාණයක් ලැබෙමින් පවතී. කරුණාකර "
+        "මොහොතක් රැඳී සිට ඔබගේ පණිවිඩය නැවත එවන්න."
+    ),
+    "tamil": (
+        "தற்போது எங்களுக்கு அதிகமான கோரிக்கைகள் வருகின்றன. சிறிது நேரம் "
+        "காத்திருந்து உங்கள் செய்தியை மீண்டும் அனுப்பவும்."
+    ),
+}
+
+
+def busy_message(language: str) -> str:
+    """Return the "please wait" reply in the customer's language."""
+    return BUSY_MESSAGES.get(language, BUSY_MESSAGES["english"])
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate.
+
+    Not thread-safe on its own; `AdmissionController` holds its lock.
+    """
+
+    def __init__(self, per_minute: float, burst: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Tokens added per minute
+            burst: Bucket capacity
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+
+class AdmissionController:
+    """Admit turns and expensive tool calls within rate limits.
+
+    A turn is admitted when its user's bucket and the global bucket each
+    have a token and fewer than `max_concurrent` turns are running; the
+    caller must `release()` it when the turn ends. Expensive paths have
+    their own per-user buckets. Per-user buckets are kept for at most
+    `max_users` users, least recently seen first out; a user whose
+    bucket was dropped starts again with a full one.
+
+    The buckets and the concurrency limit live in the worker process, so
+    a deployment admits up to the configured limits times NUM_WORKERS
+    times the number of instances.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        user_per_minute: float = 20.0,
+        user_burst: float = 10.0,
+        global_per_minute: float = 600.0,
+        global_burst: float = 100.0,
+        max_concurrent: int = 32,
+        path_per_minute: Optional[Dict[str, float]] = None,
+        max_users: int = 10000,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            enabled: When False every turn and path is admitted
+            user_per_minute: Turns per minute per user
+            user_burst: Turns a user may send at once
+            global_per_minute: Turns per minute across all users
+            global_burst: Turns admitted at once across all users
+            max_concurrent: Turns running at the same time
+            path_per_minute: Calls per minute per user of each expensive
+                             path, which is also its burst
+            max_users: Users whose buckets are kept
+        """
+        self.enabled = enabled
+        self._user_limits = (user_per_minute, user_burst)
+        self._path_limits = dict(path_per_minute or {})
+        self._global = TokenBucket(global_per_minute, global_burst)
+        self._max_concurrent = max_concurrent
+        self._max_users = max_users
+        self._buckets: OrderedDict[tuple[str, str], TokenBucket] = (
+            OrderedDict()
+        )
+        self._active = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "admitted": 0,
+            "rejected_user_rate": 0,
+            "rejected_global_rate": 0,
+            "rejected_concurrency": 0,
+        }
+        for path in self._path_limits:
+            self._stats[f"rejected_{path}"] = 0
+
+    def try_admit(self, user_id: str) -> Optional[str]:
+        """Admit a turn of `user_id` if within the limits.
+
+        Args:
+            user_id: Merchant sending the message
+
+        Returns:
+            None if admitted, otherwise the reason it was rejected:
+            "user_rate", "global_rate" or "concurrency"
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            user = self._bucket("turn", user_id, *self._user_limits, now)
+            self._global.refill(now)
+            if self._active >= self._max_concurrent:
+                reason = "concurrency"
+            elif user.tokens < 1:
+                reason = "user_rate"
+            elif self._global.tokens < 1:
+                reason = "global_rate"
+            else:
+                user.tokens -= 1
+                self._global.tokens -= 1
+                self._active += 1
+                self._stats["admitted"] += 1
+                return None
+            self._stats[f"rejected_{reason}"] += 1
+        logger.warning(f"Rejected turn of {user_id}: {reason}")
+        return reason
+
+    def release(self) -> None:
+        """End a turn admitted by `try_admit`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._active = max(0, self._active - 1)
+
+    def try_acquire_path(self, path: str, user_id: str) -> bool:
+        """Take a token for an expensive path, if it is limited.
+
+        Args:
+            path: Expensive path, e.g. TICKET_CREATION
+            user_id: Merchant on whose behalf it runs
+
+        Returns:
+            True if the call may proceed
+        """
+        per_minute = self._path_limits.get(path)
+        if not self.enabled or per_minute is None:
+            return True
+        with self._lock:
+            bucket = self._bucket(
+                path, user_id, per_minute, per_minute, time.monotonic()
+            )
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return True
+            self._stats[f"rejected_{path}"] += 1
+        logger.warning(f"Rejected {path} for {user_id}")
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Return admission and rejection counters and turns in flight."""
+        with self._lock:
+            return {
+                **self._stats,
+                "active": self._active,
+                "tracked_users": len(self._buckets),
+            }
+
+    def _bucket(
+        self,
+        kind: str,
+        user_id: str,
+        per_minute: float,
+        burst: float,
+        now: float,
+    ) -> TokenBucket:
+        """Return the refilled bucket of a user, creating it if needed."""
+        key = (kind, user_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(per_minute, burst)
+            if len(self._buckets) > self._max_users:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        bucket.refill(now)
+        return bucket
+
+
+class AdmissionControlPlugin(BasePlugin):
+    """Apply the per-user limits of expensive paths to tool calls.
+
+    A rejected call is not run; the agent gets an error result asking the
+    customer to wait, and phrases it in the conversation language.
+    """
+
+    def __init__(
+        self,
+        controller: AdmissionController,
+        tool_paths: Optional[Dict[tuple[Optional[str], str], str]] = None,
+        name: str = "admission_control_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            controller: Controller holding the buckets
+            tool_paths: Path of each (agent, tool); an agent of None
+                        matches the tool in any agent
+            name: Plugin name
+        """
+        super().__init__(name)
+        self._controller = controller
+        self._tool_paths = tool_paths or {
+            (None, "create_jira_ticket"): TICKET_CREATION,
+            (
+                "knowledge_base_agent_multi",
+                "query_knowledge_base",
+            ): KNOWLEDGE_BASE_MULTI,
+        }
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[Dict]:
+        """Reject the call if its path is over the user's limit."""
+        path = self._tool_paths.get(
+            (tool_context.agent_name, tool.name)
+        ) or self._tool_paths.get((None, tool.name))
+        if path is None:
+            return None
+        user_id = tool_context._invocation_context.user_id
+        if self._controller.try_acquire_path(path, user_id):
+            return None
+        return {
+            "status": "error",
+            "message": (
+                "Too many requests from this customer; ask them to wait a "
+                "minute and try again"
+            ),
+        }
@@ -0,0 +1,227 @@
+"""Adaptive context-cache policy driven by observed hit rates."""
+
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_CACHE_CONFIG = ContextCacheConfig(
+    min_tokens=1500,
+    ttl_seconds=600,  # 10 mins for conversation
+    cache_intervals=5,  # Maximum invocations before cache refresh
+)
+
+
+@dataclass(frozen=True)
+class CachePolicyBounds:
+    """Bounds the adaptive policy may move each setting within."""
+
+    min_ttl_seconds: int = 120
+    max_ttl_seconds: int = 1800
+    min_cache_intervals: int = 2
+    max_cache_intervals: int = 20
+    min_min_tokens: int = 1024
+    max_min_tokens: int = 8192
+
+
+class AdaptiveCachePolicyPlugin(BasePlugin):
+    """Tune the context-cache config per agent and time of day.
+
+    Cached-token ratios are measured per agent from model usage metadata, and
+    inter-arrival times from consecutive turns of the same session. Traffic
+    is split into peak and off-peak periods, since merchants' daytime and
+    night-time patterns differ. Every `adjust_every` model calls of an agent
+    in a period, the policy:
+
+    - sets the TTL to cover most observed gaps between turns,
+    - reuses caches for more invocations when the hit ratio is high and
+      fewer when it is low,
+    - lowers `min_tokens` when caching pays off and raises it when it does
+      not.
+
+    All values stay within `CachePolicyBounds`, and every change is logged
+    and kept for auditing through `decisions()`.
+    """
+
+    def __init__(
+        self,
+        default_config: ContextCacheConfig = DEFAULT_CONTEXT_CACHE_CONFIG,
+        bounds: Optional[CachePolicyBounds] = None,
+        peak_hours: Tuple[int, int] = (8, 20),
+        utc_offset_hours: float = 5.5,
+        adjust_every: int = 20,
+        window: int = 200,
+        max_decisions: int = 500,
+        clock: Callable[[], float] = time.time,
+        name: str = "adaptive_cache_policy_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            default_config: Starting config for every agent and period.
+            bounds: Bounds for the adjusted settings (default bounds if
+                    None).
+            peak_hours: Local start (inclusive) and end (exclusive) hour of
+                        peak traffic.
+            utc_offset_hours: Offset of local time from UTC.
+            adjust_every: Model calls between adjustments of an agent.
+            window: Number of recent samples used for each measurement.
+            max_decisions: Number of recorded decisions kept for auditing.
+            clock: Wall-clock time source.
+            name: Plugin name.
+        """
+        super().__init__(name)
+        self._default_config = default_config
+        self._bounds = bounds if bounds is not None else CachePolicyBounds()
+        self._peak_hours = peak_hours
+        self._utc_offset_seconds = utc_offset_hours * 3600
+        self._adjust_every = adjust_every
+        self._window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._configs: Dict[Tuple[str, str], ContextCacheConfig] = {}
+        self._hit_ratios: Dict[Tuple[str, str], Deque[float]] = {}
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._gaps: Dict[str, Deque[float]] = {}
+        self._last_arrival: OrderedDict[str, float] = OrderedDict()
+        self._decisions: Deque[Dict[str, Any]] = deque(maxlen=max_decisions)
+
+    def decisions(self) -> List[Dict[str, Any]]:
+        """Return the recorded policy decisions, oldest first."""
+        with self._lock:
+            return list(self._decisions)
+
+    def config_for(self, agent_name: str) -> ContextCacheConfig:
+        """Return the current cache config of an agent."""
+        key = (agent_name, self._period())
+        with self._lock:
+            return self._configs.get(key, self._default_config)
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Measure the time since the session's previous turn."""
+        session_id = invocation_context.session.id
+        now = self._clock()
+        with self._lock:
+            previous = self._last_arrival.pop(session_id, None)
+            self._last_arrival[session_id] = now
+            if len(self._last_arrival) > 10 * self._window:
+                self._last_arrival.popitem(last=False)
+            if previous is not None:
+                self._gaps.setdefault(
+                    self._period(now), deque(maxlen=self._window)
+                ).append(now - previous)
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Apply the agent's current cache config to the request."""
+        if llm_request.cache_config is not None:
+            llm_request.cache_config = self.config_for(
+                callback_context.agent_name
+            )
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Measure the cached-token ratio and adjust periodically."""
+        usage = llm_response.usage_metadata
+        if llm_response.partial or not usage or not usage.prompt_token_count:
+            return None
+
+        cached = usage.cached_content_token_count or 0
+        ratio = cached / usage.prompt_token_count
+        key = (callback_context.agent_name, self._period())
+        with self._lock:
+            self._hit_ratios.setdefault(key, deque(maxlen=self._window)).append(
+                ratio
+            )
+            self._calls[key] = self._calls.get(key, 0) + 1
+            should_adjust = self._calls[key] % self._adjust_every == 0
+        if should_adjust:
+            self._adjust(key)
+        return None
+
+    def _period(self, now: Optional[float] = None) -> str:
+        """Return the traffic period ('peak' or 'off_peak') of a time."""
+        if now is None:
+            now = self._clock()
+        hour = int((now + self._utc_offset_seconds) // 3600) % 24
+        start, end = self._peak_hours
+        return "peak" if start <= hour < end else "off_peak"
+
+    def _adjust(self, key: Tuple[str, str]) -> None:
+        """Recompute the cache config of an (agent, period) pair."""
+        agent_name, period = key
+        bounds = self._bounds
+        with self._lock:
+            current = self._configs.get(key, self._default_config)
+            ratios = list(self._hit_ratios.get(key, ()))
+            gaps = list(self._gaps.get(period, ()))
+        if not ratios:
+            return
+
+        hit_ratio = statistics.fmean(ratios)
+        ttl = current.ttl_seconds
+        if len(gaps) >= 5:
+            # Keep the cache alive across three out of four pauses
+            p75_gap = statistics.quantiles(gaps, n=4)[2]
+            ttl = int(p75_gap * 1.2)
+        else:
+            p75_gap = None
+
+        intervals = current.cache_intervals
+        min_tokens = current.min_tokens
+        if hit_ratio >= 0.5:
+            intervals += 1
+            min_tokens = int(min_tokens * 0.8)
+        elif hit_ratio < 0.2:
+            intervals -= 1
+            min_tokens = int(min_tokens * 1.25)
+
+        updated = ContextCacheConfig(
+            ttl_seconds=min(
+                max(ttl, bounds.min_ttl_seconds), bounds.max_ttl_seconds
+            ),
+            cache_intervals=min(
+                max(intervals, bounds.min_cache_intervals),
+                bounds.max_cache_intervals,
+            ),
+            min_tokens=min(
+                max(min_tokens, bounds.min_min_tokens), bounds.max_min_tokens
+            ),
+        )
+        if updated == current:
+            return
+
+        decision = {
+            "log_type": "cache_policy_decision",
+            "timestamp": self._clock(),
+            "agent": agent_name,
+            "period": period,
+            "hit_ratio": round(hit_ratio, 3),
+            "p75_gap_seconds": round(p75_gap, 1) if p75_gap else None,
+            "samples": len(ratios),
+            "previous": current.model_dump(),
+            "updated": updated.model_dump(),
+        }
+        with self._lock:
+            self._configs[key] = updated
+            self._decisions.append(decision)
+        logger.info(json.dumps(decision))
@@ -0,0 +1,233 @@
+"""Speculative knowledge-base retrieval while the supervisor routes."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_BASE_AGENTS = ("knowledge_base_agent", "knowledge_base_agent_multi")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings compare equal."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class _Speculation:
+    """A retrieval started on the raw user message."""
+
+    query: str
+    future: Optional[Future] = None
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    discarded: bool = False
+
+    def duration(self) -> float:
+        """Return how long the retrieval ran, or has run so far."""
+        finished_at = self.finished_at
+        if finished_at is None:
+            finished_at = time.monotonic()
+        return finished_at - self.started_at
+
+
+class SpeculativeRetrievalPlugin(BasePlugin):
+    """Start knowledge-base retrieval before the supervisor has routed.
+
+    Knowledge-base questions are the default intent, so retrieval on the raw
+    user message starts in a background thread as soon as the run begins.
+    The first `query_knowledge_base` call made by a knowledge-base agent in
+    the same invocation reuses the in-flight or finished result when its
+    query matches the message once normalized. If the agent asks something
+    else, or the turn is routed anywhere else, the speculation is cancelled
+    (or, if already running, discarded and counted as wasted).
+
+    `close()` stops the retrieval threads; the owner calls it at shutdown.
+    """
+
+    def __init__(
+        self,
+        retrieve: Callable[[str], Any],
+        skip: Callable[[str], bool] | None = None,
+        min_words: int = 3,
+        max_workers: int = 4,
+        tool_name: str = "query_knowledge_base",
+        knowledge_base_agents: tuple[str, ...] = KNOWLEDGE_BASE_AGENTS,
+        name: str = "speculative_retrieval_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            retrieve: Retrieval function, called with the raw user message.
+            skip: Optional predicate for messages that should not be
+                  speculated on (e.g. status questions).
+            min_words: Messages shorter than this (greetings) are skipped.
+            max_workers: Maximum concurrent speculative retrievals.
+            tool_name: Name of the retrieval tool whose call is replaced.
+            knowledge_base_agents: Agents that may reuse the result.
+            name: Plugin name.
+        """
+        super().__init__(name)
+        self._retrieve = retrieve
+        self._skip = skip
+        self._min_words = min_words
+        self._tool_name = tool_name
+        self._knowledge_base_agents = set(knowledge_base_agents)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="speculative-rag"
+        )
+        self._pending: Dict[str, _Speculation] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "started": 0,
+            "reused": 0,
+            "cancelled": 0,
+            "discarded": 0,
+            "latency_saved_seconds": 0.0,
+            "retrieval_wasted_seconds": 0.0,
+        }
+
+    def stats(self) -> Dict[str, float]:
+        """Return a snapshot of the speculation counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Start retrieval on the raw user message."""
+        content = invocation_context.user_content
+        if not content or not content.parts:
+            return None
+        message = " ".join(part.text for part in content.parts if part.text)
+        if len(message.split()) < self._min_words:
+            return None
+        if self._skip and self._skip(message):
+            return None
+
+        speculation = _Speculation(query=normalize_query(message))
+        speculation.future = self._executor.submit(
+            self._timed_retrieve, speculation, message
+        )
+        with self._lock:
+            self._pending[invocation_context.invocation_id] = speculation
+            self._stats["started"] += 1
+        return None
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        """Cancel the speculation once the turn is routed elsewhere."""
+        if agent.parent_agent is None:
+            return None
+        if agent.name not in self._knowledge_base_agents:
+            self._discard(callback_context.invocation_id)
+        return None
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[Any]:
+        """Serve the first retrieval of the turn from the speculation."""
+        if tool.name != self._tool_name:
+            return None
+        if tool_context.agent_name not in self._knowledge_base_agents:
+            return None
+        with self._lock:
+            speculation = self._pending.pop(tool_context.invocation_id, None)
+        if speculation is None or speculation.future is None:
+            return None
+        # The agent may rephrase the message; a different query is run anew
+        query = normalize_query(str(tool_args.get("query", "")))
+        if query != speculation.query:
+            self._abandon(speculation)
+            return None
+
+        requested_at = time.monotonic()
+        try:
+            result = await asyncio.wrap_future(speculation.future)
+        except Exception:
+            logger.exception("Speculative retrieval failed, retrying")
+            return None
+
+        waited = time.monotonic() - requested_at
+        saved = max(speculation.duration() - waited, 0.0)
+        with self._lock:
+            self._stats["reused"] += 1
+            self._stats["latency_saved_seconds"] += saved
+        logger.info(
+            f"Speculative retrieval reused by {tool_context.agent_name}: "
+            f"saved {saved:.3f}s"
+        )
+        return result
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Discard speculations that were never used."""
+        self._discard(invocation_context.invocation_id)
+        return None
+
+    def close(self) -> None:
+        """Cancel queued retrievals and stop the retrieval threads."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for speculation in pending:
+            self._abandon(speculation)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_retrieve(self, speculation: _Speculation, message: str) -> Any:
+        """Run the retrieval and account for it if it was discarded."""
+        speculation.started_at = time.monotonic()
+        try:
+            return self._retrieve(message)
+        finally:
+            with self._lock:
+                speculation.finished_at = time.monotonic()
+                wasted = speculation.discarded
+            if wasted:
+                self._record_waste(speculation)
+
+    def _discard(self, invocation_id: str) -> None:
+        """Cancel or discard the speculation of an invocation."""
+        with self._lock:
+            speculation = self._pending.pop(invocation_id, None)
+        if speculation is not None:
+            self._abandon(speculation)
+
+    def _abandon(self, speculation: _Speculation) -> None:
+        """Cancel a speculation, or mark it wasted if already running."""
+        if speculation.future is not None and speculation.future.cancel():
+            with self._lock:
+                self._stats["cancelled"] += 1
+            return
+
+        with self._lock:
+            speculation.discarded = True
+            finished = speculation.finished_at is not None
+        if finished:
+            self._record_waste(speculation)
+
+    def _record_waste(self, speculation: _Speculation) -> None:
+        """Count a retrieval whose result was not used."""
+        wasted = speculation.duration()
+        with self._lock:
+            self._stats["discarded"] += 1
+            self._stats["retrieval_wasted_seconds"] += wasted
+        logger.info(f"Speculative retrieval discarded: wasted {wasted:.3f}s")
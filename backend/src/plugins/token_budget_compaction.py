@@ -0,0 +1,220 @@
+"""Token-budget driven compaction of the LLM context."""
+
+import itertools
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Rough estimate used by Gemini tokenizers for mixed English/Indic text.
+CHARS_PER_TOKEN = 4
+
+# ADK sends other agents' turns as user content starting with this text.
+_CONTEXT_PREFIX = "For context:"
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the token count of a content, part or plain value."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value) // CHARS_PER_TOKEN + 1
+    if isinstance(value, types.Content):
+        return sum(estimate_tokens(part) for part in value.parts or [])
+    if isinstance(value, types.Part):
+        if value.text:
+            return estimate_tokens(value.text)
+        if value.function_call:
+            return estimate_tokens(
+                json.dumps(value.function_call.args or {}, default=str)
+            )
+        if value.function_response:
+            return estimate_tokens(
+                json.dumps(value.function_response.response or {}, default=str)
+            )
+        return 0
+    return estimate_tokens(json.dumps(value, default=str))
+
+
+def _is_user_message(content: types.Content) -> bool:
+    """Check whether a content starts a new turn (a customer text message).
+
+    Other agents' turns are also sent as user content, starting with a
+    "For context:" part, and do not start a turn.
+    """
+    parts = content.parts or []
+    if content.role != "user" or not parts:
+        return False
+    if parts[0].text and parts[0].text.startswith(_CONTEXT_PREFIX):
+        return False
+    return any(part.text for part in parts)
+
+
+class TokenBudgetCompactionPlugin(BasePlugin):
+    """Keep the LLM context within a token budget.
+
+    Short chats keep their full history, while long conversations are
+    compacted once the request contents pass `max_tokens`:
+
+    1. Large tool responses (RAG results, ticket lists) in earlier turns are
+       replaced by a short preview.
+    2. If the request is still over budget, the oldest turns are dropped
+       whole, so function calls and responses stay paired.
+
+    The most recent `keep_recent_turns` turns are never touched. Tokens saved
+    are reported per invocation through the log and `stats()`.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        tool_response_tokens: int = 300,
+        keep_recent_turns: int = 2,
+        name: str = "token_budget_compaction_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            max_tokens: Budget for the request contents, in estimated tokens.
+            tool_response_tokens: Tool responses larger than this are
+                                  compacted to a preview of this size.
+            keep_recent_turns: Number of most recent turns kept verbatim.
+            name: Plugin name.
+        """
+        super().__init__(name)
+        self._max_tokens = max_tokens
+        self._tool_response_tokens = tool_response_tokens
+        self._keep_recent_turns = max(keep_recent_turns, 1)
+        self._saved_by_invocation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "compacted_requests": 0,
+            "tokens_before": 0,
+            "tokens_saved": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the compaction counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Compact the request contents if they exceed the budget."""
+        try:
+            contents = llm_request.contents
+            tokens_before = sum(estimate_tokens(c) for c in contents)
+            tokens_after = tokens_before
+
+            if tokens_before > self._max_tokens:
+                contents = self.compact(contents)
+                tokens_after = sum(estimate_tokens(c) for c in contents)
+                llm_request.contents = contents
+
+            saved = tokens_before - tokens_after
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["tokens_before"] += tokens_before
+                if saved:
+                    self._stats["compacted_requests"] += 1
+                    self._stats["tokens_saved"] += saved
+                    invocation_id = callback_context.invocation_id
+                    self._saved_by_invocation[invocation_id] = (
+                        self._saved_by_invocation.get(invocation_id, 0) + saved
+                    )
+        except Exception as e:
+            logger.error(f"Failed to compact context for request: {e}")
+
+        return None
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Report the tokens saved during the turn."""
+        with self._lock:
+            saved = self._saved_by_invocation.pop(
+                invocation_context.invocation_id, 0
+            )
+        if saved:
+            logger.info(
+                f"Context compaction saved ~{saved} tokens in invocation "
+                f"{invocation_context.invocation_id}"
+            )
+        return None
+
+    def compact(self, contents: List[types.Content]) -> List[types.Content]:
+        """Compact contents to fit the budget, oldest turns first.
+
+        Args:
+            contents: Request contents in conversation order.
+
+        Returns:
+            New list of contents; the input contents are not modified.
+        """
+        turn_starts = [i for i, c in enumerate(contents) if _is_user_message(c)]
+        if len(turn_starts) <= self._keep_recent_turns:
+            return contents
+        protected_from = turn_starts[-self._keep_recent_turns]
+
+        contents = [
+            self._compact_tool_responses(content)
+            if i < protected_from
+            else content
+            for i, content in enumerate(contents)
+        ]
+
+        total = sum(estimate_tokens(c) for c in contents)
+        drop_until = 0
+        for _, next_start in itertools.pairwise(turn_starts):
+            if total <= self._max_tokens or next_start > protected_from:
+                break
+            total -= sum(
+                estimate_tokens(c) for c in contents[drop_until:next_start]
+            )
+            drop_until = next_start
+
+        return contents[drop_until:]
+
+    def _compact_tool_responses(self, content: types.Content) -> types.Content:
+        """Replace large function responses in a content by a preview."""
+        parts = content.parts or []
+        if not any(
+            part.function_response
+            and estimate_tokens(part) > self._tool_response_tokens
+            for part in parts
+        ):
+            return content
+
+        compacted = []
+        for part in parts:
+            if (
+                part.function_response
+                and estimate_tokens(part) > self._tool_response_tokens
+            ):
+                response = part.function_response
+                payload = json.dumps(response.response or {}, default=str)
+                preview_chars = self._tool_response_tokens * CHARS_PER_TOKEN
+                part = types.Part(
+                    function_response=types.FunctionResponse(
+                        id=response.id,
+                        name=response.name,
+                        response={
+                            "compacted": True,
+                            "preview": payload[:preview_chars],
+                            "original_tokens": estimate_tokens(payload),
+                        },
+                    )
+                )
+            compacted.append(part)
+        return types.Content(role=content.role, parts=compacted)
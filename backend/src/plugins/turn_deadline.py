@@ -0,0 +1,179 @@
+"""Per-turn deadline propagated to model and tool calls."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_MESSAGES = {
+    "english": (
+        "Sorry, this is taking longer than expected. Please send your "
+        "message again in a moment."
+    ),
+    "sinhala": (
+        "සමාවන්න, මෙයට බලාපොරොත්තු වූවාට වඩා වැඩි කාලයක් ගත වේ. කරුණාකර "
+        "මොහොතකින් ඔබගේ පණිවිඩය නැවත එවන්න."
+    ),
+    "tamil": (
+        "மன்னிக்கவும், இதற்கு எதிர்பார்த்ததை விட அதிக நேரம் ஆகிறது. சிறிது "
+        "நேரத்தில் உங்கள் செய்தியை மீண்டும் அனுப்பவும்."
+    ),
+}
+
+
+# Turns whose after-run callback never ran (cancelled or failed runs) are
+# evicted oldest first beyond this many
+MAX_TRACKED_TURNS = 10000
+
+
+class TurnDeadlinePlugin(BasePlugin):
+    """Give each turn a deadline and keep every call within it.
+
+    The deadline is set when the run starts and bound, through
+    `set_deadline`, before each model and tool call, where the tools read
+    it to shrink their timeouts. Model requests get an HTTP timeout of the
+    time left. Once the deadline has passed, tools are not run and the
+    next model call is answered with an apology in the conversation
+    language, which ends the turn. Time spent past the deadline is logged
+    and counted.
+    """
+
+    def __init__(
+        self,
+        deadline_seconds: float,
+        set_deadline: Callable[[Optional[float]], Any],
+        name: str = "turn_deadline_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            deadline_seconds: Time budget of a turn
+            set_deadline: Binds the deadline (a `time.monotonic()` value,
+                          or None) for the tools of the current call
+            name: Plugin name
+        """
+        super().__init__(name)
+        self._deadline_seconds = deadline_seconds
+        self._set_deadline = set_deadline
+        self._deadlines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "turns": 0,
+            "expired": 0,
+            "abandoned_model_calls": 0,
+            "abandoned_tool_calls": 0,
+        }
+        self._overrun_total = 0.0
+        self._overrun_max = 0.0
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> Optional[types.Content]:
+        """Start the turn's clock."""
+        deadline = time.monotonic() + self._deadline_seconds
+        with self._lock:
+            self._deadlines[invocation_context.invocation_id] = deadline
+            while len(self._deadlines) > MAX_TRACKED_TURNS:
+                del self._deadlines[next(iter(self._deadlines))]
+            self._stats["turns"] += 1
+        self._set_deadline(deadline)
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Bound the model call by the time left, or end the turn."""
+        remaining = self._bind(callback_context.invocation_id)
+        if remaining is None:
+            return None
+        if remaining <= 0:
+            with self._lock:
+                self._stats["abandoned_model_calls"] += 1
+            language = callback_context.state.get("language", "english")
+            message = DEADLINE_MESSAGES.get(
+                language, DEADLINE_MESSAGES["english"]
+            )
+            return LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(text=message)]
+                )
+            )
+
+        if llm_request.config is None:
+            llm_request.config = types.GenerateContentConfig()
+        http_options = llm_request.config.http_options or types.HttpOptions()
+        timeout_ms = max(1, int(remaining * 1000))
+        if http_options.timeout is None or http_options.timeout > timeout_ms:
+            http_options.timeout = timeout_ms
+        llm_request.config.http_options = http_options
+        return None
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[Dict]:
+        """Bind the deadline for the tool, or skip it once expired."""
+        remaining = self._bind(tool_context.invocation_id)
+        if remaining is None or remaining > 0:
+            return None
+        with self._lock:
+            self._stats["abandoned_tool_calls"] += 1
+        return {
+            "status": "error",
+            "message": "The turn ran out of time before this tool was run",
+        }
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Record how long the turn ran past its deadline, if it did."""
+        with self._lock:
+            deadline = self._deadlines.pop(
+                invocation_context.invocation_id, None
+            )
+        self._set_deadline(None)
+        if deadline is None:
+            return
+        overrun = time.monotonic() - deadline
+        if overrun <= 0:
+            return
+        with self._lock:
+            self._stats["expired"] += 1
+            self._overrun_total += overrun
+            self._overrun_max = max(self._overrun_max, overrun)
+        logger.warning(
+            f"Turn {invocation_context.invocation_id} ran {overrun:.2f}s "
+            f"past its {self._deadline_seconds:.0f}s deadline"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return turn and abandoned-call counters and overrun seconds."""
+        with self._lock:
+            return {
+                **self._stats,
+                "overrun_seconds_total": round(self._overrun_total, 3),
+                "overrun_seconds_max": round(self._overrun_max, 3),
+            }
+
+    def _bind(self, invocation_id: str) -> Optional[float]:
+        """Bind the invocation's deadline, returning the seconds left."""
+        with self._lock:
+            deadline = self._deadlines.get(invocation_id)
+        if deadline is None:
+            return None
+        self._set_deadline(deadline)
+        return deadline - time.monotonic()
@@ -0,0 +1,354 @@
+"""Per-agent token and latency accounting."""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Intent handled by each sub-agent; the supervisor is attributed to the
+# intent of the agent it routed the turn to.
+AGENT_INTENTS = {
+    "knowledge_base_agent": "knowledge_base",
+    "knowledge_base_agent_multi": "knowledge_base",
+    "complaint_flow_agent": "lodge_complaint",
+    "status_check_agent": "check_status",
+}
+
+# Calls of runs whose after-run callback never ran (cancelled or failed
+# runs) are evicted oldest first beyond this many runs and in-flight calls
+MAX_TRACKED_RUNS = 10000
+MAX_TRACKED_CALLS = 10000
+
+
+@dataclass
+class _Timing:
+    """Start of an in-flight model or tool call."""
+
+    started: float = field(default_factory=time.monotonic)
+    first_token: Optional[float] = None
+    name: Optional[str] = None
+
+
+@dataclass
+class _CallRecord:
+    """A single model or tool call within an invocation."""
+
+    agent: str
+    kind: str
+    latency: float
+    name: Optional[str] = None
+    ttft: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    error: bool = False
+
+
+@dataclass
+class UsageStats:
+    """Aggregated usage of one (agent, language, intent) group."""
+
+    model_calls: int = 0
+    tool_calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    ttft_seconds: float = 0.0
+    model_latency_seconds: float = 0.0
+    tool_latency_seconds: float = 0.0
+    models: Dict[str, int] = field(default_factory=dict)
+    tools: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, record: _CallRecord) -> None:
+        """Add a call record to the aggregate."""
+        if record.error:
+            self.errors += 1
+        if record.kind == "tool":
+            self.tool_calls += 1
+            self.tool_latency_seconds += record.latency
+            if record.name:
+                self.tools[record.name] = self.tools.get(record.name, 0) + 1
+            return
+
+        self.model_calls += 1
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cached_tokens += record.cached_tokens
+        self.ttft_seconds += record.ttft or record.latency
+        self.model_latency_seconds += record.latency
+        if record.name:
+            self.models[record.name] = self.models.get(record.name, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the aggregate with averaged latencies."""
+        data = asdict(self)
+        data["avg_ttft_seconds"] = (
+            self.ttft_seconds / self.model_calls if self.model_calls else 0.0
+        )
+        data["avg_model_latency_seconds"] = (
+            self.model_latency_seconds / self.model_calls
+            if self.model_calls
+            else 0.0
+        )
+        data["avg_tool_latency_seconds"] = (
+            self.tool_latency_seconds / self.tool_calls
+            if self.tool_calls
+            else 0.0
+        )
+        return data
+
+
+class UsageAccountingPlugin(BasePlugin):
+    """Record tokens and latency of every model and tool call.
+
+    Calls are buffered per invocation and aggregated when the run ends, once
+    the turn's language and routed intent are known. Aggregates are grouped
+    by (agent, language, intent), exposed through `snapshot()` and written as
+    a structured log line every `log_interval_seconds` by a background
+    thread started on the first run, or at the end of every run when the
+    interval is 0.
+    """
+
+    def __init__(
+        self,
+        log_interval_seconds: float = 60.0,
+        name: str = "usage_accounting_plugin",
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            log_interval_seconds: Minimum time between usage log lines.
+            name: Plugin name.
+        """
+        super().__init__(name)
+        self._log_interval_seconds = log_interval_seconds
+        self._logged_runs = self._runs = 0
+        self._closed = threading.Event()
+        self._logger_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[str, str], _Timing] = {}
+        self._records: Dict[str, List[_CallRecord]] = {}
+        self._groups: Dict[Tuple[str, str, str], UsageStats] = {}
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the aggregated usage of every group."""
+        with self._lock:
+            return [
+                {"agent": agent, "language": language, "intent": intent}
+                | stats.to_dict()
+                for (agent, language, intent), stats in sorted(
+                    self._groups.items()
+                )
+            ]
+
+    def reset(self) -> None:
+        """Clear the aggregated usage."""
+        with self._lock:
+            self._groups.clear()
+
+    def close(self) -> None:
+        """Stop the logging thread."""
+        self._closed.set()
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Start the logging thread on the first run."""
+        if self._logger_thread is None and self._log_interval_seconds > 0:
+            with self._lock:
+                if self._logger_thread is None:
+                    self._logger_thread = threading.Thread(
+                        target=self._run_logger,
+                        name="usage-accounting-log",
+                        daemon=True,
+                    )
+                    self._logger_thread.start()
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Start timing a model call."""
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._start(key, _Timing(name=llm_request.model))
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Record time to first token and, on the final chunk, usage."""
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        now = time.monotonic()
+        with self._lock:
+            timing = self._started.get(key) or _Timing(started=now)
+            if timing.first_token is None:
+                timing.first_token = now
+            if llm_response.partial:
+                self._started[key] = timing
+                return None
+            self._started.pop(key, None)
+
+        usage = llm_response.usage_metadata
+        self._add_record(
+            callback_context.invocation_id,
+            _CallRecord(
+                agent=callback_context.agent_name,
+                kind="model",
+                latency=now - timing.started,
+                ttft=timing.first_token - timing.started,
+                name=timing.name or llm_response.model_version,
+                input_tokens=(usage and usage.prompt_token_count) or 0,
+                output_tokens=(usage and usage.candidates_token_count) or 0,
+                cached_tokens=(usage and usage.cached_content_token_count) or 0,
+                error=bool(llm_response.error_code),
+            ),
+        )
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> Optional[LlmResponse]:
+        """Record a failed model call."""
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        now = time.monotonic()
+        with self._lock:
+            timing = self._started.pop(key, None) or _Timing(started=now)
+        self._add_record(
+            callback_context.invocation_id,
+            _CallRecord(
+                agent=callback_context.agent_name,
+                kind="model",
+                latency=now - timing.started,
+                name=llm_request.model,
+                error=True,
+            ),
+        )
+        return None
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[dict]:
+        """Start timing a tool call."""
+        key = (tool_context.invocation_id, tool_context.function_call_id or "")
+        self._start(key, _Timing(name=tool.name))
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> Optional[dict]:
+        """Record a completed tool call."""
+        error = isinstance(result, dict) and "error" in result
+        self._finish_tool(tool_context, error=error)
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> Optional[dict]:
+        """Record a tool call that raised."""
+        self._finish_tool(tool_context, error=True)
+        return None
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        """Aggregate the invocation's calls."""
+        invocation_id = invocation_context.invocation_id
+        state = invocation_context.session.state
+        language = state.get("language", "unknown")
+        with self._lock:
+            records = self._records.pop(invocation_id, [])
+            for key in [k for k in self._started if k[0] == invocation_id]:
+                del self._started[key]
+
+        routed = [
+            AGENT_INTENTS[r.agent] for r in records if r.agent in AGENT_INTENTS
+        ]
+        turn_intent = routed[-1] if routed else "direct"
+
+        with self._lock:
+            for record in records:
+                intent = AGENT_INTENTS.get(record.agent, turn_intent)
+                group = (record.agent, language, intent)
+                self._groups.setdefault(group, UsageStats()).add(record)
+            self._runs += 1
+
+        if self._log_interval_seconds <= 0:
+            self._log_usage()
+        return None
+
+    def _run_logger(self) -> None:
+        """Log the usage every interval until closed."""
+        while not self._closed.wait(self._log_interval_seconds):
+            self._log_usage()
+
+    def _log_usage(self) -> None:
+        """Write the aggregated usage if runs ended since the last log."""
+        with self._lock:
+            if self._runs == self._logged_runs:
+                return
+            self._logged_runs = self._runs
+        logger.info(
+            json.dumps({"log_type": "agent_usage", "groups": self.snapshot()})
+        )
+
+    def _start(self, key: Tuple[str, str], timing: _Timing) -> None:
+        """Start timing a call, evicting the oldest ones above the limit."""
+        with self._lock:
+            self._started[key] = timing
+            while len(self._started) > MAX_TRACKED_CALLS:
+                del self._started[next(iter(self._started))]
+
+    def _finish_tool(self, tool_context: ToolContext, error: bool) -> None:
+        """Record the latency of a tool call started earlier."""
+        key = (tool_context.invocation_id, tool_context.function_call_id or "")
+        now = time.monotonic()
+        with self._lock:
+            timing = self._started.pop(key, None) or _Timing(started=now)
+        self._add_record(
+            tool_context.invocation_id,
+            _CallRecord(
+                agent=tool_context.agent_name,
+                kind="tool",
+                latency=now - timing.started,
+                name=timing.name,
+                error=error,
+            ),
+        )
+
+    def _add_record(self, invocation_id: str, record: _CallRecord) -> None:
+        """Buffer a call record until the invocation ends."""
+        with self._lock:
+            self._records.setdefault(invocation_id, []).append(record)
+            while len(self._records) > MAX_TRACKED_RUNS:
+                del self._records[next(iter(self._records))]
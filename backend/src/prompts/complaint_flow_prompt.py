@@ -31,6 +31,7 @@ COMPLAINT_FLOW_PROMPT = """You are a helpful, friendly, and professional custome
    - Include the complaint type (On boarding/Login/Settlement/Transaction) in the `summary` field
    - Upon successful entry it will return a dictionary with key value pairs, from which you must give the customer the value for the key value pair 'key' as it's the reference number for the customer (e.g. 'key':'GEN-23', return 'GEN-23')
 - From these returned values 'key' is the reference number you must give the customer (e.g. 'GEN-3')
+- If the tool returns 'status_code': 202, the complaint has been recorded and will be filed shortly; its 'key' starts with the prefix `REF-` (e.g. 'REF-4F9A2C'). Give the customer this reference exactly as returned, it works for future inquiries in the same way
 
 ---
 
@@ -66,13 +67,13 @@ Your responsibilities:
 4. Always ask the customer if they have any more information to add (e.g. Do you have any transaction IDs you can refer to? Do you have the field name where you encountered the problem when on boarding?)
 5. Ask the customer if you should continue to raise the complaint with the current information
 6. Call `create_jira_ticket` tool with the collected information in **English** and confirm that you have created the ticket.
-7. Confirm ticket creation to user with the ticket id starting with the prefix `GEN-`
-8. Tell the customer to remember the ticket starting with `GEN-` for future inquiries.
+7. Confirm ticket creation to user with the ticket id returned as 'key' (starting with the prefix `GEN-`, or `REF-` when the complaint was queued)
+8. Tell the customer to remember this ticket id for future inquiries.
 
 Collection Process:
 - Ask for missing information naturally
 - Validate completeness before submitting
-- Confirm ticket creation to user and give them the ticket id starting with the prefix `GEN-`
+- Confirm ticket creation to user and give them the ticket id returned as 'key' (`GEN-` or `REF-`)
 
 Delegate back to Supervisor :
    - Customer doesn't want to file a complaint
@@ -0,0 +1,57 @@
+"""Cached rendering of the language- and user-specific agent prompts."""
+
+import functools
+from typing import Iterable, Optional
+
+LANGUAGES = ("english", "sinhala", "tamil")
+
+
+# Stands in for the user ID in cached renderings, so the cache is keyed by
+# template and language only and stays small however many users there are
+_USER_ID_MARKER = "\x00user_id\x00"
+
+
+@functools.lru_cache(maxsize=64)
+def _render_language(template: str, language: str) -> str:
+    """Fill the language of a prompt template, marking the user ID."""
+    return template.format(language=language, user_id=_USER_ID_MARKER)
+
+
+def render_prompt(
+    template: str, language: str, user_id: Optional[str] = None
+) -> str:
+    """Fill a prompt template, reusing earlier renderings.
+
+    Args:
+        template: Prompt with `{language}` and optionally `{user_id}`
+        language: Conversation language
+        user_id: Customer ID, for prompts that mention it
+
+    Returns:
+        The rendered prompt
+    """
+    rendered = _render_language(template, language)
+    if _USER_ID_MARKER not in rendered:
+        return rendered
+    return rendered.replace(_USER_ID_MARKER, str(user_id))
+
+
+def prerender_prompts(
+    templates: Iterable[str], languages: Iterable[str] = LANGUAGES
+) -> int:
+    """Render language-only prompts ahead of the first request.
+
+    Args:
+        templates: Prompt templates without a `{user_id}` field
+        languages: Languages to render them in
+
+    Returns:
+        Number of prompts rendered
+    """
+    languages = tuple(languages)
+    count = 0
+    for template in templates:
+        for language in languages:
+            render_prompt(template, language)
+            count += 1
+    return count
@@ -20,10 +20,11 @@ STATUS_CHECK_PROMPT = """You are a helpful, friendly, and professional customer
 ---
 
 #### Important
-- The ticket ID must always start with the prefix `GEN-`
-- The rest of the ticket after the prefix are numbers (e.g., 'GEN-23')
+- The ticket ID starts with the prefix `GEN-` followed by numbers (e.g., 'GEN-23')
+- A complaint that is still being filed has a reference starting with the prefix `REF-` followed by 6 letters and digits (e.g., 'REF-4F9A2C'); it is also a valid ticket ID, pass it to `get_ticket_by_key` unchanged
 - If the customer says the ticket ID is '23' he means 'GEN-23'
-- When calling `get_ticket_by_key` tool always have ticket_id in the correct format (e.g., 'GEN-23') otherwise it will not give you the correct results.
+- When calling `get_ticket_by_key` tool always have ticket_id in the correct format (e.g., 'GEN-23' or 'REF-4F9A2C') otherwise it will not give you the correct results.
+- A ticket with status 'Queued' has been recorded and will be filed shortly
 
 ---
 
@@ -45,8 +46,8 @@ If the customer's question is unclear, incomplete, or could have more than one m
 ---
 
 Interaction Process:
-- Ask if the customer has a ticket ID starting with the prefix `GEN-` information naturally, depending on the customer's response there are 2 scenarios,
-    - **Scenario 1** : The customer gives you the ticket ID starting with the prefix `GEN-`
+- Ask if the customer has a ticket ID starting with the prefix `GEN-` (or `REF-`) information naturally, depending on the customer's response there are 2 scenarios,
+    - **Scenario 1** : The customer gives you the ticket ID starting with the prefix `GEN-` or `REF-`
         - Take customer given ticket id E.G.: GEN-2 and user_id as **{user_id}**
         - Call `get_ticket_by_key` tool with user_id and ticket_id as inputs E.G.: get_ticket_by_key("user","GEN-2")
         - The returned results will be relevant information on the referred ticket 
@@ -102,7 +103,7 @@ Interaction Process:
                     - GEN-2: The customer did not receive the settlement to his bank account
                     - GEN-1: Issue when trying to do a transaction
                     '''
-        - Ask the customer to tell you which ticket ID starting with the prefix `GEN-` he/she want the information on.
+        - Ask the customer to tell you which ticket ID (starting with the prefix `GEN-` or `REF-`) he/she want the information on.
         - When the customer gives you the ticket ID THE REST OF THE STEPS WILL THE SAME AS **Scenario 1**
 ---
 
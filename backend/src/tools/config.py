@@ -1,42 +1,335 @@
+"""Process-wide configuration shared by tools and agents.
+
+The `.env` file is loaded and the environment parsed once, on the first
+call to `get_config()`. Hot paths read plain attributes of the returned
+frozen `AppConfig`. Optional integrations (Jira, the RAG corpus) may be
+left unset: the tools that need them report that they are not configured
+when called, instead of failing when the package is imported.
+"""
+
+import functools
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Mapping, Optional, TypeVar
+
 from dotenv import load_dotenv
 
 # Load .env from agents directory
-env_path = Path(__file__).parent.parent / "agents" / ".env"
-load_dotenv(env_path)
-
-def _get_required_env(key: str, default: str | None = None) -> str:
-    """Get required environment variable or raise error."""
-    value = os.environ.get(key, default)
-    if not value:
-        raise ValueError(f"Missing required environment variable: {key}")
-    return value
+ENV_PATH = Path(__file__).parent.parent / "agents" / ".env"
 
 # RAG Settings
 DEFAULT_TOP_K = 3
 DEFAULT_DISTANCE_THRESHOLD = 0.5
+DEFAULT_LOCATION = "europe-west4"
+
+TRACE_EXPORTERS = ("cloud", "jsonl")
+SESSION_STORES = ("managed", "bounded")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Validated application configuration."""
+
+    project_id: Optional[str] = None
+    location: str = DEFAULT_LOCATION
+    corpus_id: Optional[str] = None
+    rag_top_k: int = DEFAULT_TOP_K
+    rag_distance_threshold: float = DEFAULT_DISTANCE_THRESHOLD
+    rag_cache_ttl_seconds: float = 600.0
+    rag_cache_max_entries: int = 256
+    rag_max_concurrent_queries: int = 32
+
+    jira_project: Optional[str] = None
+    jira_cloud: Optional[str] = None
+    jira_token: Optional[str] = None
+    jira_email: Optional[str] = None
+
+    context_token_budget: int = 6000
+    usage_log_interval_seconds: float = 60.0
+    adaptive_cache_policy: bool = True
+    speculative_retrieval: bool = False
+    turn_deadline_seconds: float = 25.0
+    ticket_outbox_path: Optional[str] = None
+    ticket_mirror_path: Optional[str] = None
+    ticket_mirror_max_staleness_seconds: float = 120.0
+    ticket_mirror_poll_seconds: float = 30.0
+    ticket_webhook_port: Optional[int] = None
+    ticket_webhook_secret: Optional[str] = None
+
+    warmup_enabled: bool = True
+    warmup_budget_seconds: float = 30.0
+    warmup_queries: tuple[str, ...] = ()
+
+    session_max_mb: float = 256.0
+    session_max_events: int = 200
+    session_idle_seconds: float = 1800.0
+    session_spill_path: Optional[str] = None
+
+    admission_control: bool = False
+    admission_user_per_minute: float = 20.0
+    admission_user_burst: float = 10.0
+    admission_global_per_minute: float = 600.0
+    admission_global_burst: float = 100.0
+    admission_max_concurrent: int = 32
+    admission_tickets_per_minute: float = 2.0
+    admission_kb_multi_per_minute: float = 6.0
+
+    observability_enabled: bool = True
+    langfuse_auth_check: bool = True
+    langfuse_auth_check_timeout: float = 5.0
+    metrics_port: Optional[int] = None
+
+    trace_sample_rate: float = 0.1
+    trace_slow_seconds: float = 10.0
+    trace_buffer_max_mb: float = 32.0
+    trace_exporter: str = "cloud"
+    trace_jsonl_dir: str = "traces"
+    trace_jsonl_max_mb: float = 50.0
+    trace_jsonl_rotate_seconds: float = 3600.0
+    trace_jsonl_gzip: bool = False
+    span_queue_max_mb: float = 64.0
+
+    feedback_batch_size: int = 100
+    feedback_flush_seconds: float = 2.0
+
+    session_store: str = "managed"
+
+    @property
+    def jira_configured(self) -> bool:
+        """Whether every Jira setting is present."""
+        return all(
+            (
+                self.jira_project,
+                self.jira_cloud,
+                self.jira_token,
+                self.jira_email,
+            )
+        )
+
+    @property
+    def rag_configured(self) -> bool:
+        """Whether the RAG corpus can be queried."""
+        return bool(self.project_id and self.corpus_id)
+
+
+def _parse(
+    environ: Mapping[str, str], key: str, default: T, parse: Callable[[str], T]
+) -> T:
+    """Parse an optional setting, naming the variable on bad input."""
+    value = environ.get(key)
+    if value is None or value == "":
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {key}: {value!r}") from None
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a true/false environment value."""
+    lowered = value.strip().lower()
+    if lowered not in ("true", "false"):
+        raise ValueError(value)
+    return lowered == "true"
+
+
+def _parse_rate(value: str) -> float:
+    """Parse a fraction between 0 and 1."""
+    rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(value)
+    return rate
+
+
+def _parse_choice(choices: tuple[str, ...]) -> Callable[[str], str]:
+    """Return a parser accepting one of `choices`, in any case."""
+
+    def parse(value: str) -> str:
+        lowered = value.strip().lower()
+        if lowered not in choices:
+            raise ValueError(value)
+        return lowered
+
+    return parse
+
+
+def _parse_queries(value: str) -> tuple[str, ...]:
+    """Parse a `|`-separated list of questions, skipping empty ones."""
+    return tuple(q.strip() for q in value.split("|") if q.strip())
+
+
+def load_config(environ: Optional[Mapping[str, str]] = None) -> AppConfig:
+    """Parse and validate configuration from environment variables.
+
+    Args:
+        environ: Variables to read; defaults to `os.environ` after loading
+                 the `.env` file
+
+    Returns:
+        AppConfig
+
+    Raises:
+        ValueError: If a variable is set to a value of the wrong type
+    """
+    if environ is None:
+        load_dotenv(ENV_PATH)
+        environ = os.environ
+
+    project_id = environ.get("PROJECT") or environ.get("GOOGLE_CLOUD_PROJECT")
+    location = environ.get("LOCATION") or environ.get("GOOGLE_CLOUD_LOCATION")
+    return AppConfig(
+        project_id=project_id or None,
+        location=location or DEFAULT_LOCATION,
+        corpus_id=environ.get("CORPUS_ID") or None,
+        rag_top_k=_parse(environ, "RAG_TOP_K", DEFAULT_TOP_K, int),
+        rag_distance_threshold=_parse(
+            environ,
+            "RAG_DISTANCE_THRESHOLD",
+            DEFAULT_DISTANCE_THRESHOLD,
+            float,
+        ),
+        rag_cache_ttl_seconds=_parse(
+            environ, "RAG_CACHE_TTL_SECONDS", 600.0, float
+        ),
+        rag_cache_max_entries=_parse(
+            environ, "RAG_CACHE_MAX_ENTRIES", 256, int
+        ),
+        rag_max_concurrent_queries=_parse(
+            environ, "RAG_MAX_CONCURRENT_QUERIES", 32, int
+        ),
+        jira_project=environ.get("JIRA_PROJECT") or None,
+        jira_cloud=environ.get("JIRA_CLOUD") or None,
+        jira_token=environ.get("JIRA_TOKEN") or None,
+        jira_email=environ.get("JIRA_EMAIL") or None,
+        context_token_budget=_parse(
+            environ, "CONTEXT_TOKEN_BUDGET", 6000, int
+        ),
+        usage_log_interval_seconds=_parse(
+            environ, "USAGE_LOG_INTERVAL_SECONDS", 60.0, float
+        ),
+        adaptive_cache_policy=_parse(
+            environ, "ADAPTIVE_CACHE_POLICY", True, _parse_bool
+        ),
+        speculative_retrieval=_parse(
+            environ, "SPECULATIVE_RETRIEVAL", False, _parse_bool
+        ),
+        turn_deadline_seconds=_parse(
+            environ, "TURN_DEADLINE_SECONDS", 25.0, float
+        ),
+        ticket_outbox_path=environ.get("TICKET_OUTBOX_PATH") or None,
+        ticket_mirror_path=environ.get("TICKET_MIRROR_PATH") or None,
+        ticket_mirror_max_staleness_seconds=_parse(
+            environ, "TICKET_MIRROR_MAX_STALENESS_SECONDS", 120.0, float
+        ),
+        ticket_mirror_poll_seconds=_parse(
+            environ, "TICKET_MIRROR_POLL_SECONDS", 30.0, float
+        ),
+        ticket_webhook_port=_parse(environ, "TICKET_WEBHOOK_PORT", None, int),
+        ticket_webhook_secret=environ.get("TICKET_WEBHOOK_SECRET") or None,
+        warmup_enabled=_parse(environ, "WARMUP_ENABLED", True, _parse_bool),
+        warmup_budget_seconds=_parse(
+            environ, "WARMUP_BUDGET_SECONDS", 30.0, float
+        ),
+        warmup_queries=_parse(environ, "WARMUP_QUERIES", (), _parse_queries),
+        session_max_mb=_parse(environ, "SESSION_MAX_MB", 256.0, float),
+        session_max_events=_parse(environ, "SESSION_MAX_EVENTS", 200, int),
+        session_idle_seconds=_parse(
+            environ, "SESSION_IDLE_SECONDS", 1800.0, float
+        ),
+        session_spill_path=environ.get("SESSION_SPILL_PATH") or None,
+        admission_control=_parse(
+            environ, "ADMISSION_CONTROL", False, _parse_bool
+        ),
+        admission_user_per_minute=_parse(
+            environ, "ADMISSION_USER_PER_MINUTE", 20.0, float
+        ),
+        admission_user_burst=_parse(
+            environ, "ADMISSION_USER_BURST", 10.0, float
+        ),
+        admission_global_per_minute=_parse(
+            environ, "ADMISSION_GLOBAL_PER_MINUTE", 600.0, float
+        ),
+        admission_global_burst=_parse(
+            environ, "ADMISSION_GLOBAL_BURST", 100.0, float
+        ),
+        admission_max_concurrent=_parse(
+            environ, "ADMISSION_MAX_CONCURRENT", 32, int
+        ),
+        admission_tickets_per_minute=_parse(
+            environ, "ADMISSION_TICKETS_PER_MINUTE", 2.0, float
+        ),
+        admission_kb_multi_per_minute=_parse(
+            environ, "ADMISSION_KB_MULTI_PER_MINUTE", 6.0, float
+        ),
+        observability_enabled=_parse(
+            environ, "OBSERVABILITY_ENABLED", True, _parse_bool
+        ),
+        langfuse_auth_check=_parse(
+            environ, "LANGFUSE_AUTH_CHECK", True, _parse_bool
+        ),
+        langfuse_auth_check_timeout=_parse(
+            environ, "LANGFUSE_AUTH_CHECK_TIMEOUT", 5.0, float
+        ),
+        metrics_port=_parse(environ, "METRICS_PORT", None, int),
+        trace_sample_rate=_parse(
+            environ, "TRACE_SAMPLE_RATE", 0.1, _parse_rate
+        ),
+        trace_slow_seconds=_parse(environ, "TRACE_SLOW_SECONDS", 10.0, float),
+        trace_buffer_max_mb=_parse(
+            environ, "TRACE_BUFFER_MAX_MB", 32.0, float
+        ),
+        trace_exporter=_parse(
+            environ, "TRACE_EXPORTER", "cloud", _parse_choice(TRACE_EXPORTERS)
+        ),
+        trace_jsonl_dir=environ.get("TRACE_JSONL_DIR") or "traces",
+        trace_jsonl_max_mb=_parse(environ, "TRACE_JSONL_MAX_MB", 50.0, float),
+        trace_jsonl_rotate_seconds=_parse(
+            environ, "TRACE_JSONL_ROTATE_SECONDS", 3600.0, float
+        ),
+        trace_jsonl_gzip=_parse(
+            environ, "TRACE_JSONL_GZIP", False, _parse_bool
+        ),
+        span_queue_max_mb=_parse(environ, "SPAN_QUEUE_MAX_MB", 64.0, float),
+        feedback_batch_size=_parse(
+            environ, "FEEDBACK_BATCH_SIZE", 100, int
+        ),
+        feedback_flush_seconds=_parse(
+            environ, "FEEDBACK_FLUSH_SECONDS", 2.0, float
+        ),
+        session_store=_parse(
+            environ, "SESSION_STORE", "managed", _parse_choice(SESSION_STORES)
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Return the process configuration, loading it on first use.
+
+    Call `get_config.cache_clear()` to reload, e.g. in tests.
+    """
+    return load_config()
 
 
 def get_project_id() -> str:
-    """Get project ID from environment."""
-    project_id = os.environ.get("PROJECT") or os.environ.get("GOOGLE_CLOUD_PROJECT")
+    """Get project ID from config."""
+    project_id = get_config().project_id
     if not project_id:
         raise ValueError("PROJECT not set")
     return project_id
 
 
 def get_location() -> str:
-    """Get location from environment."""
-    return os.environ.get("LOCATION") or os.environ.get("GOOGLE_CLOUD_LOCATION", "europe-west4")
+    """Get location from config."""
+    return get_config().location
 
 
 def get_corpus_id() -> str:
-    """Get corpus ID from environment."""
-    corpus_id = os.environ.get("CORPUS_ID")
+    """Get corpus ID from config."""
+    corpus_id = get_config().corpus_id
     if not corpus_id:
         raise ValueError("CORPUS_ID not set")
     return corpus_id
-
-
-
@@ -0,0 +1,59 @@
+"""Per-turn deadline shared by the tools of an invocation.
+
+The deadline is set when a turn starts (see `TurnDeadlinePlugin`) and
+read by the tools through a context variable, so tool signatures, which
+the model sees, do not change. Outside a turn there is no deadline and
+tools use their own default timeouts.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Below this, a network call cannot usefully start
+MIN_CALL_SECONDS = 0.1
+
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    "turn_deadline", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """The turn's deadline has passed or is too close to start a call."""
+
+
+def set_deadline(deadline: Optional[float]) -> None:
+    """Set the deadline of the current turn.
+
+    Args:
+        deadline: `time.monotonic()` value, or None to clear it
+    """
+    _deadline.set(deadline)
+
+
+def remaining_seconds() -> Optional[float]:
+    """Return the seconds left in the current turn, or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def call_timeout(default: float) -> float:
+    """Return the timeout for a call: its default, shrunk to the budget.
+
+    Args:
+        default: Timeout used when the turn has more time left
+
+    Returns:
+        Seconds the call may take
+
+    Raises:
+        DeadlineExceeded: If less than MIN_CALL_SECONDS are left
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return default
+    if remaining < MIN_CALL_SECONDS:
+        raise DeadlineExceeded(f"{-remaining:.2f}s past the turn deadline")
+    return min(default, remaining)
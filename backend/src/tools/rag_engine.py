@@ -1,22 +1,138 @@
 """Vertex AI RAG Engine integration for knowledge base queries."""
 
 import logging
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, Optional, Union
 
-import vertexai
 from google.api_core import exceptions as google_exceptions
-from vertexai.preview import rag
 
-from .config import (
-    DEFAULT_DISTANCE_THRESHOLD,
-    DEFAULT_TOP_K,
-    get_corpus_id,
-    get_location,
-    get_project_id,
-)
+from .config import AppConfig, get_config
+from .deadline import DeadlineExceeded, call_timeout
 
 logger = logging.getLogger(__name__)
 
+# The RAG client has no per-call timeout; queries run on a thread pool so
+# the tool can stop waiting when the turn's deadline is near. An abandoned
+# query finishes in the background and its result is dropped.
+RAG_TIMEOUT_SECONDS = 15.0
+
+_init_lock = threading.Lock()
+_initialized_for: Optional[tuple[str, str]] = None
+
+
+class _QueryPool:
+    """Thread pool that rejects queries when every worker is busy.
+
+    Queries are never queued: time spent waiting for a worker would count
+    against the turn's deadline, and workers still running abandoned
+    queries would make the wait unbounded. A worker is held until its
+    query finishes, even when the caller stopped waiting for it.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Queries running at the same time
+        """
+        self.max_workers = max(max_workers, 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="rag-query"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+    def submit(self, fn: Callable[..., Any], **kwargs: Any) -> Optional[Future]:
+        """Run `fn` on a free worker, or return None if there is none."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+_query_pool: Optional[_QueryPool] = None
+
+
+def _get_query_pool(max_workers: int) -> _QueryPool:
+    """Return the process-wide query pool, creating it on first use."""
+    global _query_pool
+    with _init_lock:
+        if _query_pool is None:
+            _query_pool = _QueryPool(max_workers)
+        return _query_pool
+
+
+def _init_vertexai(project_id: str, location: str) -> None:
+    """Initialize Vertex AI once per project and location.
+
+    `vertexai.init` replaces process-wide settings, so it is not re-run
+    on every query where concurrent calls could race on it.
+
+    Args:
+        project_id: Google Cloud project
+        location: Region of the RAG corpus
+    """
+    global _initialized_for
+    if _initialized_for == (project_id, location):
+        return
+    import vertexai
+
+    with _init_lock:
+        if _initialized_for != (project_id, location):
+            vertexai.init(project=project_id, location=location)
+            _initialized_for = (project_id, location)
+
+
+class _ResultCache:
+    """Thread-safe LRU cache of query results that expire after a TTL."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl_seconds: float) -> Optional[str]:
+        """Return a cached result younger than `ttl_seconds`, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str, max_entries: int) -> None:
+        """Store a result, evicting the least recently used beyond the cap."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+
+_results = _ResultCache()
+
+
+def _cache_key(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a result."""
+    return " ".join(query.lower().split())
+
 
 def query_knowledge_base(query: str) -> str:
     """Query Vertex AI RAG corpus and retrieve relevant information.
@@ -27,28 +143,74 @@ def query_knowledge_base(query: str) -> str:
     Returns:
         str: Formatted string containing query results.
     """
+    config = get_config()
+    if not config.rag_configured:
+        logger.error("RAG query skipped: PROJECT or CORPUS_ID not set")
+        return {
+            "status": "error",
+            "message": "Knowledge base not configured",
+            "query": query,
+        }
+
+    # Frequent questions are answered from the cache; errors are not cached
+    key = _cache_key(query)
+    if config.rag_cache_ttl_seconds > 0:
+        cached = _results.get(key, config.rag_cache_ttl_seconds)
+        if cached is not None:
+            return cached
+
+    result = _query_corpus(query, config)
+    if isinstance(result, str) and config.rag_cache_ttl_seconds > 0:
+        _results.put(key, result, config.rag_cache_max_entries)
+    return result
+
+
+def _query_corpus(query: str, config: AppConfig) -> Union[str, dict[str, Any]]:
+    """Query the RAG corpus without the cache.
+
+    Args:
+        query: User query to search knowledge base.
+        config: Config with the corpus and retrieval settings.
+
+    Returns:
+        Formatted results, or an error dictionary.
+    """
+    # Imported on first use to keep the agent package quick to import
+    from vertexai.preview import rag
+
     try:
-        project_id = get_project_id()
-        location = get_location()
-        corpus_id = get_corpus_id()
+        project_id = config.project_id
+        location = config.location
+        corpus_id = config.corpus_id
         
         logger.info(f"RAG Query - Project: {project_id}, Location: {location}, Corpus: {corpus_id}")
         
-        # Initialize Vertex AI with runtime environment variables
-        vertexai.init(project=project_id, location=location)
+        _init_vertexai(project_id, location)
         
         corpus_resource_name = f"projects/{project_id}/locations/{location}/ragCorpora/{corpus_id}"
 
         rag_retrieval_config = rag.RagRetrievalConfig(
-            top_k=DEFAULT_TOP_K,
-            filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
+            top_k=config.rag_top_k,
+            filter=rag.Filter(
+                vector_distance_threshold=config.rag_distance_threshold
+            ),
         )
 
-        response = rag.retrieval_query(
+        timeout = call_timeout(RAG_TIMEOUT_SECONDS)
+        future = _get_query_pool(config.rag_max_concurrent_queries).submit(
+            rag.retrieval_query,
             rag_resources=[rag.RagResource(rag_corpus=corpus_resource_name)],
             text=query,
             rag_retrieval_config=rag_retrieval_config,
         )
+        if future is None:
+            logger.warning(f"RAG query rejected, all workers busy: {query}")
+            return {
+                "status": "error",
+                "message": "Knowledge base busy",
+                "query": query,
+            }
+        response = future.result(timeout=timeout)
 
         results = []
         if hasattr(response, "contexts") and response.contexts:
@@ -69,7 +231,7 @@ def query_knowledge_base(query: str) -> str:
         return f"Found {len(results)} relevant results:\n\n{formatted_results}"
 
     except google_exceptions.NotFound:
-        logger.error(f"RAG corpus not found: {get_corpus_id()}")
+        logger.error(f"RAG corpus not found: {config.corpus_id}")
         return {
             "status": "error",
             "message": "Knowledge base not configured",
@@ -82,7 +244,11 @@ def query_knowledge_base(query: str) -> str:
             "message": "Access denied to knowledge base",
             "query": query,
         }
-    except google_exceptions.DeadlineExceeded:
+    except (
+        google_exceptions.DeadlineExceeded,
+        DeadlineExceeded,
+        FutureTimeoutError,
+    ):
         logger.warning(f"RAG query timeout for: {query}")
         return {
             "status": "error",
@@ -95,4 +261,19 @@ def query_knowledge_base(query: str) -> str:
             "status": "error",
             "message": f"Knowledge base error: {type(e).__name__}",
             "query": query,
-        }
\ No newline at end of file
+        }
+
+def warm_up_rag(queries: Iterable[str]) -> int:
+    """Initialize Vertex AI and prime the cache with frequent queries.
+
+    Args:
+        queries: Questions customers ask often
+
+    Returns:
+        Number of queries whose results were cached
+    """
+    config = get_config()
+    if not config.rag_configured:
+        return 0
+    _init_vertexai(config.project_id, config.location)
+    return sum(isinstance(query_knowledge_base(q), str) for q in queries)
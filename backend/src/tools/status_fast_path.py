@@ -0,0 +1,312 @@
+"""Deterministic fast path for plain ticket-status questions.
+
+A message such as "status of GEN-23" (or of a queued complaint's
+"REF-4F9A2C") does not need the supervisor, the
+status_check_agent and a phrasing turn. When the message is a short status
+question that names exactly one ticket, the ticket is fetched directly and a
+templated reply is rendered in the customer's language. Anything else falls
+through to the agents.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+from typing import Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from .config import get_config
+from .ticket import get_ticket_by_key
+from .ticket_outbox import LOCAL_REFERENCE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Longer messages usually ask for more than the status (escalation,
+# explanations, follow-up questions), so they go to the agent.
+STATUS_FAST_PATH_MAX_WORDS = 12
+
+# Invocation whose message the fast path has already tried. The supervisor
+# and the status_check_agent both run the callback; whichever runs first
+# tries the lookup and the other one does not repeat it, even if it failed.
+FAST_PATH_TRIED_KEY = "status_fast_path_invocation"
+
+
+@functools.lru_cache(maxsize=4)
+def _project_key_pattern(project: str) -> re.Pattern:
+    """Compile the pattern matching keys of a Jira project."""
+    return re.compile(
+        rf"\b{re.escape(project)}\s*[-_ ]?\s*(\d+)\b", re.IGNORECASE
+    )
+
+
+_LOCAL_REFERENCE_PATTERN = re.compile(
+    rf"\b{LOCAL_REFERENCE_PREFIX}-[0-9A-F]{{6}}\b", re.IGNORECASE
+)
+
+_BARE_NUMBER_PATTERN = re.compile(
+    r"(?:ticket|complaint|#)\s*(?:id|no\.?|number)?\s*[:#]?\s*(\d+)\b",
+    re.IGNORECASE,
+)
+
+_STATUS_KEYWORDS = (
+    "status",
+    "progress",
+    "තත්ත්වය",
+    "තත්වය",
+    "ස්ටේටස්",
+    "நிலை",
+    "நிலைமை",
+    "ஸ்டேட்டஸ்",
+)
+
+# "Update" alone may be a request to change the ticket ("please update
+# GEN-23 with my new account number"); only asking for one is a status
+# question.
+_UPDATE_QUESTION_PATTERN = re.compile(
+    r"\b(?:any|an|latest|new)\s+updates?\b|\bupdates?\s+(?:on|about|for)\b",
+    re.IGNORECASE,
+)
+
+# Romanized markers, used only when the message is written in Latin script.
+_ROMANIZED_SINHALA = ("eka", "ekata", "mokakda", "kohomada", "mage", "mata")
+_ROMANIZED_TAMIL = ("enna", "ennoda", "nilai", "enakku", "epdi", "irukku")
+
+_STATUS_NAMES: Dict[str, Dict[str, str]] = {
+    "sinhala": {
+        "to do": "ක්‍රියාත්මක වීමට නියමිත",
+        "open": "විවෘත",
+        "in progress": "ක්‍රියාත්මක වෙමින් පවතින",
+        "done": "සම්පූර්ණ කළ",
+        "resolved": "විසඳා ඇති",
+        "closed": "වසා දැමූ",
+        "queued": "ගොනු කිරීමට පෝලිමේ ඇති",
+    },
+    "tamil": {
+        "to do": "நிலுவையில் உள்ள",
+        "open": "திறந்த",
+        "in progress": "செயல்பாட்டில் உள்ள",
+        "done": "முடிக்கப்பட்ட",
+        "resolved": "தீர்க்கப்பட்ட",
+        "closed": "மூடப்பட்ட",
+        "queued": "பதிவு செய்ய வரிசையில் உள்ள",
+    },
+}
+
+_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "english": {
+        "status": "Your ticket {ticket_id} ({summary}) is currently {status}.",
+        "resolution": "Resolution: {resolution}.",
+        "pending": (
+            "Our team is still working on it and we will update you as soon "
+            "as there is progress."
+        ),
+    },
+    "sinhala": {
+        "status": (
+            "ඔබගේ {ticket_id} ටිකට්පත ({summary}) දැනට {status} "
+            "තත්ත්වයේ පවතී."
+        ),
+        "resolution": "විසඳුම: {resolution}.",
+        "pending": (
+            "අපගේ කණ්ඩායම තවමත් එය විසඳීමට කටයුතු කරමින් සිටී. ප්‍රගතියක් "
+            "ඇති වූ විගස අපි ඔබව දැනුවත් කරන්නෙමු."
+        ),
+    },
+    "tamil": {
+        "status": (
+            "உங்கள் {ticket_id} டிக்கெட் ({summary}) தற்போது {status} "
+            "நிலையில் உள்ளது."
+        ),
+        "resolution": "தீர்வு: {resolution}.",
+        "pending": (
+            "எங்கள் குழு இதைத் தீர்க்க தொடர்ந்து செயல்பட்டு வருகிறது. "
+            "முன்னேற்றம் ஏற்பட்டவுடன் உங்களுக்குத் தெரிவிப்போம்."
+        ),
+    },
+}
+
+
+def extract_ticket_key(message: str) -> Optional[str]:
+    """Extract a single ticket key from a customer message.
+
+    Accepts 'GEN-23', 'gen 23', 'GEN23', outbox references such as
+    'REF-4F9A2C' and, when the message mentions a ticket or complaint, a
+    bare number ('ticket 23' means 'GEN-23').
+
+    Args:
+        message: Raw customer message.
+
+    Returns:
+        The normalized ticket key, or None if no key or more than one
+        distinct key is present, or Jira is not configured.
+    """
+    project = get_config().jira_project
+    if not project:
+        return None
+    numbers = _project_key_pattern(project).findall(message)
+    keys = {f"{project}-{int(number)}" for number in numbers}
+    keys.update(
+        reference.upper()
+        for reference in _LOCAL_REFERENCE_PATTERN.findall(message)
+    )
+    if not keys:
+        keys = {
+            f"{project}-{int(number)}"
+            for number in _BARE_NUMBER_PATTERN.findall(message)
+        }
+    if len(keys) != 1:
+        return None
+    return keys.pop()
+
+
+def detect_language(message: str, default: str = "english") -> str:
+    """Detect the reply language from the script of the message.
+
+    Args:
+        message: Raw customer message.
+        default: Language to use for Latin-script messages without
+                 romanized Sinhala or Tamil markers.
+
+    Returns:
+        One of 'english', 'sinhala' or 'tamil'.
+    """
+    if any("\u0d80" <= ch <= "\u0dff" for ch in message):
+        return "sinhala"
+    if any("\u0b80" <= ch <= "\u0bff" for ch in message):
+        return "tamil"
+
+    words = set(re.findall(r"[a-z]+", message.lower()))
+    if words.intersection(_ROMANIZED_SINHALA):
+        return "sinhala"
+    if words.intersection(_ROMANIZED_TAMIL):
+        return "tamil"
+    return default
+
+
+def is_status_request(message: str) -> bool:
+    """Check whether a message is a plain status question for one ticket.
+
+    Args:
+        message: Raw customer message.
+
+    Returns:
+        True if the message is short, names a ticket and either asks for its
+        status or consists of the ticket key alone.
+    """
+    words = message.split()
+    if not words or len(words) > STATUS_FAST_PATH_MAX_WORDS:
+        return False
+    if extract_ticket_key(message) is None:
+        return False
+    pattern = _project_key_pattern(get_config().jira_project)
+    key_alone = message.strip()
+    if pattern.fullmatch(key_alone) or _LOCAL_REFERENCE_PATTERN.fullmatch(
+        key_alone
+    ):
+        return True
+    lowered = message.lower()
+    if any(keyword in lowered for keyword in _STATUS_KEYWORDS):
+        return True
+    return _UPDATE_QUESTION_PATTERN.search(message) is not None
+
+
+def render_status_reply(ticket: Dict[str, Optional[str]], language: str) -> str:
+    """Render a templated status reply from a ticket returned by Jira.
+
+    Args:
+        ticket: The 'ticket' dictionary returned by get_ticket_by_key.
+        language: Reply language ('english', 'sinhala' or 'tamil').
+
+    Returns:
+        Localized reply text.
+    """
+    templates = _TEMPLATES.get(language, _TEMPLATES["english"])
+    status = ticket.get("status") or "Open"
+    status_name = _STATUS_NAMES.get(language, {}).get(status.lower(), status)
+
+    lines = [
+        templates["status"].format(
+            ticket_id=ticket.get("ticket_id"),
+            summary=ticket.get("summary") or "",
+            status=status_name,
+        )
+    ]
+    if ticket.get("resolution"):
+        lines.append(
+            templates["resolution"].format(resolution=ticket["resolution"])
+        )
+    else:
+        lines.append(templates["pending"])
+    return " ".join(lines)
+
+
+def answer_status_request(
+    message: str, user_id: str, language: str
+) -> Optional[str]:
+    """Answer a plain status question without an LLM turn.
+
+    Args:
+        message: Raw customer message.
+        user_id: The unique ID of the user, used to verify ticket ownership.
+        language: Reply language.
+
+    Returns:
+        Reply text, or None if the message should be handled by the agents
+        (not a plain status question, or the ticket lookup failed).
+    """
+    if not user_id or not is_status_request(message):
+        return None
+
+    ticket_id = extract_ticket_key(message)
+    result = get_ticket_by_key(user_id, ticket_id)
+    if "ticket" not in result:
+        logger.info(
+            f"Status fast path fell through for {ticket_id}: "
+            f"{result.get('status_code')}"
+        )
+        return None
+
+    logger.info(f"Status fast path answered {ticket_id} in {language}")
+    return render_status_reply(result["ticket"], language)
+
+
+async def status_fast_path_callback(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+    """Before-agent callback that short-circuits plain status questions.
+
+    The fast path is tried once per invocation, by the first agent that
+    runs it: a failed lookup is left to the agents instead of being
+    repeated, and a transfer back always reaches the model. The lookup
+    blocks on the Jira client, so it runs in a worker thread.
+    """
+    try:
+        user_id = callback_context._invocation_context.user_id
+    except AttributeError:
+        logger.warning("Could not access invocation context for fast path")
+        return None
+
+    state = callback_context.state
+    if state.get(FAST_PATH_TRIED_KEY) == callback_context.invocation_id:
+        return None
+
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return None
+    message = " ".join(part.text for part in user_content.parts if part.text)
+    if not user_id or not is_status_request(message):
+        return None
+
+    state[FAST_PATH_TRIED_KEY] = callback_context.invocation_id
+    language = detect_language(message, state.get("language", "english"))
+    reply = await asyncio.to_thread(
+        answer_status_request, message, user_id, language
+    )
+    if reply is None:
+        return None
+
+    state["language"] = language
+    state["user_id"] = user_id
+    return types.Content(role="model", parts=[types.Part(text=reply)])
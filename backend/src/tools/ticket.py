@@ -1,45 +1,197 @@
 import base64
 import json
 import logging
-import os
-from pathlib import Path
-from typing import Dict, Union
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
 
 import requests
-from dotenv import load_dotenv
+
+from .config import AppConfig, get_config
+from .deadline import DeadlineExceeded, call_timeout
+from .ticket_mirror import TicketMirror, serve_webhook
+from .ticket_outbox import TicketOutbox, is_local_reference
 
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("requests").setLevel(logging.WARNING)
 
-env_path = Path(__file__).parent.parent / "agents" / ".env"
-load_dotenv(dotenv_path=env_path)
+logger = logging.getLogger(__name__)
+
+NOT_CONFIGURED = {"error": "Ticketing is not configured", "status_code": 503}
+TIMED_OUT = {"error": "Ticketing did not answer in time", "status_code": 504}
+
+# Per-request timeout, shrunk to what is left of the turn's deadline
+JIRA_TIMEOUT_SECONDS = 10.0
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-def _get_required_env(key: str) -> str:
-    """Get required environment variable or raise error."""
-    value = os.environ.get(key)
-    if not value:
-        raise ValueError(f"Missing required environment variable: {key}")
-    return value
+_outbox: Optional[TicketOutbox] = None
+_outbox_lock = threading.Lock()
 
+_mirror: Optional[TicketMirror] = None
+_mirror_lock = threading.Lock()
 
-JIRA_PROJECT = _get_required_env("JIRA_PROJECT")
-JIRA_CLOUD = _get_required_env("JIRA_CLOUD")
-JIRA_TOKEN = _get_required_env("JIRA_TOKEN")
-JIRA_EMAIL = _get_required_env("JIRA_EMAIL")
 
+def _http() -> requests.Session:
+    """Return the shared Jira session, creating it on first use.
+
+    The session keeps TLS connections to Jira open between calls; its
+    urllib3 connection pool is thread-safe.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+
+def _jira_config() -> Optional[AppConfig]:
+    """Return the config if Jira is configured, otherwise None."""
+    config = get_config()
+    if not config.jira_configured:
+        logger.error(
+            "Jira is not configured: set JIRA_PROJECT, JIRA_CLOUD, "
+            "JIRA_TOKEN and JIRA_EMAIL"
+        )
+        return None
+    return config
 
-def _get_auth_header() -> Dict[str, str]:
+
+def _get_auth_header(config: AppConfig) -> Dict[str, str]:
     """Generate authorization header securely.
-    
+
+    Args:
+        config: Config with the Jira credentials
+
     Returns:
         Dictionary with Authorization header
     """
-    auth_string = f"{JIRA_EMAIL}:{JIRA_TOKEN}"
+    auth_string = f"{config.jira_email}:{config.jira_token}"
     encoded_auth = base64.b64encode(auth_string.encode()).decode()
     return {"Authorization": f"Basic {encoded_auth}"}
 
 
+def ticket_outbox() -> Optional[TicketOutbox]:
+    """Return the ticket outbox, opening it and its sender on first use.
+
+    Returns:
+        The outbox, or None unless TICKET_OUTBOX_PATH is set
+    """
+    global _outbox
+    path = get_config().ticket_outbox_path
+    if not path:
+        return None
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                outbox = TicketOutbox(
+                    path, submit=_post_ticket, find=_find_queued_ticket
+                )
+                outbox.start()
+                _outbox = outbox
+    return _outbox
+
+
+def ticket_mirror() -> Optional[TicketMirror]:
+    """Return the ticket mirror, opening it and its sync on first use.
+
+    Also starts the webhook receiver if TICKET_WEBHOOK_PORT and
+    TICKET_WEBHOOK_SECRET are set.
+
+    Returns:
+        The mirror, or None unless TICKET_MIRROR_PATH is set
+    """
+    global _mirror
+    config = get_config()
+    if not config.ticket_mirror_path:
+        return None
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                mirror = TicketMirror(
+                    config.ticket_mirror_path,
+                    fetch=_fetch_project_issues,
+                    max_staleness_seconds=(
+                        config.ticket_mirror_max_staleness_seconds
+                    ),
+                    poll_seconds=config.ticket_mirror_poll_seconds,
+                )
+                mirror.start()
+                _mirror = mirror
+                _start_webhook(mirror, config)
+    return _mirror
+
+
+def _start_webhook(mirror: TicketMirror, config: AppConfig) -> None:
+    """Receive Jira webhooks for the mirror, if configured.
+
+    A failure is logged, not raised: the mirror still syncs by polling.
+    """
+    port = config.ticket_webhook_port
+    if port is None:
+        return
+    if not config.ticket_webhook_secret:
+        logger.error(
+            "Not receiving Jira webhooks: TICKET_WEBHOOK_SECRET is not set"
+        )
+        return
+    try:
+        serve_webhook(mirror, port, secret=config.ticket_webhook_secret)
+    except OSError:
+        logger.exception(
+            f"Could not start the Jira webhook receiver on port {port}"
+        )
+
+
+def _fetch_project_issues(since: Optional[float]) -> List[Dict[str, Any]]:
+    """Fetch the project's issues updated since a time, for the mirror.
+
+    Args:
+        since: Epoch seconds, or None for all issues
+
+    Returns:
+        Raw Jira issues
+
+    Raises:
+        RuntimeError: If Jira is not configured or answers with an error
+    """
+    config = _jira_config()
+    if config is None:
+        raise RuntimeError(NOT_CONFIGURED["error"])
+
+    jql = f"project = {config.jira_project}"
+    if since is not None:
+        # Relative dates avoid the JQL user's time zone
+        minutes = max(1, math.ceil((time.time() - since) / 60))
+        jql += f" AND updated >= -{minutes}m"
+    url = f"https://api.atlassian.com/ex/jira/{config.jira_cloud}/rest/api/3/search/jql"
+    headers = {**_get_auth_header(config), "Accept": "application/json"}
+    params = {
+        "jql": f"{jql} ORDER BY updated ASC",
+        "fields": "summary,description,issuetype,status,resolution,"
+        "updated,customfield_10088",
+        "maxResults": 100,
+    }
+
+    issues = []
+    while True:
+        response = _http().get(
+            url, headers=headers, params=params, timeout=JIRA_TIMEOUT_SECONDS
+        )
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Jira search failed with status {response.status_code}"
+            )
+        data = response.json()
+        issues.extend(data.get("issues", []))
+        if data.get("isLast", True) or not data.get("nextPageToken"):
+            return issues
+        params["nextPageToken"] = data["nextPageToken"]
+
+
 def create_jira_ticket(
     user_id: str, summary: str, description: str, issue_type: str
 ) -> Dict[str, Union[str, int]]:
@@ -55,15 +207,49 @@ def create_jira_ticket(
         Dictionary containing:
             - id: The internal Jira issue ID.
             - key: Ticket ID for the customer (e.g., 'GEN-23'), this is for the customer to refer later.
+              When the ticket is queued, a reference such as 'REF-4F9A2C'
+              that the customer can use the same way.
             - self: The REST API URL to the created issue.
-            - status_code: The HTTP response code.
+            - status_code: The HTTP response code (202 when queued).
+            - message: Note for the customer when the ticket is queued.
             - error: Error message if request failed.
     """
-    url = f"https://api.atlassian.com/ex/jira/{JIRA_CLOUD}/rest/api/3/issue"
+    config = _jira_config()
+    if config is None:
+        return dict(NOT_CONFIGURED)
+
+    outbox = ticket_outbox()
+    if outbox is not None:
+        reference = outbox.enqueue(user_id, summary, description, issue_type)
+        return {
+            "key": reference,
+            "status_code": 202,
+            "message": "The complaint is recorded and will be filed shortly",
+        }
+    return _post_ticket(user_id, summary, description, issue_type)
+
+
+def _post_ticket(
+    user_id: str,
+    summary: str,
+    description: str,
+    issue_type: str,
+    reference: Optional[str] = None,
+) -> Dict[str, Union[str, int]]:
+    """Create the Jira issue of a complaint; see `create_jira_ticket`.
+
+    A queued complaint's reference is added as a label, by which
+    `_find_queued_ticket` finds it.
+    """
+    config = _jira_config()
+    if config is None:
+        return dict(NOT_CONFIGURED)
+
+    url = f"https://api.atlassian.com/ex/jira/{config.jira_cloud}/rest/api/3/issue"
 
     payload = {
         "fields": {
-            "project": {"key": JIRA_PROJECT},
+            "project": {"key": config.jira_project},
             "summary": summary,
             "description": {
                 "type": "doc",
@@ -79,16 +265,21 @@ def create_jira_ticket(
             "customfield_10088": user_id,
         }
     }
+    if reference is not None:
+        payload["fields"]["labels"] = [reference]
 
     headers = {
-        **_get_auth_header(),
+        **_get_auth_header(config),
         "Accept": "application/json",
         "Content-Type": "application/json",
     }
 
     try:
-        response = requests.post(
-            url, headers=headers, data=json.dumps(payload), timeout=10
+        response = _http().post(
+            url,
+            headers=headers,
+            data=json.dumps(payload),
+            timeout=call_timeout(JIRA_TIMEOUT_SECONDS),
         )
 
         if response.status_code not in [200, 201]:
@@ -97,12 +288,51 @@ def create_jira_ticket(
                 "status_code": response.status_code,
             }
 
+        mirror = ticket_mirror()
+        if mirror is not None:
+            mirror.request_sync()
         return {"status_code": response.status_code, **response.json()}
 
-    except requests.exceptions.RequestException:
+    except (DeadlineExceeded, requests.exceptions.Timeout):
+        return dict(TIMED_OUT)
+    except Exception:
+        logger.exception("Error creating Jira ticket")
         return {"error": "Network error creating ticket", "status_code": 500}
 
 
+def _find_queued_ticket(reference: str) -> Optional[str]:
+    """Return the key of the Jira issue filed for an outbox reference.
+
+    Args:
+        reference: Outbox reference, added as a label when filed
+
+    Returns:
+        The issue key, or None if no issue has the label
+
+    Raises:
+        RuntimeError: If Jira is not configured or answers with an error
+    """
+    config = _jira_config()
+    if config is None:
+        raise RuntimeError(NOT_CONFIGURED["error"])
+
+    url = f"https://api.atlassian.com/ex/jira/{config.jira_cloud}/rest/api/3/search/jql"
+    params = {
+        "jql": f'project = {config.jira_project} AND labels = "{reference}"',
+        "fields": "summary",
+        "maxResults": 1,
+    }
+    headers = {**_get_auth_header(config), "Accept": "application/json"}
+    response = _http().get(
+        url, headers=headers, params=params, timeout=JIRA_TIMEOUT_SECONDS
+    )
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Jira search failed with status {response.status_code}"
+        )
+    issues = response.json().get("issues", [])
+    return issues[0].get("key") if issues else None
+
 
 def get_user_tickets(user_id: str) -> Dict[str, Union[str, int, list]]:
     """Retrieves existing Jira tickets for a specific user.
@@ -130,8 +360,20 @@ def get_user_tickets(user_id: str) -> Dict[str, Union[str, int, list]]:
             - error: Error message string if request failed (only present
                     on failure).
     """
-    jql = f'project = {JIRA_PROJECT} AND "customfield_10088" ~ "{user_id}"'
-    url = f"https://api.atlassian.com/ex/jira/{JIRA_CLOUD}/rest/api/3/search/jql"
+    config = _jira_config()
+    if config is None:
+        return dict(NOT_CONFIGURED)
+
+    mirror = ticket_mirror()
+    mirrored = mirror.user_tickets(user_id) if mirror is not None else None
+    if mirrored is not None:
+        return {
+            "status_code": 200,
+            "tickets": mirrored + _queued_tickets(user_id),
+        }
+
+    jql = f'project = {config.jira_project} AND "customfield_10088" ~ "{user_id}"'
+    url = f"https://api.atlassian.com/ex/jira/{config.jira_cloud}/rest/api/3/search/jql"
 
     params = {
         "jql": jql,
@@ -139,16 +381,23 @@ def get_user_tickets(user_id: str) -> Dict[str, Union[str, int, list]]:
         "maxResults": 100,
     }
 
-    headers = {**_get_auth_header(), "Accept": "application/json"}
+    headers = {**_get_auth_header(config), "Accept": "application/json"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _http().get(
+            url,
+            headers=headers,
+            params=params,
+            timeout=call_timeout(JIRA_TIMEOUT_SECONDS),
+        )
 
         if response.status_code != 200:
             return {
                 "error": "Failed to retrieve tickets",
                 "status_code": response.status_code,
             }
+    except (DeadlineExceeded, requests.exceptions.Timeout):
+        return dict(TIMED_OUT)
     except requests.exceptions.RequestException:
         return {"error": "Network error retrieving tickets", "status_code": 500}
 
@@ -177,9 +426,58 @@ def get_user_tickets(user_id: str) -> Dict[str, Union[str, int, list]]:
             }
         )
 
+    tickets.extend(_queued_tickets(user_id))
+
     return {"status_code": response.status_code, "tickets": tickets}
 
 
+def _queued_tickets(user_id: str) -> List[Dict[str, str]]:
+    """List the user's complaints still waiting in the outbox."""
+    outbox = ticket_outbox()
+    if outbox is None:
+        return []
+    return [
+        {"ticket_id": entry["reference"], "summary": entry["summary"]}
+        for entry in outbox.pending_for_user(user_id)
+        if entry["state"] == "pending"
+    ]
+
+
+def _queued_ticket(
+    user_id: str, reference: str
+) -> Dict[str, Union[str, int, dict]]:
+    """Look up an outbox reference.
+
+    Returns:
+        The ticket of a complaint not yet filed, an error, or, once filed,
+        {"key": <Jira key>} for the caller to look up in Jira
+    """
+    outbox = ticket_outbox()
+    entry = outbox.resolve(reference) if outbox is not None else None
+    if entry is None or entry["user_id"] != user_id:
+        return {
+            "error": f"Ticket {reference} not found for user {user_id}",
+            "status_code": 404,
+        }
+    if entry["jira_key"]:
+        return {"key": entry["jira_key"]}
+    if entry["state"] == "failed":
+        return {
+            "error": f"Ticket {reference} could not be filed; "
+            "the complaint needs to be raised again",
+            "status_code": 422,
+        }
+    ticket = {
+        "ticket_id": entry["reference"],
+        "summary": entry["summary"],
+        "description": entry["description"],
+        "issue_type": entry["issue_type"],
+        "status": "Queued",
+        "resolution": None,
+    }
+    return {"status_code": 200, "ticket": ticket}
+
+
 def get_ticket_by_key(
     user_id: str, ticket_id: str
 ) -> Dict[str, Union[str, int, dict]]:
@@ -188,27 +486,48 @@ def get_ticket_by_key(
     Args:
         user_id: The unique ID of the user stored in Jira custom field
                  'customfield_10088'. Used to verify ticket ownership.
-        ticket_id: The Jira ticket identifier (e.g., 'GEN-23') to retrieve.
+        ticket_id: The Jira ticket identifier (e.g., 'GEN-23') or queued
+                   ticket reference (e.g., 'REF-4F9A2C') to retrieve.
 
     Returns:
         Dictionary containing:
             - status_code: HTTP response status code (200 for success).
             - ticket: Dictionary containing ticket details:
                 - ticket_id: Jira ticket identifier (e.g., 'GEN-23').
+                - reference: The queued ticket reference it was filed
+                             under, if one was given.
                 - summary: Short title or summary of the ticket.
                 - description: Detailed description of the issue in plain text.
                 - issue_type: Type of issue (e.g., 'Settlement', 'On Boarding',
                              'Task', 'Bug').
-                - status: Current ticket status (e.g., 'Open', 'In Progress',
-                         'Done', 'Closed').
+                - status: Current ticket status (e.g., 'Queued', 'Open',
+                         'In Progress', 'Done', 'Closed').
                 - resolution: Resolution status if ticket is resolved
                              (e.g., 'Fixed', 'Won\'t Fix', 'Duplicate'),
                              or None if unresolved.
             - error: Error message string if request failed or ticket not
                     found (only present on failure).
     """
-    jql = f'key = {ticket_id} AND project = {JIRA_PROJECT} AND "customfield_10088" ~ "{user_id}"'
-    url = f"https://api.atlassian.com/ex/jira/{JIRA_CLOUD}/rest/api/3/search/jql"
+    config = _jira_config()
+    if config is None:
+        return dict(NOT_CONFIGURED)
+
+    reference = None
+    if is_local_reference(ticket_id):
+        queued = _queued_ticket(user_id, ticket_id)
+        if "key" not in queued:
+            return queued
+        reference, ticket_id = ticket_id.strip().upper(), queued["key"]
+
+    mirror = ticket_mirror()
+    ticket = mirror.ticket(user_id, ticket_id) if mirror is not None else None
+    if ticket is not None:
+        if reference is not None:
+            ticket["reference"] = reference
+        return {"status_code": 200, "ticket": ticket}
+
+    jql = f'key = {ticket_id} AND project = {config.jira_project} AND "customfield_10088" ~ "{user_id}"'
+    url = f"https://api.atlassian.com/ex/jira/{config.jira_cloud}/rest/api/3/search/jql"
 
     params = {
         "jql": jql,
@@ -216,16 +535,23 @@ def get_ticket_by_key(
         "maxResults": 1,
     }
 
-    headers = {**_get_auth_header(), "Accept": "application/json"}
+    headers = {**_get_auth_header(config), "Accept": "application/json"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _http().get(
+            url,
+            headers=headers,
+            params=params,
+            timeout=call_timeout(JIRA_TIMEOUT_SECONDS),
+        )
 
         if response.status_code != 200:
             return {
                 "error": "Failed to retrieve ticket",
                 "status_code": response.status_code,
             }
+    except (DeadlineExceeded, requests.exceptions.Timeout):
+        return dict(TIMED_OUT)
     except requests.exceptions.RequestException:
         return {"error": "Network error retrieving ticket", "status_code": 500}
 
@@ -260,8 +586,26 @@ def get_ticket_by_key(
         if fields.get("resolution")
         else None,
     }
+    if reference is not None:
+        ticket["reference"] = reference
 
     return {"status_code": response.status_code, "ticket": ticket}
 
 
+def warm_up_jira() -> bool:
+    """Open a pooled connection to Jira before the first ticket call.
 
+    Returns:
+        True if Jira answered, False if it is not configured or failed
+    """
+    config = _jira_config()
+    if config is None:
+        return False
+    url = (
+        f"https://api.atlassian.com/ex/jira/{config.jira_cloud}"
+        "/rest/api/3/serverInfo"
+    )
+    response = _http().get(
+        url, headers=_get_auth_header(config), timeout=JIRA_TIMEOUT_SECONDS
+    )
+    return response.status_code == 200
@@ -0,0 +1,474 @@
+"""Local mirror of the project's Jira tickets for status lookups.
+
+Tickets are kept in a SQLite database indexed by customer and key. A
+background thread keeps it fresh by fetching the tickets updated since
+the last sync (with some overlap), and periodically all tickets to drop
+deleted ones; a Jira webhook can push changes in between. Lookups are
+served from the mirror only while the last successful sync is recent
+enough, so answers are at most `max_staleness_seconds` old; otherwise the
+caller falls back to Jira.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Field holding the customer's user ID
+USER_FIELD = "customfield_10088"
+
+# Largest webhook request accepted; issue events are a few kilobytes
+MAX_WEBHOOK_BYTES = 1024 * 1024
+
+_JIRA_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    key TEXT PRIMARY KEY,
+    user_id TEXT,
+    summary TEXT,
+    description TEXT,
+    issue_type TEXT,
+    status TEXT,
+    resolution TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS tickets_user ON tickets (user_id, updated_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Parse a Jira time such as "2025-01-01T10:00:00.000+0000"."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value, _JIRA_TIME_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def ticket_from_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a Jira issue into the row stored in the mirror."""
+    fields = issue.get("fields") or {}
+    description = fields.get("description")
+    description_text = ""
+    if isinstance(description, dict):
+        for content_block in description.get("content", []):
+            for item in content_block.get("content", []):
+                if item.get("type") == "text":
+                    description_text += item.get("text", "")
+    user_id = fields.get(USER_FIELD)
+    return {
+        "key": str(issue.get("key", "")).upper(),
+        "user_id": str(user_id) if user_id is not None else None,
+        "summary": fields.get("summary"),
+        "description": description_text,
+        "issue_type": (fields.get("issuetype") or {}).get("name"),
+        "status": (fields.get("status") or {}).get("name"),
+        "resolution": (fields.get("resolution") or {}).get("name"),
+        "updated_at": _timestamp(fields.get("updated")),
+    }
+
+
+class TicketMirror:
+    """SQLite mirror of Jira tickets, synced incrementally.
+
+    `fetch` is called with the epoch time to fetch updates from, or None
+    for all tickets, and returns the raw Jira issues; it raises if Jira
+    could not be searched.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fetch: Callable[[Optional[float]], Iterable[Dict[str, Any]]],
+        max_staleness_seconds: float = 120.0,
+        poll_seconds: float = 30.0,
+        full_sync_seconds: float = 3600.0,
+        overlap_seconds: float = 60.0,
+    ) -> None:
+        """Open (or create) the mirror database.
+
+        Args:
+            path: SQLite file, shared by the workers of an instance
+            fetch: Searches Jira for tickets updated since a time
+            max_staleness_seconds: Age of the last successful sync after
+                                   which lookups are not served
+            poll_seconds: Time between incremental syncs
+            full_sync_seconds: Time between syncs of all tickets, which
+                               also drop deleted ones
+            overlap_seconds: Extra time fetched before the last sync, for
+                             clock skew and Jira's index delay
+        """
+        self._fetch = fetch
+        self._max_staleness = max_staleness_seconds
+        self._poll_seconds = poll_seconds
+        self._full_sync_seconds = full_sync_seconds
+        self._overlap_seconds = overlap_seconds
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "syncs": 0,
+            "full_syncs": 0,
+            "sync_failures": 0,
+            "webhook_events": 0,
+            "webhook_events_ignored": 0,
+            "served": 0,
+            "stale": 0,
+        }
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, timeout=10, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def sync(self, full: bool = False) -> bool:
+        """Fetch the tickets updated since the last sync.
+
+        Args:
+            full: Fetch all tickets and drop those no longer in Jira;
+                  also done when the last full sync is too old. Tickets
+                  updated by a webhook event while the snapshot was
+                  fetched are kept.
+
+        Returns:
+            True if the mirror was updated, False if the fetch failed
+        """
+        with self._sync_lock:
+            started = time.time()
+            last_sync = self._state("last_sync")
+            last_full_sync = self._state("last_full_sync")
+            full = (
+                full
+                or last_sync is None
+                or last_full_sync is None
+                or started - last_full_sync >= self._full_sync_seconds
+            )
+            since = None if full else last_sync - self._overlap_seconds
+            try:
+                tickets = [ticket_from_issue(i) for i in self._fetch(since)]
+            except Exception as e:
+                with self._lock:
+                    self._stats["sync_failures"] += 1
+                logger.warning(f"Ticket mirror sync failed: {e}")
+                return False
+
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._upsert(tickets)
+                    if full:
+                        self._drop_missing(
+                            tickets, started - self._overlap_seconds
+                        )
+                    self._set_state("last_sync", started)
+                    if full:
+                        self._set_state("last_full_sync", started)
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+                self._stats["syncs"] += 1
+                self._stats["full_syncs"] += int(full)
+        logger.debug(
+            f"Ticket mirror synced {len(tickets)} tickets "
+            f"({'full' if full else 'incremental'})"
+        )
+        return True
+
+    def apply_event(self, event: Dict[str, Any]) -> bool:
+        """Apply a Jira webhook event.
+
+        Args:
+            event: Webhook payload with "webhookEvent" and "issue"
+
+        Returns:
+            True if the event changed a ticket; events older than the
+            mirrored ticket are ignored
+        """
+        issue = event.get("issue")
+        if not isinstance(issue, dict) or not issue.get("key"):
+            return False
+        with self._lock:
+            self._stats["webhook_events"] += 1
+            if event.get("webhookEvent") == "jira:issue_deleted":
+                changed = self._db.execute(
+                    "DELETE FROM tickets WHERE key = ?",
+                    (str(issue["key"]).upper(),),
+                ).rowcount
+            else:
+                changed = self._upsert([ticket_from_issue(issue)])
+            if not changed:
+                self._stats["webhook_events_ignored"] += 1
+        return bool(changed)
+
+    def is_fresh(self) -> bool:
+        """Whether the last successful sync is within the staleness bound."""
+        last_sync = self._state("last_sync")
+        return (
+            last_sync is not None
+            and time.time() - last_sync <= self._max_staleness
+        )
+
+    def user_tickets(self, user_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a user's tickets, or None if the mirror is stale."""
+        if not self._serving():
+            return None
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, summary FROM tickets WHERE user_id = ?"
+                " ORDER BY updated_at DESC",
+                (user_id,),
+            ).fetchall()
+        return [{"ticket_id": key, "summary": summary} for key, summary in rows]
+
+    def ticket(self, user_id: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return a user's ticket, or None if stale or not mirrored yet."""
+        if not self._serving():
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, summary, description, issue_type, status,"
+                " resolution FROM tickets WHERE key = ? AND user_id = ?",
+                (key.strip().upper(), user_id),
+            ).fetchone()
+        if row is None:
+            return None
+        names = (
+            "ticket_id",
+            "summary",
+            "description",
+            "issue_type",
+            "status",
+            "resolution",
+        )
+        return dict(zip(names, row, strict=True))
+
+    def request_sync(self) -> None:
+        """Ask the background thread to sync now, e.g. after a change."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the background sync, if not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ticket-mirror", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background sync."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return sync and lookup counters, ticket count and sync age."""
+        last_sync = self._state("last_sync")
+        with self._lock:
+            (tickets,) = self._db.execute(
+                "SELECT COUNT(*) FROM tickets"
+            ).fetchone()
+            return {
+                **self._stats,
+                "tickets": tickets,
+                "sync_age_seconds": (
+                    round(time.time() - last_sync, 1)
+                    if last_sync is not None
+                    else None
+                ),
+            }
+
+    def _run(self) -> None:
+        """Sync periodically until stopped."""
+        requested = True
+        while not self._stop.is_set():
+            # Workers sharing the file skip a poll another one just made
+            last_sync = self._state("last_sync")
+            if (
+                requested
+                or last_sync is None
+                or time.time() - last_sync >= self._poll_seconds / 2
+            ):
+                try:
+                    self.sync()
+                except Exception:
+                    logger.exception("Ticket mirror sync failed")
+            requested = self._wake.wait(self._poll_seconds)
+            self._wake.clear()
+
+    def _serving(self) -> bool:
+        """Count a lookup as served or stale."""
+        fresh = self.is_fresh()
+        with self._lock:
+            self._stats["served" if fresh else "stale"] += 1
+        return fresh
+
+    def _upsert(self, tickets: List[Dict[str, Any]]) -> int:
+        """Insert or update tickets, unless the mirrored one is newer.
+
+        The caller holds the lock.
+
+        Returns:
+            Number of tickets written
+        """
+        return self._db.executemany(
+            "INSERT INTO tickets (key, user_id, summary, description,"
+            " issue_type, status, resolution, updated_at)"
+            " VALUES (:key, :user_id, :summary, :description, :issue_type,"
+            " :status, :resolution, :updated_at)"
+            " ON CONFLICT (key) DO UPDATE SET user_id = excluded.user_id,"
+            " summary = excluded.summary,"
+            " description = excluded.description,"
+            " issue_type = excluded.issue_type, status = excluded.status,"
+            " resolution = excluded.resolution,"
+            " updated_at = excluded.updated_at"
+            " WHERE tickets.updated_at IS NULL"
+            " OR excluded.updated_at >= tickets.updated_at",
+            tickets,
+        ).rowcount
+
+    def _drop_missing(
+        self, tickets: List[Dict[str, Any]], before: float
+    ) -> int:
+        """Delete tickets missing from a full snapshot of Jira.
+
+        Only tickets last updated before `before` are deleted, so one
+        created or updated by a webhook event during the fetch is kept.
+        The caller holds the lock, within a transaction.
+
+        Returns:
+            Number of tickets deleted
+        """
+        self._db.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS snapshot_keys"
+            " (key TEXT PRIMARY KEY)"
+        )
+        self._db.execute("DELETE FROM snapshot_keys")
+        self._db.executemany(
+            "INSERT OR IGNORE INTO snapshot_keys (key) VALUES (?)",
+            [(t["key"],) for t in tickets],
+        )
+        return self._db.execute(
+            "DELETE FROM tickets WHERE key NOT IN"
+            " (SELECT key FROM snapshot_keys)"
+            " AND (updated_at IS NULL OR updated_at < ?)",
+            (before,),
+        ).rowcount
+
+    def _state(self, name: str) -> Optional[float]:
+        """Read a sync timestamp."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM sync_state WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value: float) -> None:
+        """Write a sync timestamp; the caller holds the lock."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)",
+            (name, value),
+        )
+
+
+class _WebhookServer(ThreadingHTTPServer):
+    """HTTP server whose port the worker processes of an instance share.
+
+    With SO_REUSEPORT, each worker binds the same port and the kernel
+    spreads connections between them; all apply events to the same file.
+    """
+
+    def server_bind(self) -> None:
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def serve_webhook(
+    mirror: TicketMirror,
+    port: int,
+    secret: str,
+    host: str = "0.0.0.0",
+) -> ThreadingHTTPServer:
+    """Receive Jira issue webhooks on `POST /jira/webhook`.
+
+    Args:
+        mirror: Mirror the events are applied to
+        port: Port to listen on; 0 picks a free port
+        secret: Webhook secret; requests must carry a matching
+                `X-Hub-Signature: sha256=<hmac>` header
+        host: Interface to bind
+
+    Returns:
+        The running server
+
+    Raises:
+        ValueError: If the secret is empty
+    """
+    if not secret:
+        raise ValueError("A Jira webhook secret is required")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path.split("?")[0] != "/jira/webhook":
+                self.send_error(404)
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                self.send_error(400)
+                return
+            if length < 0 or length > MAX_WEBHOOK_BYTES:
+                self.send_error(413)
+                return
+            body = self.rfile.read(length)
+            expected = "sha256=" + hmac.new(
+                secret.encode(), body, hashlib.sha256
+            ).hexdigest()
+            signature = self.headers.get("X-Hub-Signature", "")
+            if not hmac.compare_digest(signature, expected):
+                self.send_error(401)
+                return
+            try:
+                event = json.loads(body)
+            except ValueError:
+                self.send_error(400)
+                return
+            mirror.apply_event(event if isinstance(event, dict) else {})
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+    server = _WebhookServer((host, port), Handler)
+    threading.Thread(
+        target=server.serve_forever, name="jira-webhook", daemon=True
+    ).start()
+    logger.info(
+        f"Receiving Jira webhooks on http://{host}:{server.server_port}"
+        "/jira/webhook"
+    )
+    return server
@@ -0,0 +1,332 @@
+"""Durable outbox for complaints waiting to be filed in Jira.
+
+A complaint is committed to a local SQLite database (WAL mode) and the
+customer gets a local reference at once; a background thread files it in
+Jira, retrying with backoff while Jira is unavailable, and records the
+Jira key against the reference. Worker processes of an instance may share
+the database: each entry is leased by one sender at a time.
+
+Retries are idempotent: the ticket is filed with its reference attached
+(as a Jira label), and before filing again after an attempt whose outcome
+is unknown, e.g. a timeout, Jira is searched for that reference.
+"""
+
+import logging
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LOCAL_REFERENCE_PREFIX = "REF"
+_LOCAL_REFERENCE_PATTERN = re.compile(r"^REF-[0-9A-F]{6}$", re.IGNORECASE)
+
+# Status codes worth retrying; other errors will not succeed on retry
+RETRYABLE_STATUS_CODES = {401, 403, 408, 429, 500, 502, 503, 504}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    reference TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    description TEXT NOT NULL,
+    issue_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    jira_key TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_user ON outbox (user_id);
+"""
+
+
+def is_local_reference(ticket_id: str) -> bool:
+    """Whether a ticket ID is an outbox reference rather than a Jira key."""
+    return bool(_LOCAL_REFERENCE_PATTERN.match(ticket_id.strip()))
+
+
+class TicketOutbox:
+    """SQLite-backed queue of complaints and their Jira keys.
+
+    Entries move from "pending" to "submitted" (with a Jira key) or, when
+    Jira rejects them for good, to "failed". `submit` is called with the
+    entry's reference, user_id, summary, description and issue_type and
+    returns the ticket tool's result dictionary. `find` returns the key
+    of the Jira ticket filed with a reference, or None, and raises if
+    Jira could not be searched.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        submit: Callable[..., Dict[str, Any]],
+        find: Callable[[str], Optional[str]],
+        poll_seconds: float = 1.0,
+        base_backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 300.0,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        """Open (or create) the outbox database.
+
+        Args:
+            path: SQLite file, shared by the workers of an instance
+            submit: Files one complaint in Jira
+            find: Looks up the ticket filed with a reference
+            poll_seconds: Sender's wait between checks for due entries
+            base_backoff_seconds: Delay before the first retry; doubled
+                                  on each further failure. It leaves time
+                                  for Jira's search to show a ticket
+                                  filed by an attempt that timed out
+            max_backoff_seconds: Maximum delay between retries
+            lease_seconds: Time an entry is reserved for one sender
+        """
+        self._submit = submit
+        self._find = find
+        self._poll_seconds = poll_seconds
+        self._base_backoff = base_backoff_seconds
+        self._max_backoff = max_backoff_seconds
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, timeout=10, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL still survives a process crash; only a power
+        # loss can lose the last commits
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def enqueue(
+        self, user_id: str, summary: str, description: str, issue_type: str
+    ) -> str:
+        """Store a complaint and return its local reference.
+
+        Args:
+            user_id: Customer filing the complaint
+            summary: Ticket summary
+            description: Ticket description
+            issue_type: Jira issue type
+
+        Returns:
+            Reference such as "REF-4F9A2C", valid until and after the
+            ticket is filed
+        """
+        now = time.time()
+        with self._lock:
+            while True:
+                reference = (
+                    f"{LOCAL_REFERENCE_PREFIX}-{secrets.token_hex(3).upper()}"
+                )
+                try:
+                    self._db.execute(
+                        "INSERT INTO outbox (reference, user_id, summary,"
+                        " description, issue_type, created_at,"
+                        " next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            reference,
+                            user_id,
+                            summary,
+                            description,
+                            issue_type,
+                            now,
+                            now,
+                        ),
+                    )
+                    break
+                except sqlite3.IntegrityError:
+                    continue
+        self._wake.set()
+        logger.info(f"Queued complaint {reference} for {user_id}")
+        return reference
+
+    def resolve(self, reference: str) -> Optional[Dict[str, Any]]:
+        """Return the outbox entry of a local reference, if any."""
+        return self._fetch_one(
+            "SELECT * FROM outbox WHERE reference = ?",
+            (reference.strip().upper(),),
+        )
+
+    def pending_for_user(self, user_id: str) -> List[Dict[str, Any]]:
+        """Return the user's entries that have no Jira key yet."""
+        return self._fetch_all(
+            "SELECT * FROM outbox WHERE user_id = ? AND jira_key IS NULL"
+            " ORDER BY created_at",
+            (user_id,),
+        )
+
+    def send_due(self) -> int:
+        """File every entry that is due, returning how many were filed."""
+        # Entries failing in this pass are due again only in the next one
+        due_by = time.time()
+        filed = 0
+        while True:
+            entry = self._lease_next(due_by)
+            if entry is None:
+                return filed
+            filed += self._send(entry)
+
+    def start(self) -> None:
+        """Start the background sender, if not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ticket-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background sender; unsent entries stay queued."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of entries in each state and retries made."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT state, COUNT(*), COALESCE(SUM(MAX(attempts - 1, 0)), 0)"
+                " FROM outbox GROUP BY state"
+            ).fetchall()
+        stats = {"pending": 0, "submitted": 0, "failed": 0, "retries": 0}
+        for state, count, retries in rows:
+            stats[state] = count
+            stats["retries"] += retries
+        return stats
+
+    def _run(self) -> None:
+        """Send due entries until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.send_due()
+            except Exception:
+                logger.exception("Ticket outbox sender failed")
+            self._wake.wait(self._poll_seconds)
+            self._wake.clear()
+
+    def _lease_next(self, due_by: float) -> Optional[Dict[str, Any]]:
+        """Reserve the oldest entry due by `due_by` for this sender.
+
+        The attempt is counted before it is made, so that an attempt cut
+        short by a crash is known to have possibly reached Jira.
+        """
+        now = time.time()
+        entry: Optional[Dict[str, Any]] = None
+        with self._lock:
+            # The write lock is taken before the read, so the workers of
+            # an instance never lease the same entry. A SELECT and UPDATE
+            # rather than UPDATE ... RETURNING, which needs SQLite 3.35
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._db.execute(
+                    "SELECT reference, user_id, summary, description,"
+                    " issue_type, attempts FROM outbox"
+                    " WHERE state = 'pending' AND next_attempt_at <= ?"
+                    " ORDER BY next_attempt_at LIMIT 1",
+                    (due_by,),
+                )
+                row = cursor.fetchone()
+                if row is not None:
+                    names = [column[0] for column in cursor.description]
+                    entry = dict(zip(names, row, strict=True))
+                    entry["attempts"] += 1
+                    self._db.execute(
+                        "UPDATE outbox SET next_attempt_at = ?, attempts = ?"
+                        " WHERE reference = ?",
+                        (
+                            now + self._lease_seconds,
+                            entry["attempts"],
+                            entry["reference"],
+                        ),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return entry
+
+    def _send(self, entry: Dict[str, Any]) -> int:
+        """File one leased entry and record the outcome."""
+        reference = entry["reference"]
+        attempts = entry["attempts"]
+        try:
+            # An earlier attempt may have filed the ticket and lost the
+            # answer; file it again only if Jira does not have it
+            key = self._find(reference) if attempts > 1 else None
+            if key is not None:
+                result: Dict[str, Any] = {"key": key}
+            else:
+                result = self._submit(
+                    reference=reference,
+                    user_id=entry["user_id"],
+                    summary=entry["summary"],
+                    description=entry["description"],
+                    issue_type=entry["issue_type"],
+                )
+        except Exception as e:
+            result = {"error": str(e), "status_code": 500}
+
+        if result.get("key"):
+            self._update(
+                "UPDATE outbox SET state = 'submitted', jira_key = ?,"
+                " last_error = NULL WHERE reference = ?",
+                (result["key"], reference),
+            )
+            logger.info(f"Filed complaint {reference} as {result['key']}")
+            return 1
+
+        status_code = result.get("status_code")
+        error = f"{status_code}: {result.get('error')}"
+        if status_code not in RETRYABLE_STATUS_CODES:
+            self._update(
+                "UPDATE outbox SET state = 'failed', last_error = ?"
+                " WHERE reference = ?",
+                (error, reference),
+            )
+            logger.error(f"Jira rejected complaint {reference}: {error}")
+            return 0
+
+        delay = min(
+            self._max_backoff, self._base_backoff * 2 ** (attempts - 1)
+        )
+        self._update(
+            "UPDATE outbox SET last_error = ?, next_attempt_at = ?"
+            " WHERE reference = ?",
+            (error, time.time() + delay, reference),
+        )
+        logger.warning(
+            f"Filing complaint {reference} failed ({error}); "
+            f"retrying in {delay:.0f}s"
+        )
+        return 0
+
+    def _update(self, sql: str, params: tuple) -> None:
+        """Run a write statement."""
+        with self._lock:
+            self._db.execute(sql, params)
+
+    def _fetch_one(self, sql: str, params: tuple) -> Optional[Dict[str, Any]]:
+        """Run a query returning at most one entry as a dictionary."""
+        rows = self._fetch_all(sql, params)
+        return rows[0] if rows else None
+
+    def _fetch_all(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        """Run a query returning entries as dictionaries."""
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            names = [column[0] for column in cursor.description]
+            return [
+                dict(zip(names, row, strict=True))
+                for row in cursor.fetchall()
+            ]
@@ -0,0 +1,228 @@
+"""Byte-bounded span export queue with error priority."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from .sampling import is_error_span
+from .tracing import estimate_span_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE_BYTES = 64 * 1024 * 1024
+
+
+class QueueingSpanExporter(SpanExporter):
+    """Queue spans by size and export them from a background thread.
+
+    `export` only enqueues, so a slow backend never blocks the caller for
+    more than `max_block_seconds`. The queue is bounded in bytes: when it
+    is full, ordinary spans wait up to `max_block_seconds` for room and
+    are then dropped, while error spans make room by evicting the oldest
+    ordinary spans and are exported first. Every lost span is counted by
+    reason in `stats()`. On shutdown, queued spans are flushed until
+    `shutdown_timeout_seconds` and the rest are counted as dropped.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_bytes: int = DEFAULT_MAX_QUEUE_BYTES,
+        max_export_batch_size: int = 512,
+        schedule_delay_seconds: float = 1.0,
+        max_block_seconds: float = 0.0,
+        shutdown_timeout_seconds: float = 10.0,
+    ) -> None:
+        """Initialize the exporter and start the export thread.
+
+        Args:
+            exporter: Exporter the queued spans are written with
+            max_queue_bytes: Maximum approximate size of queued spans
+            max_export_batch_size: Maximum spans per call to `exporter`
+            schedule_delay_seconds: Maximum time a span waits for a batch
+            max_block_seconds: Time `export` waits for room before dropping
+                               ordinary spans
+            shutdown_timeout_seconds: Time allowed to flush on shutdown
+        """
+        self._exporter = exporter
+        self._max_queue_bytes = max_queue_bytes
+        self._max_export_batch_size = max_export_batch_size
+        self._schedule_delay_seconds = schedule_delay_seconds
+        self._max_block_seconds = max_block_seconds
+        self._shutdown_timeout_seconds = shutdown_timeout_seconds
+
+        self._errors: deque[tuple[ReadableSpan, int]] = deque()
+        self._spans: deque[tuple[ReadableSpan, int]] = deque()
+        self._queued_bytes = 0
+        self._exporting = 0
+        self._flush_requested = False
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._counters = {
+            "queued": 0,
+            "exported": 0,
+            "dropped_queue_full": 0,
+            "dropped_oversized": 0,
+            "dropped_evicted_for_error": 0,
+            "dropped_export_failed": 0,
+            "dropped_shutdown": 0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="span-export-queue", daemon=True
+        )
+        self._thread.start()
+
+    def stats(self) -> dict[str, int]:
+        """Return queue counters, drops by reason and the queue size."""
+        with self._condition:
+            return self._counters | {
+                "queued_spans": len(self._errors) + len(self._spans),
+                "queued_bytes": self._queued_bytes,
+            }
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Queue spans for export.
+
+        Args:
+            spans: Sequence of spans to export
+
+        Returns:
+            FAILURE if any span was dropped, SUCCESS otherwise
+        """
+        result = SpanExportResult.SUCCESS
+        for span in spans:
+            if not self._enqueue(span):
+                result = SpanExportResult.FAILURE
+        return result
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Wait until the queue is empty and the last batch is written."""
+        deadline = time.monotonic() + timeout_millis / 1000
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._errors or self._spans or self._exporting:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        flushed = self._exporter.force_flush(
+            max(int((deadline - time.monotonic()) * 1000), 0)
+        )
+        # The base SpanExporter.force_flush returns None
+        return flushed is not False
+
+    def shutdown(self) -> None:
+        """Flush until the shutdown deadline, then stop the exporter."""
+        flushed = self.force_flush(int(self._shutdown_timeout_seconds * 1000))
+        with self._condition:
+            self._stopped = True
+            if not flushed:
+                lost = len(self._errors) + len(self._spans)
+                self._counters["dropped_shutdown"] += lost
+                logger.warning(
+                    f"Dropped {lost} spans not exported before shutdown"
+                )
+            self._errors.clear()
+            self._spans.clear()
+            self._queued_bytes = 0
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+        self._exporter.shutdown()
+
+    def _enqueue(self, span: ReadableSpan) -> bool:
+        """Add a span to the queue, making or waiting for room.
+
+        Returns:
+            True if the span was queued
+        """
+        size = estimate_span_bytes(span)
+        error = is_error_span(span)
+        with self._condition:
+            if self._stopped:
+                self._counters["dropped_shutdown"] += 1
+                return False
+            if size > self._max_queue_bytes:
+                self._counters["dropped_oversized"] += 1
+                return False
+
+            if error:
+                while (
+                    self._queued_bytes + size > self._max_queue_bytes
+                    and self._spans
+                ):
+                    _, evicted = self._spans.popleft()
+                    self._queued_bytes -= evicted
+                    self._counters["dropped_evicted_for_error"] += 1
+            elif self._queued_bytes + size > self._max_queue_bytes:
+                limit = self._max_queue_bytes - size
+                self._condition.wait_for(
+                    lambda: self._queued_bytes <= limit or self._stopped,
+                    timeout=self._max_block_seconds,
+                )
+
+            if self._queued_bytes + size > self._max_queue_bytes:
+                self._counters["dropped_queue_full"] += 1
+                return False
+
+            (self._errors if error else self._spans).append((span, size))
+            self._queued_bytes += size
+            self._counters["queued"] += 1
+            if (
+                len(self._errors) + len(self._spans)
+                >= self._max_export_batch_size
+            ):
+                self._condition.notify_all()
+        return True
+
+    def _run(self) -> None:
+        """Export batches until the exporter is shut down."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped
+                    or self._flush_requested
+                    or len(self._errors) + len(self._spans)
+                    >= self._max_export_batch_size,
+                    timeout=self._schedule_delay_seconds,
+                )
+                if self._stopped:
+                    return
+                batch = self._take_batch()
+                if not self._errors and not self._spans:
+                    self._flush_requested = False
+                # Wake producers waiting for room
+                self._condition.notify_all()
+                self._exporting = len(batch)
+            if batch:
+                self._export_batch(batch)
+            with self._condition:
+                self._exporting = 0
+                self._condition.notify_all()
+
+    def _take_batch(self) -> list[tuple[ReadableSpan, int]]:
+        """Remove the next batch from the queue, error spans first."""
+        batch = []
+        for queue in (self._errors, self._spans):
+            while queue and len(batch) < self._max_export_batch_size:
+                batch.append(queue.popleft())
+        self._queued_bytes -= sum(size for _, size in batch)
+        return batch
+
+    def _export_batch(self, batch: list[tuple[ReadableSpan, int]]) -> None:
+        """Write a batch with the wrapped exporter and count the outcome."""
+        try:
+            result = self._exporter.export([span for span, _ in batch])
+        except Exception as e:
+            logger.error(f"Error exporting {len(batch)} queued spans: {e}")
+            result = SpanExportResult.FAILURE
+        with self._condition:
+            if result == SpanExportResult.SUCCESS:
+                self._counters["exported"] += len(batch)
+            else:
+                self._counters["dropped_export_failed"] += len(batch)
@@ -0,0 +1,154 @@
+"""Buffered, batched feedback writes to Cloud Logging."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class FeedbackBuffer:
+    """Write feedback entries to Cloud Logging from a background thread.
+
+    `submit` only enqueues, so the request path never waits on Cloud
+    Logging. The worker writes a batch (one API request) once
+    `max_batch_size` entries are queued or the oldest queued entry is
+    `flush_interval_seconds` old. The queue holds at most
+    `max_queue_size` entries; beyond that, new feedback is dropped and
+    counted.
+    """
+
+    def __init__(
+        self,
+        cloud_logger: Any,
+        max_batch_size: int = 100,
+        flush_interval_seconds: float = 2.0,
+        max_queue_size: int = 10000,
+    ) -> None:
+        """Initialize the buffer and start the writer thread.
+
+        Args:
+            cloud_logger: Cloud Logging logger (or a local stand-in) with
+                          a `batch()` method
+            max_batch_size: Entries written per API request
+            flush_interval_seconds: Maximum time an entry waits in the queue
+            max_queue_size: Maximum number of queued entries
+        """
+        self._logger = cloud_logger
+        self._max_batch_size = max_batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flush_now = threading.Event()
+        self._counters = {
+            "submitted": 0,
+            "written": 0,
+            "dropped_queue_full": 0,
+            "dropped_write_failed": 0,
+            "batches": 0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="feedback-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stats(self) -> dict[str, int]:
+        """Return feedback counters and the current queue length."""
+        with self._lock:
+            return self._counters | {"queued": self._queue.qsize()}
+
+    def submit(self, entry: dict[str, Any]) -> bool:
+        """Queue a validated feedback entry for writing.
+
+        Args:
+            entry: Structured log payload
+
+        Returns:
+            False if the queue is full and the entry was dropped
+        """
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self._counters["dropped_queue_full"] += 1
+            logger.warning("Feedback queue full, dropping feedback")
+            return False
+        with self._lock:
+            self._counters["submitted"] += 1
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued entry has been handled.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained in time
+        """
+        deadline = time.monotonic() + timeout
+        self._flush_now.set()
+        try:
+            while self._queue.unfinished_tasks:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.01)
+            return True
+        finally:
+            self._flush_now.clear()
+
+    def close(self, timeout: float = 10.0) -> bool:
+        """Write the queued entries and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+
+        Returns:
+            True if every queued entry was handled
+        """
+        drained = self.flush(timeout)
+        self._stopped.set()
+        self._thread.join(timeout=1.0)
+        return drained
+
+    def _run(self) -> None:
+        """Collect batches by size and age and write them."""
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval_seconds
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    # Poll so a flush request does not wait for the interval
+                    batch.append(self._queue.get(timeout=min(remaining, 0.05)))
+                except queue.Empty:
+                    if self._flush_now.is_set():
+                        break
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, entries: list[dict[str, Any]]) -> None:
+        """Write entries with a single API request."""
+        try:
+            batch = self._logger.batch()
+            for entry in entries:
+                batch.log_struct(entry, severity="INFO")
+            batch.commit()
+        except Exception as e:
+            logger.error(f"Error writing {len(entries)} feedback entries: {e}")
+            with self._lock:
+                self._counters["dropped_write_failed"] += len(entries)
+            return
+        with self._lock:
+            self._counters["written"] += len(entries)
+            self._counters["batches"] += 1
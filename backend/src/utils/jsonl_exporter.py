@@ -0,0 +1,249 @@
+"""Local JSONL span exporter for offline profiling."""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from .tracing import span_to_dict
+
+if TYPE_CHECKING:
+    from src.tools.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RotatingJsonlSpanExporter(SpanExporter):
+    """Write spans as compact JSON lines to rotating local files.
+
+    `export` only serializes the spans and queues the lines; a background
+    thread appends them to the current file every `flush_interval_seconds`.
+    Files are rotated once they reach `max_bytes` or `max_age_seconds`, and
+    rotated files are optionally gzipped. Spans use the same dict shape as
+    the Cloud Logging exporter, so the files can be analysed with the same
+    queries.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = "traces",
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age_seconds: float = 3600.0,
+        compress: bool = False,
+        flush_interval_seconds: float = 1.0,
+        max_queued_lines: int = 100_000,
+    ) -> None:
+        """Initialize the exporter and start the flush thread.
+
+        Args:
+            directory: Directory the JSONL files are written to
+            max_bytes: File size at which the file is rotated
+            max_age_seconds: File age at which the file is rotated
+            compress: Gzip files once they are rotated
+            flush_interval_seconds: Time between background flushes
+            max_queued_lines: Lines held before new spans are dropped
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.compress = compress
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queued_lines = max_queued_lines
+        self.dropped_spans = 0
+
+        self._lines: list[str] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._file: IO[str] | None = None
+        self._path: Path | None = None
+        self._opened_at = 0.0
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="jsonl-span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def current_path(self) -> Path | None:
+        """Path of the file currently written to."""
+        return self._path
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Serialize spans and queue them for the flush thread.
+
+        Args:
+            spans: Sequence of spans to export
+
+        Returns:
+            FAILURE after shutdown or when the queue is full
+        """
+        if self._stopped:
+            return SpanExportResult.FAILURE
+        lines = []
+        for span in spans:
+            span_dict = span_to_dict(span)[0]
+            lines.append(
+                json.dumps(
+                    span_dict,
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                    default=str,
+                )
+            )
+        with self._condition:
+            free = self.max_queued_lines - len(self._lines)
+            if free < len(lines):
+                self.dropped_spans += len(lines) - max(free, 0)
+                lines = lines[: max(free, 0)]
+            self._lines.extend(lines)
+            if len(lines) < len(spans):
+                return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Write all queued lines to disk."""
+        self._flush()
+        return True
+
+    def shutdown(self) -> None:
+        """Flush queued lines, stop the thread and close the file."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        self._flush()
+        with self._write_lock:
+            self._close()
+
+    def _run(self) -> None:
+        """Flush queued lines periodically until shutdown."""
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                self._condition.wait(self.flush_interval_seconds)
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Error writing spans to JSONL: {e}")
+
+    def _flush(self) -> None:
+        """Append the queued lines to the current file."""
+        with self._condition:
+            lines, self._lines = self._lines, []
+        with self._write_lock:
+            if self._file is not None and self._should_rotate():
+                self._close()
+            if not lines:
+                return
+            if self._file is None:
+                self._open()
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            if self._should_rotate():
+                self._close()
+
+    def _should_rotate(self) -> bool:
+        """Return whether the current file reached its size or age limit."""
+        return (
+            self._file.tell() >= self.max_bytes
+            or time.monotonic() - self._opened_at >= self.max_age_seconds
+        )
+
+    def _open(self) -> None:
+        """Open a new file named after the current time and process."""
+        stem = f"spans-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        path = self.directory / f"{stem}.jsonl"
+        suffix = 1
+        while path.exists() or Path(f"{path}.gz").exists():
+            path = self.directory / f"{stem}-{suffix}.jsonl"
+            suffix += 1
+        self._file = path.open("w", encoding="utf-8")
+        self._path = path
+        self._opened_at = time.monotonic()
+
+    def _close(self) -> None:
+        """Close the current file and compress it if enabled."""
+        if self._file is None:
+            return
+        self._file.close()
+        path, self._file, self._path = self._path, None, None
+        if self.compress:
+            with path.open("rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            path.unlink()
+
+
+def jsonl_exporter_from_config(
+    config: "AppConfig",
+) -> RotatingJsonlSpanExporter | None:
+    """Build a JSONL exporter when TRACE_EXPORTER is "jsonl".
+
+    Args:
+        config: Config with the TRACE_JSONL_DIR, TRACE_JSONL_MAX_MB,
+                TRACE_JSONL_ROTATE_SECONDS and TRACE_JSONL_GZIP settings
+
+    Returns:
+        The exporter, or None when another exporter is selected
+    """
+    if config.trace_exporter != "jsonl":
+        return None
+    exporter = RotatingJsonlSpanExporter(
+        directory=config.trace_jsonl_dir,
+        max_bytes=int(config.trace_jsonl_max_mb * 1024 * 1024),
+        max_age_seconds=config.trace_jsonl_rotate_seconds,
+        compress=config.trace_jsonl_gzip,
+    )
+    logger.info(f"Writing spans to {exporter.directory.resolve()}")
+    return exporter
+
+
+def add_jsonl_exporter(config: "AppConfig") -> bool:
+    """Add a JSONL exporter to an already configured tracer provider.
+
+    Used by local `adk api_server` / `adk web` runs, which install their
+    own SDK tracer provider before loading the agent. Does nothing when
+    TRACE_EXPORTER is not "jsonl" or no SDK provider is installed.
+
+    Args:
+        config: Config with the trace exporter settings
+
+    Returns:
+        True if the exporter was added
+    """
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        return False
+    exporter = jsonl_exporter_from_config(config)
+    if exporter is None:
+        return False
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return True
+
+
+def read_spans(path: str | Path) -> list[dict[str, Any]]:
+    """Read the spans of a JSONL file, gzipped or not.
+
+    Args:
+        path: Path of a .jsonl or .jsonl.gz file
+
+    Returns:
+        Span dictionaries in file order
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,259 @@
+"""Local stand-ins for the Cloud Logging, Cloud Storage and Jira clients.
+
+They implement the small subset of the client APIs used by the exporters,
+the feedback path and the ticket tools, keep everything in memory and can
+simulate API latency and failures. Used by tests, benchmarks and offline
+runs.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Optional
+
+import requests
+
+
+class LocalLoggingClient:
+    """In-memory replacement for `google.cloud.logging.Client`."""
+
+    def __init__(self, latency: float = 0.0, fail: bool = False) -> None:
+        """Initialize the client.
+
+        Args:
+            latency: Seconds each simulated API request takes.
+            fail: Make every API request raise.
+        """
+        self.latency = latency
+        self.fail = fail
+        self.entries: list[dict[str, Any]] = []
+        self.api_calls = 0
+        self._lock = threading.Lock()
+
+    def logger(self, name: str) -> "LocalLogger":
+        """Return a logger writing to this client."""
+        return LocalLogger(name, self)
+
+    def write_entries(self, entries: list[dict[str, Any]]) -> None:
+        """Simulate one `entries.write` API request."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.api_calls += 1
+            if self.fail:
+                raise ConnectionError("Simulated Cloud Logging failure")
+            self.entries.extend(entries)
+
+
+class LocalLogger:
+    """In-memory replacement for `google.cloud.logging.Logger`."""
+
+    def __init__(self, name: str, client: LocalLoggingClient) -> None:
+        """Initialize the logger."""
+        self.name = name
+        self.client = client
+
+    def log_struct(self, info: dict[str, Any], **kw: Any) -> None:
+        """Write a single struct entry with one API request."""
+        self.client.write_entries([{"jsonPayload": info, **kw}])
+
+    def batch(self) -> "LocalBatch":
+        """Return a batch that writes its entries with one API request."""
+        return LocalBatch(self)
+
+
+class LocalBatch:
+    """In-memory replacement for `google.cloud.logging.Batch`."""
+
+    def __init__(self, logger: LocalLogger) -> None:
+        """Initialize the batch."""
+        self.logger = logger
+        self.entries: list[dict[str, Any]] = []
+
+    def log_struct(self, info: dict[str, Any], **kw: Any) -> None:
+        """Add a struct entry to be written on commit."""
+        self.entries.append({"jsonPayload": info, **kw})
+
+    def commit(self) -> None:
+        """Write all collected entries with one API request."""
+        self.logger.client.write_entries(self.entries)
+        self.entries = []
+
+
+class LocalStorageClient:
+    """In-memory replacement for `google.cloud.storage.Client`."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bucket_exists: bool = True,
+        fail: bool = False,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            latency: Seconds each simulated API request takes.
+            bucket_exists: Whether buckets report that they exist.
+            fail: Make every upload raise.
+        """
+        self.latency = latency
+        self.bucket_exists = bucket_exists
+        self.fail = fail
+        self.blobs: dict[str, Any] = {}
+        self.api_calls = 0
+        self._lock = threading.Lock()
+
+    def bucket(self, name: str) -> "LocalBucket":
+        """Return a bucket handle (no API request)."""
+        return LocalBucket(name, self)
+
+    def request(self) -> None:
+        """Simulate one API request."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.api_calls += 1
+
+
+class LocalBucket:
+    """In-memory replacement for `google.cloud.storage.Bucket`."""
+
+    def __init__(self, name: str, client: LocalStorageClient) -> None:
+        """Initialize the bucket handle."""
+        self.name = name
+        self.client = client
+
+    def exists(self) -> bool:
+        """Check whether the bucket exists with one API request."""
+        self.client.request()
+        return self.client.bucket_exists
+
+    def blob(self, name: str) -> "LocalBlob":
+        """Return a blob handle (no API request)."""
+        return LocalBlob(f"{self.name}/{name}", self.client)
+
+
+class LocalBlob:
+    """In-memory replacement for `google.cloud.storage.Blob`."""
+
+    def __init__(self, path: str, client: LocalStorageClient) -> None:
+        """Initialize the blob handle."""
+        self.path = path
+        self.client = client
+        self.content_encoding: str | None = None
+
+    def upload_from_string(
+        self, data: str | bytes, content_type: str = "text/plain"
+    ) -> None:
+        """Upload the blob content with one API request."""
+        self.client.request()
+        if self.client.fail:
+            raise ConnectionError("Simulated Cloud Storage failure")
+        with self.client._lock:
+            self.client.blobs[self.path] = data
+
+
+class LocalResponse:
+    """In-memory replacement for `requests.Response`."""
+
+    def __init__(self, status_code: int, body: dict[str, Any]) -> None:
+        """Initialize the response."""
+        self.status_code = status_code
+        self._body = body
+        self.text = json.dumps(body)
+
+    def json(self) -> dict[str, Any]:
+        """Return the decoded body."""
+        return self._body
+
+
+class LocalJiraSession:
+    """In-memory replacement for the `requests.Session` used for Jira.
+
+    Created issues are kept in memory. Searches understand the JQL the
+    ticket tools send: by reporter (`customfield_10088`), key and label.
+    """
+
+    _USER_PATTERN = re.compile(r'"customfield_10088" ~ "([^"]*)"')
+    _KEY_PATTERN = re.compile(r"key = (\S+)")
+    _LABEL_PATTERN = re.compile(r'labels = "([^"]*)"')
+
+    def __init__(
+        self, latency: float = 0.0, fail: bool = False, project: str = "GEN"
+    ) -> None:
+        """Initialize the session.
+
+        Args:
+            latency: Seconds each simulated API request takes.
+            fail: Make every API request raise.
+            project: Project key of created issues.
+        """
+        self.latency = latency
+        self.fail = fail
+        self.project = project
+        self.issues: list[dict[str, Any]] = []
+        self.api_calls = 0
+        self._lock = threading.Lock()
+
+    def request(self) -> None:
+        """Simulate the latency and failure of one API request."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.api_calls += 1
+        if self.fail:
+            raise requests.exceptions.ConnectionError("Simulated Jira failure")
+
+    def post(self, url: str, data: str = "{}", **kw: Any) -> LocalResponse:
+        """Create an issue from a JSON payload."""
+        self.request()
+        fields = json.loads(data)["fields"]
+        with self._lock:
+            number = len(self.issues) + 1
+            issue = {
+                "id": str(10000 + number),
+                "key": f"{self.project}-{number}",
+                "fields": {
+                    "summary": fields.get("summary"),
+                    "description": fields.get("description"),
+                    "issuetype": fields.get("issuetype", {}),
+                    "status": {"name": "Open"},
+                    "resolution": None,
+                    "customfield_10088": fields.get("customfield_10088"),
+                    "labels": fields.get("labels", []),
+                },
+            }
+            self.issues.append(issue)
+        return LocalResponse(
+            201,
+            {
+                "id": issue["id"],
+                "key": issue["key"],
+                "self": f"{url}/{issue['id']}",
+            },
+        )
+
+    def get(
+        self, url: str, params: Optional[dict[str, Any]] = None, **kw: Any
+    ) -> LocalResponse:
+        """Search issues with the JQL in `params`, or ping the server."""
+        self.request()
+        jql = (params or {}).get("jql")
+        if jql is None:
+            return LocalResponse(200, {})
+        user = self._USER_PATTERN.search(jql)
+        key = self._KEY_PATTERN.search(jql)
+        label = self._LABEL_PATTERN.search(jql)
+        with self._lock:
+            issues = [
+                issue
+                for issue in self.issues
+                if (user is None
+                    or issue["fields"]["customfield_10088"] == user.group(1))
+                and (key is None or issue["key"] == key.group(1))
+                and (label is None
+                     or label.group(1) in issue["fields"]["labels"])
+            ]
+        max_results = int((params or {}).get("maxResults", 100))
+        return LocalResponse(200, {"issues": issues[:max_results]})
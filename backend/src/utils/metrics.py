@@ -0,0 +1,473 @@
+"""In-process latency histograms and counters in OpenMetrics format."""
+
+import abc
+import functools
+import inspect
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+
+# Seconds; covers fast-path answers up to slow RAG and Jira calls
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    """Format label pairs as an OpenMetrics label set."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Series:
+    """Base class of a labelled metric; one lock per series."""
+
+    def __init__(self, labels: tuple[tuple[str, str], ...]) -> None:
+        self.labels = labels
+        self._lock = threading.Lock()
+
+
+class _CounterSeries(_Series):
+    """A monotonically increasing value."""
+
+    def __init__(self, labels: tuple[tuple[str, str], ...]) -> None:
+        super().__init__(labels)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeSeries(_Series):
+    """A value that goes up and down."""
+
+    def __init__(self, labels: tuple[tuple[str, str], ...]) -> None:
+        super().__init__(labels)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramSeries(_Series):
+    """Observation counts in fixed buckets, plus sum and count."""
+
+    def __init__(
+        self, labels: tuple[tuple[str, str], ...], bounds: tuple[float, ...]
+    ) -> None:
+        super().__init__(labels)
+        self.bounds = bounds
+        # One slot per bound plus the +Inf bucket; not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        """Return the bucket counts and sum."""
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Metric(abc.ABC):
+    """A named metric family with labelled series."""
+
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        """Initialize the metric.
+
+        Args:
+            name: Metric name, without the `_total` suffix for counters
+            documentation: Help text
+            labelnames: Names of the labels of every series
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        """Return the series for a set of label values, creating it once."""
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.get(values)
+                if series is None:
+                    labels = tuple(
+                        zip(self.labelnames, map(str, values), strict=True)
+                    )
+                    series = self._series[values] = self._new_series(labels)
+        return series
+
+    @abc.abstractmethod
+    def _new_series(self, labels: tuple[tuple[str, str], ...]) -> Any:
+        """Create the series of a set of labels."""
+
+    def render(self) -> list[str]:
+        """Return the OpenMetrics lines of the family."""
+        lines = [
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {self.documentation}",
+        ]
+        for series in list(self._series.values()):
+            lines.extend(self._render_series(series))
+        return lines
+
+    @abc.abstractmethod
+    def _render_series(self, series: Any) -> list[str]:
+        """Return the OpenMetrics lines of one series."""
+
+
+class Counter(Metric):
+    """Counter family, exposed as `<name>_total`."""
+
+    kind = "counter"
+
+    def _new_series(self, labels: tuple[tuple[str, str], ...]) -> Any:
+        return _CounterSeries(labels)
+
+    def _render_series(self, series: _CounterSeries) -> list[str]:
+        return [
+            f"{self.name}_total{_format_labels(series.labels)} "
+            f"{_format_value(series.value)}"
+        ]
+
+
+class Gauge(Metric):
+    """Gauge family."""
+
+    kind = "gauge"
+
+    def _new_series(self, labels: tuple[tuple[str, str], ...]) -> Any:
+        return _GaugeSeries(labels)
+
+    def _render_series(self, series: _GaugeSeries) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(series.labels)} "
+            f"{_format_value(series.value)}"
+        ]
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram family."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels of every series
+            buckets: Upper bounds of the buckets, without +Inf
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self, labels: tuple[tuple[str, str], ...]) -> Any:
+        return _HistogramSeries(labels, self.buckets)
+
+    def _render_series(self, series: _HistogramSeries) -> list[str]:
+        counts, total = series.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            labels = _format_labels((*series.labels, ("le", le)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(series.labels)
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, returning the existing one of the same name."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Counter:
+        """Return the counter family of a name, creating it once."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        """Return the gauge family of a name, creating it once."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram family of a name, creating it once."""
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        """Return all metrics in the OpenMetrics text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_LATENCY = REGISTRY.histogram(
+    "agent_tool_latency_seconds", "Tool function latency.", ["tool"]
+)
+TOOL_CALLS = REGISTRY.counter("agent_tool_calls", "Tool calls.", ["tool"])
+TOOL_ERRORS = REGISTRY.counter(
+    "agent_tool_errors",
+    "Tool calls that raised or returned an error.",
+    ["tool"],
+)
+TOOL_IN_FLIGHT = REGISTRY.gauge(
+    "agent_tool_in_flight", "Tool calls in progress.", ["tool"]
+)
+AGENT_LATENCY = REGISTRY.histogram(
+    "agent_latency_seconds", "Sub-agent turn latency.", ["agent"]
+)
+AGENT_IN_FLIGHT = REGISTRY.gauge(
+    "agent_in_flight", "Sub-agent turns in progress.", ["agent"]
+)
+
+# Turns whose after-agent callback never ran (errors, early returns) are
+# evicted oldest first beyond this many
+MAX_TRACKED_AGENT_TURNS = 10000
+
+_agent_starts: dict[tuple[str, str], float] = {}
+_agent_starts_lock = threading.Lock()
+
+
+def is_error_result(result: Any) -> bool:
+    """Return whether a tool result reports an error.
+
+    Args:
+        result: Value returned by a tool
+
+    Returns:
+        True for Jira error dicts (`error` key) and RAG error dicts
+        (`status` of "error")
+    """
+    return isinstance(result, dict) and (
+        "error" in result or result.get("status") == "error"
+    )
+
+
+def timed_tool(func: F) -> F:
+    """Record latency, errors and in-flight calls of a tool function.
+
+    The wrapper keeps the function's name, docstring and signature, so
+    ADK builds the same tool declaration from it.
+
+    Args:
+        func: Sync or async tool function
+
+    Returns:
+        The wrapped function
+    """
+    name = func.__name__
+
+    def _finish(started: float, error: bool) -> None:
+        TOOL_IN_FLIGHT.labels(name).dec()
+        TOOL_LATENCY.labels(name).observe(time.perf_counter() - started)
+        TOOL_CALLS.labels(name).inc()
+        if error:
+            TOOL_ERRORS.labels(name).inc()
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            TOOL_IN_FLIGHT.labels(name).inc()
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                _finish(started, error=True)
+                raise
+            _finish(started, error=is_error_result(result))
+            return result
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        TOOL_IN_FLIGHT.labels(name).inc()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            _finish(started, error=True)
+            raise
+        _finish(started, error=is_error_result(result))
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def record_tool_result(tool_name: str, result: Any) -> None:
+    """Count a tool call, and its error, from an after-tool callback.
+
+    Args:
+        tool_name: Name of the tool
+        result: Value returned by the tool
+    """
+    TOOL_CALLS.labels(tool_name).inc()
+    if is_error_result(result):
+        TOOL_ERRORS.labels(tool_name).inc()
+
+
+def agent_started(callback_context: Any) -> None:
+    """Start timing a sub-agent turn from its before-agent callback."""
+    agent = callback_context.agent_name
+    evicted = []
+    with _agent_starts_lock:
+        _agent_starts[(callback_context.invocation_id, agent)] = (
+            time.perf_counter()
+        )
+        while len(_agent_starts) > MAX_TRACKED_AGENT_TURNS:
+            stale = next(iter(_agent_starts))
+            del _agent_starts[stale]
+            evicted.append(stale[1])
+    AGENT_IN_FLIGHT.labels(agent).inc()
+    for stale_agent in evicted:
+        AGENT_IN_FLIGHT.labels(stale_agent).dec()
+
+
+def agent_finished(callback_context: Any) -> None:
+    """Record a sub-agent turn from its after-agent callback."""
+    agent = callback_context.agent_name
+    with _agent_starts_lock:
+        started = _agent_starts.pop(
+            (callback_context.invocation_id, agent), None
+        )
+    if started is None:
+        return
+    AGENT_IN_FLIGHT.labels(agent).dec()
+    AGENT_LATENCY.labels(agent).observe(time.perf_counter() - started)
+
+
+def serve_metrics(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry = REGISTRY,
+) -> ThreadingHTTPServer:
+    """Serve `GET /metrics` on a background thread for a local scraper.
+
+    Args:
+        port: Port to listen on; 0 picks a free port
+        host: Interface to bind
+        registry: Registry to expose
+
+    Returns:
+        The running server
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_port}")
+    return server
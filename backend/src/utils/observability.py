@@ -0,0 +1,177 @@
+"""Lazy, idempotent observability setup (Langfuse, OpenTelemetry)."""
+
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from .metrics import serve_metrics
+
+if TYPE_CHECKING:
+    from src.tools.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_configured = False
+_auth_status = "not_started"
+
+
+def langfuse_auth_status() -> str:
+    """Return the result of the background Langfuse auth check.
+
+    Returns:
+        One of "not_started", "skipped", "pending", "ok", "failed" or
+        "timeout"
+    """
+    return _auth_status
+
+
+def setup_observability(
+    config: "AppConfig",
+    auth_check_timeout: Optional[float] = None,
+    local_exporters: bool = True,
+) -> bool:
+    """Set up tracing and metrics once per process.
+
+    Instruments ADK with OpenInference, adds the local JSONL exporter and
+    metrics server when configured, and starts the Langfuse auth check on
+    a background thread so a slow or unreachable Langfuse never blocks.
+    Safe to call from every request; only the first call does any work.
+
+    OBSERVABILITY_ENABLED=false skips it, e.g. for tests and benchmarks.
+
+    Args:
+        config: Config with the observability and trace exporter settings
+        auth_check_timeout: Seconds before a pending auth check is reported
+                            as timed out; defaults to
+                            LANGFUSE_AUTH_CHECK_TIMEOUT
+        local_exporters: Add the JSONL exporter and metrics server;
+                         disabled by apps that install their own
+
+    Returns:
+        True if this call performed the setup
+    """
+    global _configured
+    if _configured:
+        return False
+    with _lock:
+        if _configured:
+            return False
+        _configured = True
+        if not config.observability_enabled:
+            logger.info("Observability setup disabled by config.")
+            return False
+
+        if auth_check_timeout is None:
+            auth_check_timeout = config.langfuse_auth_check_timeout
+        _start_langfuse(auth_check_timeout, config.langfuse_auth_check)
+
+        from openinference.instrumentation.google_adk import (
+            GoogleADKInstrumentor,
+        )
+
+        GoogleADKInstrumentor().instrument()
+        logger.info("OpenTelemetry instrumentation setup complete.")
+
+        if local_exporters:
+            # Imported here: the exporter pulls in the Cloud Logging and
+            # Storage clients, which only pay off once tracing is set up
+            from .jsonl_exporter import add_jsonl_exporter
+
+            # TRACE_EXPORTER=jsonl writes spans locally for offline profiling
+            add_jsonl_exporter(config)
+
+            # Expose latency histograms to a local scraper
+            if config.metrics_port is not None:
+                serve_metrics(config.metrics_port)
+        return True
+
+
+def _start_langfuse(timeout: float, auth_check: bool) -> None:
+    """Create the Langfuse client and check its credentials in background.
+
+    Args:
+        timeout: Seconds before the check is reported as timed out
+        auth_check: Whether to check the credentials at all
+    """
+    global _auth_status
+    if not os.environ.get("LANGFUSE_PUBLIC_KEY"):
+        _auth_status = "skipped"
+        return
+
+    from langfuse import get_client
+
+    langfuse = get_client()
+    if not auth_check:
+        _auth_status = "skipped"
+        return
+
+    _auth_status = "pending"
+    done = threading.Event()
+
+    def check() -> None:
+        global _auth_status
+        try:
+            authenticated = langfuse.auth_check()
+        except Exception as e:
+            logger.warning(f"Langfuse auth check failed: {e}")
+            authenticated = False
+        if _auth_status == "pending":
+            _auth_status = "ok" if authenticated else "failed"
+        done.set()
+        if authenticated:
+            logger.info("Langfuse client is authenticated and ready!")
+        else:
+            logger.warning(
+                "Langfuse authentication failed. "
+                "Please check your credentials and host."
+            )
+
+    def watch() -> None:
+        global _auth_status
+        if not done.wait(timeout) and _auth_status == "pending":
+            _auth_status = "timeout"
+            logger.warning(
+                f"Langfuse auth check did not finish in {timeout:.0f}s; "
+                "traces may not be delivered."
+            )
+
+    threading.Thread(
+        target=check, name="langfuse-auth-check", daemon=True
+    ).start()
+    threading.Thread(
+        target=watch, name="langfuse-auth-watch", daemon=True
+    ).start()
+
+
+class ObservabilityPlugin(BasePlugin):
+    """Run `setup_observability` on the first invocation.
+
+    Keeps importing the agent package free of network calls; deployed
+    apps also call `setup_observability` from `set_up` so it is done before
+    the first request.
+    """
+
+    def __init__(
+        self, config: "AppConfig", name: str = "observability_plugin"
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            config: Config passed to `setup_observability`
+            name: Plugin name
+        """
+        super().__init__(name)
+        self.config = config
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> Optional[types.Content]:
+        """Set up observability if it has not been done yet."""
+        setup_observability(self.config)
+        return None
@@ -0,0 +1,203 @@
+"""Tail-based sampling of agent traces."""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+from .tracing import estimate_span_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_BYTES = 32 * 1024 * 1024
+
+# Tool responses of failed Jira calls (5xx) and knowledge-base errors
+# such as DeadlineExceeded, as serialized on ADK tool spans.
+_TOOL_ERROR = re.compile(r'"status_code":\s*5\d\d|"status":\s*"error"')
+_TOOL_RESPONSE = "gcp.vertex.agent.tool_response"
+
+
+def is_error_span(span: ReadableSpan) -> bool:
+    """Return whether a span records a failure.
+
+    Args:
+        span: Finished span
+
+    Returns:
+        True for spans with an error status, a recorded exception or an
+        error tool response
+    """
+    if span.status.status_code == StatusCode.ERROR:
+        return True
+    if any(event.name == "exception" for event in span.events):
+        return True
+    response = (span.attributes or {}).get(_TOOL_RESPONSE)
+    return isinstance(response, str) and bool(_TOOL_ERROR.search(response))
+
+
+@dataclass
+class _TraceBuffer:
+    """Finished spans of a trace whose root has not ended yet."""
+
+    started: float = field(default_factory=time.monotonic)
+    spans: list[ReadableSpan] = field(default_factory=list)
+    size: int = 0
+    error: bool = False
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Decide whether to export a trace once its root span has ended.
+
+    Spans are buffered per trace. When the local root span ends, the trace
+    is passed to the wrapped processor if any span failed, if the root took
+    at least `slow_threshold_seconds`, or otherwise with probability
+    `sample_rate`. Buffered spans are bounded by their approximate
+    serialized size, as in `QueueingSpanExporter`, since prompts make a
+    few spans far larger than the rest. Beyond `max_buffered_bytes`, and
+    for traces older than `max_trace_age_seconds`, the oldest traces are
+    flushed early: kept if they already contain an error, dropped
+    otherwise.
+    """
+
+    def __init__(
+        self,
+        processor: SpanProcessor,
+        sample_rate: float = 0.1,
+        slow_threshold_seconds: float = 10.0,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+        max_trace_age_seconds: float = 300.0,
+        random_fn: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the processor.
+
+        Args:
+            processor: Processor receiving the spans of kept traces
+            sample_rate: Fraction of fast, successful traces to keep
+            slow_threshold_seconds: Root duration from which traces are kept
+            max_buffered_bytes: Maximum approximate size of held spans
+            max_trace_age_seconds: Maximum time a trace is buffered
+            random_fn: Source of uniform random numbers in [0, 1)
+        """
+        self._processor = processor
+        self._sample_rate = sample_rate
+        self._slow_threshold_ns = int(slow_threshold_seconds * 1e9)
+        self._max_buffered_bytes = max_buffered_bytes
+        self._max_trace_age_seconds = max_trace_age_seconds
+        self._random = random_fn
+        self._lock = threading.Lock()
+        self._traces: OrderedDict[int, _TraceBuffer] = OrderedDict()
+        self._buffered_spans = 0
+        self._buffered_bytes = 0
+        self._counters = {
+            "kept_error": 0,
+            "kept_slow": 0,
+            "kept_sampled": 0,
+            "dropped": 0,
+            "evicted_kept": 0,
+            "evicted_dropped": 0,
+        }
+
+    def stats(self) -> dict[str, int]:
+        """Return trace counters and the current buffer size."""
+        with self._lock:
+            return self._counters | {
+                "buffered_traces": len(self._traces),
+                "buffered_spans": self._buffered_spans,
+                "buffered_bytes": self._buffered_bytes,
+            }
+
+    def on_start(
+        self, span: Span, parent_context: Optional[Context] = None
+    ) -> None:
+        """Forward span start to the wrapped processor."""
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Buffer a finished span and decide on its trace at the root."""
+        if span.context is None:
+            return
+        trace_id = span.context.trace_id
+        is_root = span.parent is None or span.parent.is_remote
+        to_export: list[ReadableSpan] = []
+        size = estimate_span_bytes(span)
+
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                trace = self._traces[trace_id] = _TraceBuffer()
+            trace.spans.append(span)
+            trace.size += size
+            trace.error = trace.error or is_error_span(span)
+            self._buffered_spans += 1
+            self._buffered_bytes += size
+
+            if is_root:
+                del self._traces[trace_id]
+                self._buffered_spans -= len(trace.spans)
+                self._buffered_bytes -= trace.size
+                if self._keep(trace, span):
+                    to_export.extend(trace.spans)
+            to_export.extend(self._evict())
+
+        for finished in to_export:
+            self._processor.on_end(finished)
+
+    def shutdown(self) -> None:
+        """Shut down the wrapped processor; buffered traces are dropped."""
+        with self._lock:
+            self._counters["dropped"] += len(self._traces)
+            self._traces.clear()
+            self._buffered_spans = 0
+            self._buffered_bytes = 0
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Flush the wrapped processor; incomplete traces stay buffered."""
+        return self._processor.force_flush(timeout_millis)
+
+    def _keep(self, trace: _TraceBuffer, root: ReadableSpan) -> bool:
+        """Decide whether a completed trace is exported and count it."""
+        duration = (root.end_time or 0) - (root.start_time or 0)
+        if trace.error:
+            reason = "kept_error"
+        elif duration >= self._slow_threshold_ns:
+            reason = "kept_slow"
+        elif self._random() < self._sample_rate:
+            reason = "kept_sampled"
+        else:
+            reason = "dropped"
+        self._counters[reason] += 1
+        return reason != "dropped"
+
+    def _evict(self) -> list[ReadableSpan]:
+        """Flush the oldest traces while over the size or age limit.
+
+        Returns:
+            Spans of evicted traces that contain an error
+        """
+        kept: list[ReadableSpan] = []
+        now = time.monotonic()
+        while self._traces:
+            trace = next(iter(self._traces.values()))
+            if (
+                self._buffered_bytes <= self._max_buffered_bytes
+                and now - trace.started < self._max_trace_age_seconds
+            ):
+                break
+            self._traces.popitem(last=False)
+            self._buffered_spans -= len(trace.spans)
+            self._buffered_bytes -= trace.size
+            if trace.error:
+                self._counters["evicted_kept"] += 1
+                kept.extend(trace.spans)
+            else:
+                self._counters["evicted_dropped"] += 1
+        return kept
@@ -0,0 +1,413 @@
+"""In-process session service with bounded memory."""
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+if TYPE_CHECKING:
+    from src.tools.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[str, str, str]
+
+# String state values up to this length are interned: language names and
+# user IDs repeat across the sessions of a worker
+_INTERN_MAX_CHARS = 64
+
+
+def _compact_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Return the state with its keys and short string values interned."""
+    return {
+        sys.intern(key): sys.intern(value)
+        if isinstance(value, str) and len(value) <= _INTERN_MAX_CHARS
+        else value
+        for key, value in state.items()
+    }
+
+
+def _state_bytes(session: Session) -> int:
+    """Estimate the memory held by a session's state and metadata."""
+    return 200 + sum(
+        len(key) + len(str(value)) for key, value in session.state.items()
+    )
+
+
+def _event_bytes(event: Event) -> int:
+    """Estimate the memory held by an event from its serialized size."""
+    return len(event.model_dump_json(exclude_none=True))
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory session service that keeps its memory bounded.
+
+    ADK's `InMemorySessionService` keeps every session and its full event
+    history for the life of the worker. This one:
+
+    - keeps at most `max_events_per_session` events per session, dropping
+      the oldest whole turns (a turn starts at a user message);
+    - evicts sessions idle for `idle_seconds`, and the least recently
+      used sessions while the estimated size exceeds `max_bytes`; a session
+      is not evicted for memory while a turn is in flight (from the
+      customer's message to the agent's final response), so a long turn is
+      never cut off, but a turn that never finished is evicted once idle;
+    - spills evicted sessions to a local SQLite file when `spill_path` is
+      set, and restores them on the next access; otherwise they are
+      dropped, as the n8n proxy's Redis TTL drops its own session keys;
+    - interns state keys and short values (`language`, `user_id`).
+
+    Sizes are estimated from the serialized events, so they track the
+    real footprint only approximately. Bookkeeping is guarded by a lock;
+    the storage itself is the base class's, as before.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_events_per_session: int = 200,
+        idle_seconds: float = 1800.0,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            max_bytes: Estimated memory above which idle sessions are
+                       evicted, least recently used first
+            max_events_per_session: Events kept per session
+            idle_seconds: Seconds without access before a session is
+                          evicted
+            spill_path: SQLite file evicted sessions are written to, or
+                        None to drop them
+        """
+        super().__init__()
+        self._max_bytes = max_bytes
+        self._max_events = max_events_per_session
+        self._idle_seconds = idle_seconds
+        self._lock = threading.RLock()
+        # Last access time per session, least recently used first
+        self._lru: OrderedDict[SessionKey, float] = OrderedDict()
+        self._state_bytes: dict[SessionKey, int] = {}
+        self._event_bytes: dict[SessionKey, list[int]] = {}
+        self._in_flight: set[SessionKey] = set()
+        self._total_bytes = 0
+        self._counters = {
+            "evicted_idle": 0,
+            "evicted_memory": 0,
+            "spilled": 0,
+            "restored": 0,
+            "trimmed_events": 0,
+        }
+        self._db: Optional[sqlite3.Connection] = None
+        if spill_path:
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " app_name TEXT, user_id TEXT, id TEXT,"
+                " state TEXT, session BLOB, last_update_time REAL,"
+                " PRIMARY KEY (app_name, user_id, id))"
+            )
+            self._db.commit()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        """Create a session, evicting others if over the limits."""
+        with self._lock:
+            if session_id:
+                self._restore((app_name, user_id, session_id))
+            session = await super().create_session(
+                app_name=app_name,
+                user_id=user_id,
+                state=state,
+                session_id=session_id,
+            )
+            key = (app_name, user_id, session.id)
+            stored = self._stored(key)
+            if stored is not None:
+                stored.state = _compact_state(stored.state)
+                self._event_bytes[key] = []
+                self._set_state_bytes(key, stored)
+                self._touch(key)
+                self._evict(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        """Return a session, restoring it from the spill file if evicted."""
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            self._restore(key)
+            session = await super().get_session(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                config=config,
+            )
+            if session is not None:
+                self._touch(key)
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List sessions in memory and in the spill file, without events."""
+        with self._lock:
+            response = await super().list_sessions(
+                app_name=app_name, user_id=user_id
+            )
+            if self._db is None:
+                return response
+            query = (
+                "SELECT user_id, id, state, last_update_time FROM sessions"
+                " WHERE app_name = ?"
+            )
+            params: tuple = (app_name,)
+            if user_id is not None:
+                query += " AND user_id = ?"
+                params += (user_id,)
+            for row_user, row_id, state, updated in self._db.execute(
+                query, params
+            ):
+                session = Session(
+                    app_name=app_name,
+                    user_id=row_user,
+                    id=row_id,
+                    state=_compact_state(json.loads(state)),
+                    last_update_time=updated,
+                )
+                response.sessions.append(
+                    self._merge_state(app_name, row_user, session)
+                )
+        return response
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        """Delete a session from memory and from the spill file."""
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            await super().delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            self._forget(key)
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM sessions WHERE app_name = ? AND user_id = ?"
+                    " AND id = ?",
+                    key,
+                )
+                self._db.commit()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event, trimming history and evicting if over limits."""
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            self._restore(key)
+            await super().append_event(session=session, event=event)
+            stored = self._stored(key)
+            if stored is None:
+                logger.warning(f"Event appended to evicted session {key[2]}")
+                return event
+            if event.author == "user":
+                self._in_flight.add(key)
+            elif event.is_final_response():
+                self._in_flight.discard(key)
+            sizes = self._event_bytes.setdefault(key, [])
+            sizes.append(_event_bytes(event))
+            self._total_bytes += sizes[-1]
+            if event.actions and event.actions.state_delta:
+                stored.state = _compact_state(stored.state)
+                self._set_state_bytes(key, stored)
+            if len(stored.events) > self._max_events:
+                self._trim(key, stored)
+            self._touch(key)
+            self._evict(keep=key)
+        return event
+
+    def stats(self) -> dict[str, int]:
+        """Return session counts, estimated memory and eviction counters.
+
+        Returns:
+            Dictionary with `sessions`, `events` and `estimated_bytes` in
+            memory, `spilled_sessions` in the spill file, and counters of
+            evicted, spilled and restored sessions and trimmed events
+        """
+        with self._lock:
+            spilled = 0
+            if self._db is not None:
+                spilled = self._db.execute(
+                    "SELECT COUNT(*) FROM sessions"
+                ).fetchone()[0]
+            return {
+                "sessions": len(self._lru),
+                "in_flight": len(self._in_flight),
+                "events": sum(len(s) for s in self._event_bytes.values()),
+                "estimated_bytes": self._total_bytes,
+                "spilled_sessions": spilled,
+                **self._counters,
+            }
+
+    def close(self) -> None:
+        """Close the spill file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _stored(self, key: SessionKey) -> Optional[Session]:
+        """Return the stored (not copied) session, if in memory."""
+        app_name, user_id, session_id = key
+        return self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+    def _touch(self, key: SessionKey) -> None:
+        """Mark a session as most recently used."""
+        self._lru[key] = time.monotonic()
+        self._lru.move_to_end(key)
+
+    def _set_state_bytes(self, key: SessionKey, stored: Session) -> None:
+        """Update the size estimate of a session's state."""
+        size = _state_bytes(stored)
+        self._total_bytes += size - self._state_bytes.get(key, 0)
+        self._state_bytes[key] = size
+
+    def _trim(self, key: SessionKey, stored: Session) -> None:
+        """Drop the oldest whole turns beyond the per-session event cap."""
+        events = stored.events
+        cut = len(events) - self._max_events
+        # Start the kept history at a user message so that no function
+        # call is separated from its response
+        while cut < len(events) and events[cut].author != "user":
+            cut += 1
+        if cut >= len(events):
+            return
+        sizes = self._event_bytes[key]
+        self._total_bytes -= sum(sizes[:cut])
+        del sizes[:cut]
+        del events[:cut]
+        self._counters["trimmed_events"] += cut
+
+    def _evict(self, keep: SessionKey) -> None:
+        """Evict idle sessions, then LRU sessions while over `max_bytes`.
+
+        Sessions with a turn in flight are skipped when evicting for memory.
+        """
+        now = time.monotonic()
+        for key, last_access in list(self._lru.items()):
+            if key == keep:
+                break
+            if now - last_access > self._idle_seconds:
+                self._counters["evicted_idle"] += 1
+            elif self._total_bytes <= self._max_bytes:
+                break
+            elif key in self._in_flight:
+                continue
+            else:
+                self._counters["evicted_memory"] += 1
+            self._spill(key)
+
+    def _spill(self, key: SessionKey) -> None:
+        """Remove a session from memory, writing it to the spill file."""
+        app_name, user_id, session_id = key
+        stored = self.sessions[app_name][user_id].pop(session_id)
+        if not self.sessions[app_name][user_id]:
+            del self.sessions[app_name][user_id]
+        self._forget(key)
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                app_name,
+                user_id,
+                session_id,
+                json.dumps(stored.state, default=str),
+                zlib.compress(
+                    stored.model_dump_json(exclude_none=True).encode()
+                ),
+                stored.last_update_time,
+            ),
+        )
+        self._db.commit()
+        self._counters["spilled"] += 1
+
+    def _restore(self, key: SessionKey) -> None:
+        """Load a spilled session back into memory, if there is one."""
+        if self._db is None or self._stored(key) is not None:
+            return
+        row = self._db.execute(
+            "SELECT session FROM sessions WHERE app_name = ? AND user_id = ?"
+            " AND id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return
+        stored = Session.model_validate_json(zlib.decompress(row[0]))
+        stored.state = _compact_state(stored.state)
+        app_name, user_id, session_id = key
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[
+            session_id
+        ] = stored
+        self._db.execute(
+            "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        )
+        self._db.commit()
+        sizes = [_event_bytes(event) for event in stored.events]
+        self._event_bytes[key] = sizes
+        self._total_bytes += sum(sizes)
+        self._set_state_bytes(key, stored)
+        self._touch(key)
+        self._counters["restored"] += 1
+
+    def _forget(self, key: SessionKey) -> None:
+        """Drop the bookkeeping of a session no longer in memory."""
+        self._lru.pop(key, None)
+        self._in_flight.discard(key)
+        self._total_bytes -= self._state_bytes.pop(key, 0)
+        self._total_bytes -= sum(self._event_bytes.pop(key, []))
+
+
+def bounded_session_service_from_config(
+    config: "AppConfig",
+) -> BoundedSessionService:
+    """Build a bounded session service from the validated config.
+
+    Args:
+        config: Config with the SESSION_MAX_MB, SESSION_MAX_EVENTS,
+                SESSION_IDLE_SECONDS and SESSION_SPILL_PATH settings
+
+    Returns:
+        The session service
+    """
+    return BoundedSessionService(
+        max_bytes=int(config.session_max_mb * 1024 * 1024),
+        max_events_per_session=config.session_max_events,
+        idle_seconds=config.session_idle_seconds,
+        spill_path=config.session_spill_path,
+    )
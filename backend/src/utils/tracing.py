@@ -1,14 +1,198 @@
 """Cloud Trace logging utilities."""
 
+import gzip
+import hashlib
 import json
 import logging
-from typing import Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Mapping
 
 import google.cloud.storage as storage
 from google.cloud import logging as google_cloud_logging
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.util import ns_to_iso_str
+from opentelemetry.trace import SpanContext
 
+# Cloud Logging accepts up to 10 MB and 1000 entries per entries.write call
+DEFAULT_MAX_BATCH_BYTES = 9 * 1024 * 1024
+DEFAULT_MAX_BATCH_ENTRIES = 1000
 
-class CloudTraceLoggingSpanExporter:
+# Attributes above this size are stored in GCS
+MAX_INLINE_ATTRIBUTES_BYTES = 255 * 1024
+# Largest attributes are offloaded until the rest fit in this size
+OFFLOAD_TARGET_BYTES = 64 * 1024
+# Characters of an offloaded attribute kept inline
+PREVIEW_CHARS = 512
+
+DEFAULT_UPLOAD_WORKERS = 4
+DEFAULT_MAX_PENDING_UPLOADS = 32
+
+# Approximate size of the fixed span fields (ids, times, kind, status)
+_SPAN_OVERHEAD_BYTES = 400
+# Approximate size of the fixed fields of an event and of a link
+_EVENT_OVERHEAD_BYTES = 80
+_LINK_OVERHEAD_BYTES = 160
+
+
+def _value_size(value: Any) -> int:
+    """Return the approximate JSON size of an attribute value in bytes."""
+    if isinstance(value, str):
+        # isascii() is O(1) and avoids encoding the common ASCII case
+        return (len(value) if value.isascii() else len(value.encode())) + 2
+    if isinstance(value, (tuple, list)):
+        return sum(_value_size(item) + 2 for item in value) + 2
+    return len(str(value))
+
+
+def attributes_size(attributes: Mapping[str, Any] | None) -> int:
+    """Return the approximate JSON size of an attribute mapping in bytes.
+
+    Args:
+        attributes: Span, event, link or resource attributes
+
+    Returns:
+        UTF-8 size of the serialized mapping, without escaping overhead
+    """
+    if not attributes:
+        return 2
+    return sum(
+        len(key) + _value_size(value) + 6 for key, value in attributes.items()
+    )
+
+
+def estimate_span_bytes(span: ReadableSpan) -> int:
+    """Return the approximate serialized size of a span in bytes.
+
+    Args:
+        span: Finished span
+
+    Returns:
+        The size `span_to_dict` reports for the span
+    """
+    return _span_bytes(span, attributes_size(span.attributes))
+
+
+def _span_bytes(span: ReadableSpan, attributes_bytes: int) -> int:
+    """Return the approximate JSON size of a span's dict in bytes.
+
+    Args:
+        span: Finished span
+        attributes_bytes: Size of the span's own attributes
+
+    Returns:
+        Size of the fields, events, links, resource and status
+    """
+    size = _SPAN_OVERHEAD_BYTES + len(span.name) + attributes_bytes
+    for event in span.events:
+        size += (
+            len(event.name)
+            + attributes_size(event.attributes)
+            + _EVENT_OVERHEAD_BYTES
+        )
+    for link in span.links:
+        size += attributes_size(link.attributes) + _LINK_OVERHEAD_BYTES
+    size += _resource_to_dict(span.resource)[1]
+    if span.status.description:
+        size += len(span.status.description)
+    return size
+
+
+def _format_context(context: SpanContext) -> dict[str, str]:
+    """Format a span context like `ReadableSpan.to_json()`."""
+    return {
+        "trace_id": f"0x{context.trace_id:032x}",
+        "span_id": f"0x{context.span_id:016x}",
+        "trace_state": repr(context.trace_state),
+    }
+
+
+_resource_cache: dict[int, tuple[Resource, dict[str, Any], int]] = {}
+
+
+def _resource_to_dict(resource: Resource) -> tuple[dict[str, Any], int]:
+    """Convert a resource to a dict, cached since spans share one resource.
+
+    Returns:
+        The resource dict and its approximate JSON size in bytes
+    """
+    cached = _resource_cache.get(id(resource))
+    if cached is not None and cached[0] is resource:
+        return cached[1], cached[2]
+    attributes = dict(resource.attributes)
+    resource_dict = {
+        "attributes": attributes,
+        "schema_url": resource.schema_url,
+    }
+    size = attributes_size(attributes) + len(resource.schema_url) + 32
+    if len(_resource_cache) >= 16:
+        _resource_cache.clear()
+    _resource_cache[id(resource)] = (resource, resource_dict, size)
+    return resource_dict, size
+
+
+def span_to_dict(span: ReadableSpan) -> tuple[dict[str, Any], int, int]:
+    """Convert a finished span to the dict produced by `span.to_json()`.
+
+    Reads the span's fields directly instead of serializing and parsing it
+    again, and measures the attribute sizes while building the dict.
+
+    Args:
+        span: Finished SDK span
+
+    Returns:
+        The span dict, the approximate JSON size of its attributes and the
+        approximate JSON size of the whole dict, in bytes
+    """
+    attributes = dict(span.attributes or {})
+    attributes_bytes = attributes_size(attributes)
+    size = _span_bytes(span, attributes_bytes)
+
+    events = [
+        {
+            "name": event.name,
+            "timestamp": ns_to_iso_str(event.timestamp),
+            "attributes": dict(event.attributes or {}),
+        }
+        for event in span.events
+    ]
+    links = [
+        {
+            "context": _format_context(link.context),
+            "attributes": dict(link.attributes or {}),
+        }
+        for link in span.links
+    ]
+    resource, _ = _resource_to_dict(span.resource)
+
+    status = {"status_code": span.status.status_code.name}
+    if span.status.description:
+        status["description"] = span.status.description
+
+    span_dict = {
+        "name": span.name,
+        "context": _format_context(span.context) if span.context else None,
+        "kind": str(span.kind),
+        "parent_id": (
+            f"0x{span.parent.span_id:016x}" if span.parent else None
+        ),
+        "start_time": (
+            ns_to_iso_str(span.start_time) if span.start_time else None
+        ),
+        "end_time": ns_to_iso_str(span.end_time) if span.end_time else None,
+        "status": status,
+        "attributes": attributes,
+        "events": events,
+        "links": links,
+        "resource": resource,
+    }
+    return span_dict, attributes_bytes, size
+
+
+class CloudTraceLoggingSpanExporter(SpanExporter):
     """Extended CloudTraceSpanExporter with Cloud Logging and GCS support."""
 
     def __init__(
@@ -19,6 +203,10 @@ class CloudTraceLoggingSpanExporter:
         bucket_name: str | None = None,
         service_name: str = "adk-agent",
         debug: bool = False,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_batch_entries: int = DEFAULT_MAX_BATCH_ENTRIES,
+        upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+        max_pending_uploads: int = DEFAULT_MAX_PENDING_UPLOADS,
     ) -> None:
         """Initialize the exporter.
 
@@ -29,10 +217,17 @@ class CloudTraceLoggingSpanExporter:
             bucket_name: GCS bucket for large payloads
             service_name: Service name for logging
             debug: Enable debug mode
+            max_batch_bytes: Maximum serialized size of one batched write
+            max_batch_entries: Maximum number of spans in one batched write
+            upload_workers: Threads uploading large payloads to GCS
+            max_pending_uploads: Uploads queued or running before exporting
+                                 blocks until one completes
         """
         self.project_id = project_id
         self.debug = debug
         self.service_name = service_name
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_entries = max_batch_entries
         self.logging_client = logging_client or google_cloud_logging.Client(
             project=self.project_id
         )
@@ -44,13 +239,37 @@ class CloudTraceLoggingSpanExporter:
             bucket_name or f"{self.project_id}-agent-logs-data"
         )
         self.bucket = self.storage_client.bucket(self.bucket_name)
+        self._bucket_exists: bool | None = None
+        self._bucket_lock = threading.Lock()
 
-    def export(self, spans: Any) -> None:
-        """Export spans to Cloud Logging.
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=upload_workers, thread_name_prefix="span-upload"
+        )
+        self._upload_slots = threading.BoundedSemaphore(max_pending_uploads)
+        self._pending_uploads: set[Future] = set()
+        self._metrics_lock = threading.Lock()
+        self._upload_metrics = {
+            "uploads": 0,
+            "failures": 0,
+            "bytes_raw": 0,
+            "bytes_uploaded": 0,
+            "backpressure_waits": 0,
+            "latency_seconds_total": 0.0,
+            "latency_seconds_max": 0.0,
+        }
+
+    def export(self, spans: Any) -> SpanExportResult:
+        """Export spans to Cloud Logging with batched writes.
 
         Args:
             spans: Sequence of spans to export
+
+        Returns:
+            FAILURE if any span could not be converted or any batch could
+            not be written, SUCCESS otherwise
         """
+        entries = []
+        failed = False
         for span in spans:
             try:
                 span_context = span.get_span_context()
@@ -58,83 +277,264 @@ class CloudTraceLoggingSpanExporter:
                     continue
                 trace_id = format(span_context.trace_id, "x")
                 span_id = format(span_context.span_id, "x")
-                span_dict = json.loads(span.to_json())
+                span_dict, attributes_bytes, size = span_to_dict(span)
 
                 span_dict["trace"] = (
                     f"projects/{self.project_id}/traces/{trace_id}"
                 )
                 span_dict["span_id"] = span_id
+                size += len(span_dict["trace"]) + len(span_id) + 24
 
-                span_dict = self._process_large_attributes(
-                    span_dict=span_dict, span_id=span_id
-                )
+                if attributes_bytes > MAX_INLINE_ATTRIBUTES_BYTES:
+                    offloaded_bytes = self._process_large_attributes(
+                        span_dict=span_dict, span_id=span_id
+                    )
+                    size -= offloaded_bytes
 
                 if self.debug:
                     print(span_dict)
 
-                self.logger.log_struct(
-                    span_dict,
-                    labels={
-                        "type": "agent_telemetry",
-                        "service_name": self.service_name,
-                    },
-                    severity="INFO",
-                )
+                entries.append((span_dict, size))
             except Exception as e:
                 logging.error(f"Error exporting span: {e}")
+                failed = True
+
+        result = self._write_batches(entries)
+        return SpanExportResult.FAILURE if failed else result
+
+    def shutdown(self) -> None:
+        """Wait for pending uploads and stop the upload threads."""
+        self._upload_executor.shutdown(wait=True)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Wait for pending GCS uploads.
+
+        Args:
+            timeout_millis: Maximum time to wait
 
-    def store_in_gcs(self, content: str, span_id: str) -> str:
-        """Store large content in GCS.
+        Returns:
+            True if every pending upload completed in time
+        """
+        with self._metrics_lock:
+            pending = list(self._pending_uploads)
+        _, not_done = wait(pending, timeout=timeout_millis / 1000)
+        return not not_done
+
+    def upload_metrics(self) -> dict[str, Any]:
+        """Return latency and failure counters of the GCS uploads."""
+        with self._metrics_lock:
+            metrics = dict(self._upload_metrics)
+            metrics["pending"] = len(self._pending_uploads)
+        completed = metrics["uploads"] + metrics["failures"]
+        metrics["latency_seconds_avg"] = (
+            metrics["latency_seconds_total"] / completed if completed else 0.0
+        )
+        return metrics
+
+    def _write_batches(
+        self, entries: list[tuple[dict, int]]
+    ) -> SpanExportResult:
+        """Write span entries in as few API requests as the limits allow.
+
+        Args:
+            entries: Span dictionaries with their approximate sizes in bytes
+
+        Returns:
+            FAILURE if any batch could not be written, SUCCESS otherwise
+        """
+        labels = {
+            "type": "agent_telemetry",
+            "service_name": self.service_name,
+        }
+        result = SpanExportResult.SUCCESS
+        batch = self.logger.batch()
+        batch_size = batch_count = 0
+
+        for entry, entry_size in entries:
+            if batch_count and (
+                batch_size + entry_size > self.max_batch_bytes
+                or batch_count >= self.max_batch_entries
+            ):
+                if not self._commit(batch, batch_count):
+                    result = SpanExportResult.FAILURE
+                batch = self.logger.batch()
+                batch_size = batch_count = 0
+
+            batch.log_struct(entry, labels=labels, severity="INFO")
+            batch_size += entry_size
+            batch_count += 1
+
+        if batch_count and not self._commit(batch, batch_count):
+            result = SpanExportResult.FAILURE
+        return result
+
+    def _commit(self, batch: Any, count: int) -> bool:
+        """Commit a batch, handling a failure for the batch as a whole.
+
+        Args:
+            batch: Cloud Logging batch to commit
+            count: Number of spans in the batch
+
+        Returns:
+            True if the batch was written
+        """
+        try:
+            batch.commit()
+            return True
+        except Exception as e:
+            logging.error(f"Error exporting batch of {count} spans: {e}")
+            return False
+
+    def store_in_gcs(
+        self, content: dict[str, Any], span_id: str
+    ) -> str | None:
+        """Store large content in GCS as gzipped JSON.
+
+        Serialization, compression and upload run on a background thread;
+        the returned URI is final as soon as the upload is scheduled. When
+        `max_pending_uploads` are already in flight, this blocks until one
+        of them completes.
 
         Args:
             content: Content to store
             span_id: Span ID
 
         Returns:
-            GCS URI of stored content
+            GCS URI of stored content, or None if the bucket is missing
         """
-        if not self.storage_client.bucket(self.bucket_name).exists():
-            logging.warning(
-                f"Bucket {self.bucket_name} not found. "
-                "Unable to store span attributes in GCS."
-            )
-            return "GCS bucket not found"
+        if not self._check_bucket():
+            return None
 
-        blob_name = f"spans/{span_id}.json"
-        blob = self.bucket.blob(blob_name)
+        blob_name = f"spans/{span_id}.json.gz"
+        if not self._upload_slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self._upload_metrics["backpressure_waits"] += 1
+            self._upload_slots.acquire()
 
-        blob.upload_from_string(content, "application/json")
+        future = self._upload_executor.submit(self._upload, blob_name, content)
+        with self._metrics_lock:
+            self._pending_uploads.add(future)
+        future.add_done_callback(self._upload_done)
         return f"gs://{self.bucket_name}/{blob_name}"
 
-    def _process_large_attributes(
-        self, span_dict: dict, span_id: str
-    ) -> dict:
-        """Process large attributes by storing in GCS if needed.
+    def warm_up(self) -> bool:
+        """Open the Cloud Storage connection before the first large span.
+
+        Returns:
+            True if the payload bucket exists
+        """
+        return self._check_bucket()
+
+    def _check_bucket(self) -> bool:
+        """Check once whether the payload bucket exists.
+
+        Returns:
+            True if the bucket exists
+        """
+        if self._bucket_exists is None:
+            with self._bucket_lock:
+                if self._bucket_exists is None:
+                    try:
+                        self._bucket_exists = self.bucket.exists()
+                    except Exception as e:
+                        logging.error(f"Error checking GCS bucket: {e}")
+                        return False
+                    if not self._bucket_exists:
+                        logging.warning(
+                            f"Bucket {self.bucket_name} not found. "
+                            "Unable to store span attributes in GCS."
+                        )
+        return self._bucket_exists
+
+    def _upload(self, blob_name: str, content: dict[str, Any]) -> None:
+        """Compress and upload a payload, recording latency or failure.
+
+        Args:
+            blob_name: Name of the blob to write
+            content: Content to store
+        """
+        started = time.monotonic()
+        raw = json.dumps(content, ensure_ascii=False).encode()
+        data = gzip.compress(raw, compresslevel=6)
+        try:
+            blob = self.bucket.blob(blob_name)
+            # Served decompressed to clients that do not accept gzip
+            blob.content_encoding = "gzip"
+            blob.upload_from_string(data, "application/json")
+            outcome = "uploads"
+        except Exception as e:
+            logging.error(f"Error uploading span payload {blob_name}: {e}")
+            outcome = "failures"
+        latency = time.monotonic() - started
+        with self._metrics_lock:
+            metrics = self._upload_metrics
+            metrics[outcome] += 1
+            if outcome == "uploads":
+                metrics["bytes_raw"] += len(raw)
+                metrics["bytes_uploaded"] += len(data)
+            metrics["latency_seconds_total"] += latency
+            metrics["latency_seconds_max"] = max(
+                metrics["latency_seconds_max"], latency
+            )
+
+    def _upload_done(self, future: Future) -> None:
+        """Release the upload's slot once it has finished."""
+        with self._metrics_lock:
+            self._pending_uploads.discard(future)
+        self._upload_slots.release()
+
+    def _process_large_attributes(self, span_dict: dict, span_id: str) -> int:
+        """Offload the largest attributes of an oversized span to GCS.
+
+        Attributes are moved out, largest first, until the rest fit in
+        `OFFLOAD_TARGET_BYTES`. Each offloaded attribute is replaced inline
+        by a preview, its SHA-256 and its size; the offloaded values are
+        uploaded together as one gzipped blob. When nothing can be
+        offloaded, or the payload bucket is missing, the attributes are
+        left as they are.
 
         Args:
-            span_dict: Span data dictionary
+            span_dict: Span data dictionary, updated in place
             span_id: Span ID
 
         Returns:
-            Updated span dictionary
+            Approximate number of bytes removed from the span
         """
         attributes = span_dict["attributes"]
-        if len(json.dumps(attributes).encode()) > 255 * 1024:
-            attributes_payload = dict(attributes.items())
-            attributes_retain = dict(attributes.items())
-
-            gcs_uri = self.store_in_gcs(
-                json.dumps(attributes_payload), span_id
-            )
-            attributes_retain["uri_payload"] = gcs_uri
-            attributes_retain["url_payload"] = (
-                f"https://storage.mtls.cloud.google.com/"
-                f"{self.bucket_name}/spans/{span_id}.json"
-            )
+        sizes = sorted(
+            ((_value_size(value), key) for key, value in attributes.items()),
+            reverse=True,
+        )
+        remaining = sum(size for size, _ in sizes)
+        offloaded: dict[str, Any] = {}
+        for size, key in sizes:
+            if remaining <= OFFLOAD_TARGET_BYTES or size <= 2 * PREVIEW_CHARS:
+                break
+            offloaded[key] = attributes[key]
+            remaining -= size
+        if not offloaded:
+            return 0
 
-            span_dict["attributes"] = attributes_retain
-            logging.info(
-                "Payload above 250 KB, storing attributes in GCS"
-            )
+        gcs_uri = self.store_in_gcs(offloaded, span_id)
+        if gcs_uri is None:
+            return 0
+        removed = 0
+        for key, value in offloaded.items():
+            text = value if isinstance(value, str) else json.dumps(value)
+            encoded = text.encode()
+            attributes[key] = {
+                "preview": text[:PREVIEW_CHARS],
+                "sha256": hashlib.sha256(encoded).hexdigest(),
+                "size_bytes": len(encoded),
+            }
+            removed += len(encoded) - PREVIEW_CHARS - 128
+        attributes["uri_payload"] = gcs_uri
+        attributes["url_payload"] = (
+            f"https://storage.mtls.cloud.google.com/"
+            f"{self.bucket_name}/spans/{span_id}.json.gz"
+        )
+        logging.info(
+            f"Payload above 250 KB, storing {len(offloaded)} attributes in GCS"
+        )
 
-        return span_dict
+        return removed
@@ -0,0 +1,104 @@
+"""Warm-up steps run before an instance reports ready."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """Run named warm-up steps in order within a time budget.
+
+    Steps run on a background thread so that `run` can return once the
+    budget is spent; a step still running then is reported as timed out
+    and left to finish, and the steps after it are skipped. A failing
+    step is logged and does not stop the others. Durations are kept for
+    `report()`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty warm-up."""
+        self._steps: list[tuple[str, Callable[[], Any]]] = []
+        self._results: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._total_seconds: Optional[float] = None
+
+    def add_step(self, name: str, step: Callable[[], Any]) -> None:
+        """Add a step to run after the ones already added.
+
+        Args:
+            name: Name reported for the step
+            step: Callable doing the work; its return value is reported
+        """
+        self._steps.append((name, step))
+
+    def run(self, budget_seconds: float) -> bool:
+        """Run the steps, returning when done or the budget is spent.
+
+        Args:
+            budget_seconds: Maximum seconds to wait for the steps
+
+        Returns:
+            True if every step finished within the budget
+        """
+        started = time.perf_counter()
+        thread = threading.Thread(
+            target=self._run_steps, name="warm-up", daemon=True
+        )
+        thread.start()
+        thread.join(budget_seconds)
+        self._total_seconds = time.perf_counter() - started
+        if thread.is_alive():
+            self._cancelled.set()
+            logger.warning(
+                f"Warm-up exceeded its {budget_seconds:.0f}s budget; "
+                "reporting ready anyway"
+            )
+            return False
+        logger.info(f"Warm-up finished in {self._total_seconds:.2f}s")
+        return True
+
+    def report(self) -> dict[str, Any]:
+        """Return the status and duration of each step.
+
+        Returns:
+            Dictionary with `total_seconds` and `steps`, a list of
+            {name, status, seconds, result}; status is one of "ok",
+            "failed", "running" (timed out) or "skipped"
+        """
+        with self._lock:
+            steps = [
+                self._results.get(
+                    name, {"name": name, "status": "skipped", "seconds": 0.0}
+                )
+                for name, _ in self._steps
+            ]
+        return {"total_seconds": self._total_seconds, "steps": steps}
+
+    def _run_steps(self) -> None:
+        """Run every step in order until cancelled."""
+        for name, step in self._steps:
+            if self._cancelled.is_set():
+                return
+            result: dict[str, Any] = {
+                "name": name,
+                "status": "running",
+                "seconds": None,
+            }
+            with self._lock:
+                self._results[name] = result
+            started = time.perf_counter()
+            try:
+                value = step()
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {e}")
+                status, value = "failed", str(e)
+            else:
+                status = "ok"
+            seconds = time.perf_counter() - started
+            with self._lock:
+                result.update(status=status, seconds=seconds, result=value)
+            logger.info(f"Warm-up step {name}: {status} in {seconds:.2f}s")
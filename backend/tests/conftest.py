@@ -0,0 +1,75 @@
+"""Shared test fixtures."""
+
+import sys
+from typing import Callable, Iterator
+
+import pytest
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.tools.config import get_config
+
+TEST_ENV = {
+    "JIRA_PROJECT": "GEN",
+    "JIRA_CLOUD": "test-cloud",
+    "JIRA_TOKEN": "test-token",
+    "JIRA_EMAIL": "test@example.com",
+}
+
+
+def _clear_config() -> None:
+    """Clear the cached config, including the agents' copy.
+
+    The agents import the tools through the `tools` package path, which
+    loads a second `config` module with its own cache.
+    """
+    get_config.cache_clear()
+    agents_config = sys.modules.get("tools.config")
+    if agents_config is not None:
+        agents_config.get_config.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def app_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Load the config from test settings instead of the developer's env."""
+    for key, value in TEST_ENV.items():
+        monkeypatch.setenv(key, value)
+    _clear_config()
+    yield
+    _clear_config()
+
+
+@pytest.fixture
+def make_turn_spans() -> Callable[..., list[ReadableSpan]]:
+    """Return a factory of finished spans resembling agent turns."""
+
+    def make(
+        turns: int, spans_per_turn: int, prompt_chars: int
+    ) -> list[ReadableSpan]:
+        memory = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(memory))
+        tracer = provider.get_tracer("test")
+
+        for turn in range(turns):
+            with tracer.start_as_current_span("invocation") as root:
+                root.set_attribute("gen_ai.operation.name", "invoke_agent")
+                for i in range(spans_per_turn - 1):
+                    with tracer.start_as_current_span(f"call_llm {i}") as span:
+                        span.set_attributes(
+                            {
+                                "gcp.vertex.agent.invocation_id": f"e-{turn}",
+                                "gen_ai.request.model": "gemini-2.5-flash",
+                                "gcp.vertex.agent.llm_request": "p"
+                                * prompt_chars,
+                                "gcp.vertex.agent.llm_response": "r"
+                                * (prompt_chars // 4),
+                                "gen_ai.usage.input_tokens": 1200,
+                            }
+                        )
+        return list(memory.get_finished_spans())
+
+    return make
@@ -0,0 +1,124 @@
+"""Unit tests for admission control."""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+from src.plugins.admission_control import (
+    KNOWLEDGE_BASE_MULTI,
+    TICKET_CREATION,
+    AdmissionController,
+    AdmissionControlPlugin,
+    busy_message,
+)
+
+
+def _tool_context(agent_name: str, user_id: str = "merchant-1") -> Mock:
+    """Create a tool context of an agent running for a user."""
+    context = Mock(agent_name=agent_name)
+    context._invocation_context.user_id = user_id
+    return context
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController."""
+
+    def test_user_burst_then_refill(self) -> None:
+        """Test that a user is limited to the burst, then the refill rate."""
+        with patch("src.plugins.admission_control.time.monotonic") as now:
+            now.return_value = 100.0
+            controller = AdmissionController(user_per_minute=60, user_burst=2)
+            admitted = [controller.try_admit("noisy") for _ in range(3)]
+            other = controller.try_admit("quiet")
+            now.return_value = 101.0
+            refilled = controller.try_admit("noisy")
+
+        assert admitted == [None, None, "user_rate"]
+        assert other is None
+        assert refilled is None
+        assert controller.stats()["rejected_user_rate"] == 1
+
+    def test_global_limit(self) -> None:
+        """Test that the global bucket limits all users together."""
+        controller = AdmissionController(global_burst=2)
+        results = [controller.try_admit(f"user-{i}") for i in range(3)]
+        assert results == [None, None, "global_rate"]
+
+    def test_concurrency_limit(self) -> None:
+        """Test that released turns free their concurrency slot."""
+        controller = AdmissionController(max_concurrent=1)
+        assert controller.try_admit("a") is None
+        assert controller.try_admit("b") == "concurrency"
+        controller.release()
+        assert controller.try_admit("b") is None
+        assert controller.stats()["active"] == 1
+
+    def test_disabled_admits_everything(self) -> None:
+        """Test that a disabled controller never rejects."""
+        controller = AdmissionController(
+            enabled=False, user_burst=0, path_per_minute={TICKET_CREATION: 0}
+        )
+        assert controller.try_admit("a") is None
+        assert controller.try_acquire_path(TICKET_CREATION, "a")
+
+    def test_user_buckets_are_bounded(self) -> None:
+        """Test that buckets of the least recently seen users are dropped."""
+        controller = AdmissionController(max_users=2)
+        for user in ("a", "b", "c"):
+            controller.try_admit(user)
+            controller.release()
+        assert controller.stats()["tracked_users"] == 2
+
+
+class TestAdmissionControlPlugin:
+    """Test cases for AdmissionControlPlugin."""
+
+    def test_limits_ticket_creation_per_user(self) -> None:
+        """Test that ticket creation beyond the limit is not run."""
+        controller = AdmissionController(
+            path_per_minute={TICKET_CREATION: 1}
+        )
+        plugin = AdmissionControlPlugin(controller)
+        tool = Mock()
+        tool.name = "create_jira_ticket"
+
+        async def call(user_id: str):
+            return await plugin.before_tool_callback(
+                tool=tool,
+                tool_args={},
+                tool_context=_tool_context("complaint_flow_agent", user_id),
+            )
+
+        assert asyncio.run(call("merchant-1")) is None
+        rejected = asyncio.run(call("merchant-1"))
+        assert rejected["status"] == "error"
+        assert asyncio.run(call("merchant-2")) is None
+        assert controller.stats()["rejected_ticket_creation"] == 1
+
+    def test_limits_only_multi_language_knowledge_base(self) -> None:
+        """Test that the knowledge base limit applies to the multi agent."""
+        controller = AdmissionController(
+            path_per_minute={KNOWLEDGE_BASE_MULTI: 0}
+        )
+        plugin = AdmissionControlPlugin(controller)
+        tool = Mock()
+        tool.name = "query_knowledge_base"
+
+        async def call(agent_name: str):
+            return await plugin.before_tool_callback(
+                tool=tool,
+                tool_args={"query": "fees"},
+                tool_context=_tool_context(agent_name),
+            )
+
+        assert asyncio.run(call("knowledge_base_agent")) is None
+        assert asyncio.run(call("knowledge_base_agent_multi")) is not None
+
+
+class TestBusyMessage:
+    """Test cases for busy_message."""
+
+    def test_localized(self) -> None:
+        """Test that the reply is in the requested language."""
+        assert busy_message("english").startswith("We are receiving")
+        assert busy_message("tamil") != busy_message("sinhala")
+        assert busy_message("french") == busy_message("english")
@@ -0,0 +1,103 @@
+"""Unit tests for the adaptive context-cache policy."""
+
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from src.plugins.cache_policy import (
+    DEFAULT_CONTEXT_CACHE_CONFIG,
+    AdaptiveCachePolicyPlugin,
+    CachePolicyBounds,
+)
+
+# 2025-01-01 10:00 and 23:00 in Sri Lanka (UTC+5:30)
+PEAK = 1735705800.0
+NIGHT = 1735752600.0
+
+
+def _response(prompt_tokens: int, cached_tokens: int) -> LlmResponse:
+    """Build a model response with usage metadata."""
+    return LlmResponse(
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            cached_content_token_count=cached_tokens,
+        )
+    )
+
+
+class TestAdaptiveCachePolicyPlugin:
+    """Test cases for AdaptiveCachePolicyPlugin."""
+
+    def test_high_hit_ratio_extends_reuse(self) -> None:
+        """Test that good hit ratios increase intervals and record a decision."""
+        now = [PEAK]
+        plugin = AdaptiveCachePolicyPlugin(adjust_every=5, clock=lambda: now[0])
+        context = SimpleNamespace(agent_name="supervisor_agent")
+
+        async def run() -> None:
+            for i in range(6):
+                now[0] = PEAK + i * 120
+                await plugin.before_run_callback(
+                    invocation_context=SimpleNamespace(
+                        session=SimpleNamespace(id="session-1")
+                    )
+                )
+            for _ in range(5):
+                await plugin.after_model_callback(
+                    callback_context=context,
+                    llm_response=_response(4000, 3000),
+                )
+
+        asyncio.run(run())
+        config = plugin.config_for("supervisor_agent")
+
+        default = DEFAULT_CONTEXT_CACHE_CONFIG
+        assert config.cache_intervals == default.cache_intervals + 1
+        assert config.min_tokens < default.min_tokens
+        assert config.ttl_seconds == 144
+        decision = plugin.decisions()[-1]
+        assert decision["agent"] == "supervisor_agent"
+        assert decision["period"] == "peak"
+
+    def test_periods_are_tuned_separately(self) -> None:
+        """Test that night-time traffic does not change the peak policy."""
+        now = [NIGHT]
+        plugin = AdaptiveCachePolicyPlugin(adjust_every=2, clock=lambda: now[0])
+        context = SimpleNamespace(agent_name="status_check_agent")
+
+        async def run() -> None:
+            for _ in range(2):
+                await plugin.after_model_callback(
+                    callback_context=context, llm_response=_response(4000, 0)
+                )
+
+        asyncio.run(run())
+
+        assert plugin.config_for("status_check_agent").cache_intervals == 4
+        now[0] = PEAK
+        assert (
+            plugin.config_for("status_check_agent")
+            == DEFAULT_CONTEXT_CACHE_CONFIG
+        )
+
+    def test_settings_stay_within_bounds(self) -> None:
+        """Test that repeated adjustments are clamped to the bounds."""
+        bounds = CachePolicyBounds(min_cache_intervals=3, max_min_tokens=2000)
+        plugin = AdaptiveCachePolicyPlugin(
+            bounds=bounds, adjust_every=1, clock=lambda: PEAK
+        )
+        context = SimpleNamespace(agent_name="complaint_flow_agent")
+
+        async def run() -> None:
+            for _ in range(10):
+                await plugin.after_model_callback(
+                    callback_context=context, llm_response=_response(4000, 0)
+                )
+
+        asyncio.run(run())
+        config = plugin.config_for("complaint_flow_agent")
+
+        assert config.cache_intervals == 3
+        assert config.min_tokens == 2000
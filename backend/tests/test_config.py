@@ -0,0 +1,105 @@
+"""Unit tests for the shared configuration."""
+
+import dataclasses
+
+import pytest
+
+from src.tools.config import DEFAULT_LOCATION, get_config, load_config
+from src.tools.ticket import get_user_tickets
+
+
+class TestLoadConfig:
+    """Test cases for load_config and get_config."""
+
+    def test_defaults(self) -> None:
+        """Test that optional integrations default to unset."""
+        config = load_config({})
+
+        assert config.location == DEFAULT_LOCATION
+        assert not config.jira_configured
+        assert not config.rag_configured
+        assert config.context_token_budget == 6000
+        assert config.adaptive_cache_policy is True
+
+    def test_parses_values(self) -> None:
+        """Test that typed values and fallbacks are parsed."""
+        config = load_config(
+            {
+                "GOOGLE_CLOUD_PROJECT": "proj",
+                "CORPUS_ID": "123",
+                "RAG_TOP_K": "5",
+                "SPECULATIVE_RETRIEVAL": "TRUE",
+                "USAGE_LOG_INTERVAL_SECONDS": "2.5",
+                "WARMUP_QUERIES": "fees? | | settlement time",
+            }
+        )
+
+        assert config.project_id == "proj"
+        assert config.rag_configured
+        assert config.rag_top_k == 5
+        assert config.speculative_retrieval is True
+        assert config.usage_log_interval_seconds == 2.5
+        assert config.warmup_queries == ("fees?", "settlement time")
+
+    def test_parses_tracing_values(self) -> None:
+        """Test that the tracing and session store settings are parsed."""
+        config = load_config(
+            {
+                "OBSERVABILITY_ENABLED": "false",
+                "METRICS_PORT": "9464",
+                "TRACE_SAMPLE_RATE": "0.25",
+                "TRACE_EXPORTER": "JSONL",
+                "TRACE_JSONL_GZIP": "true",
+                "SPAN_QUEUE_MAX_MB": "16",
+                "FEEDBACK_BATCH_SIZE": "50",
+                "SESSION_STORE": "bounded",
+            }
+        )
+
+        assert config.observability_enabled is False
+        assert config.metrics_port == 9464
+        assert config.trace_sample_rate == 0.25
+        assert config.trace_exporter == "jsonl"
+        assert config.trace_jsonl_gzip is True
+        assert config.span_queue_max_mb == 16.0
+        assert config.feedback_batch_size == 50
+        assert config.session_store == "bounded"
+
+    def test_invalid_value_names_variable(self) -> None:
+        """Test that a malformed value fails with the variable name."""
+        with pytest.raises(ValueError, match="CONTEXT_TOKEN_BUDGET"):
+            load_config({"CONTEXT_TOKEN_BUDGET": "lots"})
+        with pytest.raises(ValueError, match="ADAPTIVE_CACHE_POLICY"):
+            load_config({"ADAPTIVE_CACHE_POLICY": "yes please"})
+        with pytest.raises(ValueError, match="WARMUP_BUDGET_SECONDS"):
+            load_config({"WARMUP_BUDGET_SECONDS": "30s"})
+        with pytest.raises(ValueError, match="SESSION_MAX_EVENTS"):
+            load_config({"SESSION_MAX_EVENTS": "2e2"})
+        with pytest.raises(ValueError, match="TRACE_SAMPLE_RATE"):
+            load_config({"TRACE_SAMPLE_RATE": "1.5"})
+        with pytest.raises(ValueError, match="TRACE_EXPORTER"):
+            load_config({"TRACE_EXPORTER": "stdout"})
+        with pytest.raises(ValueError, match="SESSION_STORE"):
+            load_config({"SESSION_STORE": "redis"})
+        with pytest.raises(ValueError, match="METRICS_PORT"):
+            load_config({"METRICS_PORT": "metrics"})
+
+    def test_config_is_frozen_and_shared(self) -> None:
+        """Test that the config is loaded once and cannot be modified."""
+        config = get_config()
+
+        assert get_config() is config
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.jira_project = "OTHER"  # type: ignore[misc]
+
+    def test_missing_jira_degrades_at_call_time(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that tools report missing Jira settings when called."""
+        monkeypatch.delenv("JIRA_TOKEN")
+        get_config.cache_clear()
+
+        result = get_user_tickets("user123")
+
+        assert result["status_code"] == 503
+        assert "not configured" in result["error"]
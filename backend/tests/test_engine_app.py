@@ -0,0 +1,223 @@
+"""Unit tests for the deployed Agent Engine application."""
+
+import asyncio
+import importlib
+import json
+import os
+import sys
+from collections.abc import AsyncIterator, Iterator
+from types import ModuleType
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+import vertexai
+from vertexai.preview.reasoning_engines import AdkApp
+
+from src.agents import agent as supervisor
+from src.plugins.admission_control import BUSY_MESSAGES
+
+SINHALA_MESSAGE = "මගේ ගෙවීම තවම ලැබී නැහැ"
+
+
+@pytest.fixture(scope="module")
+def engine_app() -> ModuleType:
+    """Import the app module against the agents the other tests use.
+
+    The app imports `agents.agent` through the source directory, as the
+    deployed workers do; a second copy of the agent tree cannot be built.
+    """
+    sys.modules.setdefault("agents.agent", supervisor)
+    return importlib.import_module("src.engine_app")
+
+
+@pytest.fixture
+def vertex_project() -> Iterator[None]:
+    """Initialize Vertex AI and restore the env vars set by `set_up`."""
+    vertexai.init(project="test-project", location="us-central1")
+    with patch.dict(os.environ):
+        yield
+
+
+@pytest.fixture
+def app(engine_app: ModuleType, vertex_project: None) -> Any:
+    """Build the app around the supervisor, without setting it up."""
+    return engine_app.AgentEngineApp(agent=supervisor.root_agent)
+
+
+def _admission(engine_app: ModuleType, rejection: str | None) -> Any:
+    """Replace the app's admission controller with one deciding `rejection`."""
+    controller = Mock()
+    controller.try_admit.return_value = rejection
+    return patch.object(engine_app, "admission_control", controller)
+
+
+def _stream(*events: Any, error: Exception | None = None) -> Mock:
+    """Build a stand-in for a base entry point streaming `events`."""
+
+    def stream(*args: Any, **kwargs: Any) -> Iterator[Any]:
+        yield from events
+        if error is not None:
+            raise error
+
+    return Mock(side_effect=stream)
+
+
+def _async_stream(*events: Any, error: Exception | None = None) -> Mock:
+    """Build a stand-in for an async base entry point streaming `events`."""
+
+    async def stream(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        for event in events:
+            yield event
+        if error is not None:
+            raise error
+
+    return Mock(side_effect=stream)
+
+
+def _collect(stream: AsyncIterator[Any]) -> list[Any]:
+    """Run an async stream to completion."""
+
+    async def collect() -> list[Any]:
+        return [event async for event in stream]
+
+    return asyncio.run(collect())
+
+
+def _text(event: dict[str, Any]) -> str:
+    """Return the text of a JSON event."""
+    return event["content"]["parts"][0]["text"]
+
+
+class TestAgentEngineApp:
+    """Test cases for AgentEngineApp."""
+
+    def test_runner_runs_the_plugins(
+        self, engine_app: ModuleType, vertex_project: None
+    ) -> None:
+        """Test that the plugins reach the Runner, also in copies."""
+        plugins = supervisor.build_plugins()
+        app = engine_app.AgentEngineApp(
+            agent=supervisor.root_agent, plugins=plugins
+        )
+
+        copy = app.clone()
+        for engine in (app, copy):
+            # Only the base set-up builds the Runner; the rest needs GCP
+            AdkApp.set_up(engine)
+            runner = engine._tmpl_attrs["runner"]
+            assert runner.plugin_manager.plugins == plugins
+            # History is bounded by compaction in every deployment
+            assert runner.plugin_manager.get_plugin(
+                "token_budget_compaction_plugin"
+            )
+
+
+class TestAdmissionGate:
+    """Test cases for the admission-controlled entry points."""
+
+    def test_stream_query_busy_reply(
+        self, engine_app: ModuleType, app: Any
+    ) -> None:
+        """Test that a rejected query gets one busy event in its language."""
+        with (
+            _admission(engine_app, "user_rate") as controller,
+            patch.object(AdkApp, "stream_query") as base,
+        ):
+            events = list(
+                app.stream_query(message=SINHALA_MESSAGE, user_id="m-1")
+            )
+
+        assert len(events) == 1
+        assert isinstance(events[0], dict)
+        assert _text(events[0]) == BUSY_MESSAGES["sinhala"]
+        json.dumps(events[0])
+        base.assert_not_called()
+        controller.release.assert_not_called()
+
+    def test_async_stream_query_busy_reply(
+        self, engine_app: ModuleType, app: Any
+    ) -> None:
+        """Test that a rejected async query gets one busy event."""
+        with (
+            _admission(engine_app, "global_rate") as controller,
+            patch.object(AdkApp, "async_stream_query") as base,
+        ):
+            events = _collect(
+                app.async_stream_query(message="hello there", user_id="m-1")
+            )
+
+        assert [_text(event) for event in events] == [BUSY_MESSAGES["english"]]
+        base.assert_not_called()
+        controller.release.assert_not_called()
+
+    def test_streaming_run_busy_reply(
+        self, engine_app: ModuleType, app: Any
+    ) -> None:
+        """Test that a rejected run gets a dumped run response."""
+        request = {
+            "user_id": "m-1",
+            "session_id": "s-1",
+            "message": {"role": "user", "parts": [{"text": SINHALA_MESSAGE}]},
+        }
+        with (
+            _admission(engine_app, "concurrency") as controller,
+            patch.object(AdkApp, "streaming_agent_run_with_events") as base,
+        ):
+            responses = list(
+                app.streaming_agent_run_with_events(json.dumps(request))
+            )
+
+        assert len(responses) == 1
+        response = json.loads(json.dumps(responses[0]))
+        assert response["session_id"] == "s-1"
+        assert _text(response["events"][0]) == BUSY_MESSAGES["sinhala"]
+        base.assert_not_called()
+        controller.release.assert_not_called()
+
+    def test_admitted_runs_are_released(
+        self, engine_app: ModuleType, app: Any
+    ) -> None:
+        """Test that each entry point releases an admitted turn."""
+        request = json.dumps({"user_id": "m-1", "message": {}})
+        with (
+            _admission(engine_app, None) as controller,
+            patch.object(AdkApp, "stream_query", _stream("a", "b")),
+            patch.object(AdkApp, "async_stream_query", _async_stream("c")),
+            patch.object(
+                AdkApp, "streaming_agent_run_with_events", _stream("d")
+            ),
+        ):
+            events = list(app.stream_query(message="hi", user_id="m-1"))
+            events += _collect(
+                app.async_stream_query(message="hi", user_id="m-1")
+            )
+            events += list(app.streaming_agent_run_with_events(request))
+
+        assert events == ["a", "b", "c", "d"]
+        assert controller.release.call_count == 3
+
+    def test_failed_runs_are_released(
+        self, engine_app: ModuleType, app: Any
+    ) -> None:
+        """Test that a turn failing mid-stream still releases its slot."""
+        error = RuntimeError("model unavailable")
+        request = json.dumps({"user_id": "m-1", "message": {}})
+        with (
+            _admission(engine_app, None) as controller,
+            patch.object(AdkApp, "stream_query", _stream("a", error=error)),
+            patch.object(
+                AdkApp, "async_stream_query", _async_stream(error=error)
+            ),
+            patch.object(
+                AdkApp, "streaming_agent_run_with_events", _stream(error=error)
+            ),
+        ):
+            with pytest.raises(RuntimeError):
+                list(app.stream_query(message="hi", user_id="m-1"))
+            with pytest.raises(RuntimeError):
+                _collect(app.async_stream_query(message="hi", user_id="m-1"))
+            with pytest.raises(RuntimeError):
+                list(app.streaming_agent_run_with_events(request))
+
+        assert controller.release.call_count == 3
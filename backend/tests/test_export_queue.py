@@ -0,0 +1,112 @@
+"""Unit tests for the byte-bounded span export queue."""
+
+import threading
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.utils.export_queue import QueueingSpanExporter
+
+
+class _BlockedExporter(SpanExporter):
+    """Exporter that blocks until released, recording exported spans."""
+
+    def __init__(self, result: SpanExportResult = SpanExportResult.SUCCESS):
+        self.release = threading.Event()
+        self.result = result
+        self.exported: list[ReadableSpan] = []
+
+    def export(self, spans):  # type: ignore[no-untyped-def]
+        self.release.wait()
+        self.exported.extend(spans)
+        return self.result
+
+
+def _spans(count: int, error: bool = False) -> list[ReadableSpan]:
+    """Create finished spans with a 1 KB attribute."""
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    tracer = provider.get_tracer("test")
+    for i in range(count):
+        with tracer.start_as_current_span(f"span {i}") as span:
+            span.set_attribute("payload", "x" * 1000)
+            if error:
+                span.set_status(trace.Status(trace.StatusCode.ERROR))
+    return list(memory.get_finished_spans())
+
+
+class TestQueueingSpanExporter:
+    """Test cases for QueueingSpanExporter."""
+
+    def test_spans_are_exported_in_background(self) -> None:
+        """Test that export returns before the backend writes."""
+        backend = _BlockedExporter()
+        exporter = QueueingSpanExporter(backend, schedule_delay_seconds=0.01)
+
+        assert exporter.export(_spans(3)) == SpanExportResult.SUCCESS
+        backend.release.set()
+        assert exporter.force_flush(2000)
+
+        assert len(backend.exported) == 3
+        assert exporter.stats()["exported"] == 3
+        exporter.shutdown()
+
+    def test_errors_evict_ordinary_spans_when_full(self) -> None:
+        """Test that a full queue drops ordinary spans, not errors."""
+        backend = _BlockedExporter()
+        backend.release.set()
+        exporter = QueueingSpanExporter(
+            backend, max_queue_bytes=5000, schedule_delay_seconds=60
+        )
+
+        exporter.export(_spans(4))
+        exporter.export(_spans(2, error=True))
+        stats = exporter.stats()
+        exporter.force_flush(2000)
+
+        assert stats["dropped_queue_full"] == 1
+        assert stats["dropped_evicted_for_error"] == 2
+        assert stats["queued_bytes"] <= 5000
+        assert [s.status.is_ok for s in backend.exported] == [
+            False,
+            False,
+            True,
+        ]
+        exporter.shutdown()
+
+    def test_drops_are_counted_by_reason(self) -> None:
+        """Test failed exports, oversized spans and the shutdown deadline."""
+        backend = _BlockedExporter(result=SpanExportResult.FAILURE)
+        exporter = QueueingSpanExporter(
+            backend,
+            max_queue_bytes=20_000,
+            max_export_batch_size=2,
+            schedule_delay_seconds=0.01,
+            shutdown_timeout_seconds=0.1,
+        )
+
+        exporter.export(_spans(6))
+        backend.release.set()
+        exporter.force_flush(2000)
+        backend.release.clear()
+        exporter.export(_spans(3))
+        exporter.shutdown()
+        backend.release.set()
+
+        stats = exporter.stats()
+        assert stats["dropped_export_failed"] == 6
+        assert stats["dropped_shutdown"] >= 1
+        assert exporter.export(_spans(1)) == SpanExportResult.FAILURE
+
+        small = QueueingSpanExporter(backend, max_queue_bytes=100)
+        assert small.export(_spans(1)) == SpanExportResult.FAILURE
+        assert small.stats()["dropped_oversized"] == 1
@@ -0,0 +1,109 @@
+"""Unit tests for the batched feedback buffer."""
+
+import time
+
+from src.utils.feedback import FeedbackBuffer
+from src.utils.local_clients import LocalLoggingClient
+
+
+def _feedback(score: int) -> dict:
+    """Build a feedback entry."""
+    return {"score": score, "text": "", "invocation_id": f"inv-{score}"}
+
+
+class TestFeedbackBuffer:
+    """Test cases for FeedbackBuffer."""
+
+    def test_entries_written_in_one_batch(self) -> None:
+        """Test that queued feedback is written with one API request."""
+        client = LocalLoggingClient()
+        buffer = FeedbackBuffer(
+            client.logger("feedback"), flush_interval_seconds=60
+        )
+
+        for score in range(5):
+            assert buffer.submit(_feedback(score))
+        assert buffer.flush(timeout=5)
+
+        assert client.api_calls == 1
+        assert [e["jsonPayload"]["score"] for e in client.entries] == [
+            0, 1, 2, 3, 4
+        ]
+        assert client.entries[0]["severity"] == "INFO"
+        assert buffer.stats()["written"] == 5
+        buffer.close()
+
+    def test_batch_size_limit(self) -> None:
+        """Test that a full batch is written without waiting."""
+        client = LocalLoggingClient()
+        buffer = FeedbackBuffer(
+            client.logger("feedback"),
+            max_batch_size=2,
+            flush_interval_seconds=60,
+        )
+
+        for score in range(4):
+            buffer.submit(_feedback(score))
+        deadline = time.monotonic() + 5
+        while buffer.stats()["written"] < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert buffer.stats()["written"] == 4
+        assert buffer.stats()["batches"] == 2
+        buffer.close()
+
+    def test_interval_flush(self) -> None:
+        """Test that a partial batch is written after the flush interval."""
+        client = LocalLoggingClient()
+        buffer = FeedbackBuffer(
+            client.logger("feedback"), flush_interval_seconds=0.1
+        )
+
+        buffer.submit(_feedback(1))
+        deadline = time.monotonic() + 5
+        while not client.entries and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(client.entries) == 1
+        buffer.close()
+
+    def test_submit_does_not_wait_for_writes(self) -> None:
+        """Test that a slow backend does not block submit."""
+        client = LocalLoggingClient(latency=0.5)
+        buffer = FeedbackBuffer(client.logger("feedback"), max_batch_size=1)
+
+        start = time.perf_counter()
+        for score in range(3):
+            buffer.submit(_feedback(score))
+
+        assert time.perf_counter() - start < 0.1
+        buffer.close()
+
+    def test_full_queue_drops_feedback(self) -> None:
+        """Test that feedback beyond the queue limit is dropped and counted."""
+        client = LocalLoggingClient(latency=0.5)
+        buffer = FeedbackBuffer(
+            client.logger("feedback"), max_batch_size=1, max_queue_size=2
+        )
+
+        results = [buffer.submit(_feedback(score)) for score in range(6)]
+
+        assert not all(results)
+        stats = buffer.stats()
+        assert stats["dropped_queue_full"] == results.count(False)
+        assert stats["submitted"] == results.count(True)
+        buffer.close()
+
+    def test_write_failure_counted(self) -> None:
+        """Test that feedback lost to a failed write is counted."""
+        client = LocalLoggingClient(fail=True)
+        buffer = FeedbackBuffer(client.logger("feedback"))
+
+        buffer.submit(_feedback(1))
+        buffer.submit(_feedback(2))
+        assert buffer.flush(timeout=5)
+
+        stats = buffer.stats()
+        assert stats["dropped_write_failed"] == 2
+        assert stats["written"] == 0
+        buffer.close()
@@ -0,0 +1,71 @@
+"""Unit tests for the local JSONL span exporter."""
+
+from pathlib import Path
+from typing import Callable
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from src.utils.jsonl_exporter import RotatingJsonlSpanExporter, read_spans
+
+SpanFactory = Callable[..., list[ReadableSpan]]
+
+
+class TestRotatingJsonlSpanExporter:
+    """Test cases for RotatingJsonlSpanExporter."""
+
+    def test_spans_are_written_as_jsonl(
+        self, tmp_path: Path, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that exported spans can be read back from disk."""
+        exporter = RotatingJsonlSpanExporter(
+            directory=tmp_path, flush_interval_seconds=60
+        )
+        spans = make_turn_spans(turns=2, spans_per_turn=3, prompt_chars=10)
+
+        assert exporter.export(spans) == SpanExportResult.SUCCESS
+        assert exporter.force_flush()
+
+        written = read_spans(exporter.current_path)
+        assert [s["name"] for s in written] == [s.name for s in spans]
+        assert written[0]["attributes"]["gen_ai.request.model"] == (
+            "gemini-2.5-flash"
+        )
+        exporter.shutdown()
+
+    def test_files_rotate_by_size_and_are_gzipped(
+        self, tmp_path: Path, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that full files are rotated and compressed."""
+        exporter = RotatingJsonlSpanExporter(
+            directory=tmp_path,
+            max_bytes=4096,
+            compress=True,
+            flush_interval_seconds=0.01,
+        )
+        for _ in range(5):
+            exporter.export(
+                make_turn_spans(turns=1, spans_per_turn=4, prompt_chars=1000)
+            )
+            exporter.force_flush()
+        exporter.shutdown()
+
+        files = sorted(tmp_path.iterdir())
+        assert len(files) == 5
+        assert all(f.name.endswith(".jsonl.gz") for f in files)
+        assert sum(len(read_spans(f)) for f in files) == 20
+
+    def test_full_queue_drops_spans(
+        self, tmp_path: Path, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that spans beyond the queue limit are dropped and counted."""
+        exporter = RotatingJsonlSpanExporter(
+            directory=tmp_path, flush_interval_seconds=60, max_queued_lines=5
+        )
+        spans = make_turn_spans(turns=1, spans_per_turn=8, prompt_chars=10)
+
+        assert exporter.export(spans) == SpanExportResult.FAILURE
+        exporter.shutdown()
+
+        assert exporter.dropped_spans == 3
+        assert len(read_spans(next(tmp_path.iterdir()))) == 5
@@ -0,0 +1,126 @@
+"""Unit tests for the in-process metrics registry."""
+
+import inspect
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from google.adk.tools.function_tool import FunctionTool
+
+from src.utils import metrics
+from src.utils.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    MetricsRegistry,
+    agent_finished,
+    agent_started,
+    serve_metrics,
+    timed_tool,
+)
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry rendering."""
+
+    def test_histogram_renders_cumulative_buckets(self) -> None:
+        """Test that buckets, count and sum follow the OpenMetrics format."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency.", ["tool"], buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.labels("rag").observe(value)
+        registry.counter("calls", "Calls.", ["tool"]).labels("rag").inc(4)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{tool="rag",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{tool="rag",le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{tool="rag",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{tool="rag"} 4' in text
+        assert 'latency_seconds_sum{tool="rag"} 4.25' in text
+        assert 'calls_total{tool="rag"} 4' in text
+        assert text.endswith("# EOF\n")
+
+
+class TestTimedTool:
+    """Test cases for the timed_tool decorator."""
+
+    def test_records_calls_and_errors(self) -> None:
+        """Test that error results and exceptions count as errors."""
+
+        def lookup_ticket(ticket_key: str) -> dict:
+            """Look up a ticket."""
+            if ticket_key == "boom":
+                raise RuntimeError("boom")
+            return {"error": "not found", "status_code": 404}
+
+        tool = timed_tool(lookup_ticket)
+        tool("GEN-1")
+        with pytest.raises(RuntimeError):
+            tool("boom")
+
+        assert metrics.TOOL_CALLS.labels("lookup_ticket").value == 2
+        assert metrics.TOOL_ERRORS.labels("lookup_ticket").value == 2
+        assert metrics.TOOL_IN_FLIGHT.labels("lookup_ticket").value == 0
+        assert sum(metrics.TOOL_LATENCY.labels("lookup_ticket").counts) == 2
+
+    def test_keeps_tool_declaration(self) -> None:
+        """Test that ADK builds the same declaration for the wrapped tool."""
+
+        def get_ticket(ticket_key: str, user_id: str = "") -> dict:
+            """Get a ticket by key."""
+            return {}
+
+        wrapped = timed_tool(get_ticket)
+
+        assert inspect.signature(wrapped) == inspect.signature(get_ticket)
+        assert (
+            FunctionTool(wrapped)._get_declaration()
+            == FunctionTool(get_ticket)._get_declaration()
+        )
+
+
+class TestAgentTimingAndServer:
+    """Test cases for agent timing and the metrics endpoint."""
+
+    def test_agent_turn_is_recorded_and_served(self) -> None:
+        """Test that agent latency is exposed over HTTP."""
+        context = SimpleNamespace(invocation_id="inv-1", agent_name="kb_test")
+        agent_started(context)
+        assert metrics.AGENT_IN_FLIGHT.labels("kb_test").value == 1
+        agent_finished(context)
+        agent_finished(context)
+
+        server = serve_metrics(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+
+        assert content_type == OPENMETRICS_CONTENT_TYPE
+        assert 'agent_in_flight{agent="kb_test"} 0' in body
+        assert 'agent_latency_seconds_count{agent="kb_test"} 1' in body
+
+    def test_concurrent_agent_turns(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that turns timed from many threads leave nothing in flight."""
+        monkeypatch.setattr(metrics, "MAX_TRACKED_AGENT_TURNS", 50)
+
+        def run_turns(thread: int) -> None:
+            for turn in range(200):
+                context = SimpleNamespace(
+                    invocation_id=f"inv-{thread}-{turn}",
+                    agent_name="concurrent_test",
+                )
+                agent_started(context)
+                agent_finished(context)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(run_turns, range(8)))
+
+        assert metrics.AGENT_IN_FLIGHT.labels("concurrent_test").value == 0
@@ -0,0 +1,67 @@
+"""Unit tests for the lazy observability setup."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.tools.config import load_config
+from src.utils import observability
+
+
+@pytest.fixture(autouse=True)
+def fresh_setup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reset the module's once-per-process state."""
+    monkeypatch.setattr(observability, "_configured", False)
+    monkeypatch.setattr(observability, "_auth_status", "not_started")
+
+
+class TestSetupObservability:
+    """Test cases for setup_observability."""
+
+    @patch("openinference.instrumentation.google_adk.GoogleADKInstrumentor")
+    def test_disabled_by_config(
+        self, instrumentor: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the setup can be skipped entirely."""
+        config = load_config({"OBSERVABILITY_ENABLED": "false"})
+
+        assert observability.setup_observability(config) is False
+        instrumentor.assert_not_called()
+
+    @patch("openinference.instrumentation.google_adk.GoogleADKInstrumentor")
+    @patch("langfuse.get_client")
+    def test_auth_check_does_not_block(
+        self,
+        get_client: MagicMock,
+        instrumentor: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a hanging auth check times out in the background."""
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+        get_client.return_value.auth_check.side_effect = lambda: time.sleep(1)
+        config = load_config({"LANGFUSE_AUTH_CHECK_TIMEOUT": "0.05"})
+
+        started = time.monotonic()
+        assert observability.setup_observability(config, local_exporters=False)
+        assert time.monotonic() - started < 0.5
+        assert observability.langfuse_auth_status() == "pending"
+
+        # Idempotent: later calls do nothing
+        assert observability.setup_observability(config) is False
+        instrumentor.return_value.instrument.assert_called_once()
+
+        time.sleep(0.2)
+        assert observability.langfuse_auth_status() == "timeout"
+
+    @patch("openinference.instrumentation.google_adk.GoogleADKInstrumentor")
+    def test_langfuse_skipped_without_credentials(
+        self, instrumentor: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that Langfuse is not contacted without credentials."""
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+
+        assert observability.setup_observability(
+            load_config({}), local_exporters=False
+        )
+        assert observability.langfuse_auth_status() == "skipped"
@@ -0,0 +1,115 @@
+"""Unit tests for the RAG engine tool."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.tools import rag_engine
+from src.tools.config import get_config
+
+
+class TestRagEngine:
+    """Test cases for query_knowledge_base and its setup."""
+
+    def test_initializes_vertexai_once_per_target(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that concurrent queries initialize Vertex AI only once."""
+        monkeypatch.setattr(rag_engine, "_initialized_for", None)
+
+        with patch("vertexai.init") as init:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(
+                    pool.map(
+                        lambda _: rag_engine._init_vertexai("proj", "eu"),
+                        range(32),
+                    )
+                )
+            rag_engine._init_vertexai("proj", "us")
+
+        assert init.call_count == 2
+
+    def test_not_configured(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a missing corpus is reported without a query."""
+        monkeypatch.setenv("CORPUS_ID", "")
+
+        result = rag_engine.query_knowledge_base("opening hours")
+
+        assert result["status"] == "error"
+        assert result["message"] == "Knowledge base not configured"
+
+    def test_results_are_cached(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that repeated questions are answered from the cache."""
+        monkeypatch.setenv("PROJECT", "proj")
+        monkeypatch.setenv("CORPUS_ID", "corpus")
+        get_config.cache_clear()
+        rag_engine._results.clear()
+
+        with patch.object(
+            rag_engine, "_query_corpus", return_value="Found 1 result"
+        ) as query_corpus:
+            first = rag_engine.query_knowledge_base("Opening hours?")
+            second = rag_engine.query_knowledge_base("  opening   HOURS? ")
+
+        assert first == second == "Found 1 result"
+        assert query_corpus.call_count == 1
+
+    def test_errors_are_not_cached(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that failed queries are retried on the next call."""
+        monkeypatch.setenv("PROJECT", "proj")
+        monkeypatch.setenv("CORPUS_ID", "corpus")
+        get_config.cache_clear()
+        rag_engine._results.clear()
+        error = {"status": "error", "message": "timeout", "query": "q"}
+
+        with patch.object(
+            rag_engine, "_query_corpus", return_value=error
+        ) as query_corpus:
+            rag_engine.query_knowledge_base("q")
+            rag_engine.query_knowledge_base("q")
+
+        assert query_corpus.call_count == 2
+
+    def test_cache_entries_expire(self) -> None:
+        """Test that entries older than the TTL are not returned."""
+        cache = rag_engine._ResultCache()
+        cache.put("q", "answer", max_entries=2)
+
+        assert cache.get("q", ttl_seconds=60) == "answer"
+        assert cache.get("q", ttl_seconds=0) is None
+        cache.put("a", "1", max_entries=2)
+        cache.put("b", "2", max_entries=2)
+        cache.put("c", "3", max_entries=2)
+        assert cache.get("a", ttl_seconds=60) is None
+
+    def test_busy_pool_rejects_instead_of_queueing(self) -> None:
+        """Test that a query is rejected while every worker is busy."""
+        pool = rag_engine._QueryPool(max_workers=1)
+        release = threading.Event()
+
+        running = pool.submit(release.wait)
+        rejected = pool.submit(lambda: "answer")
+        release.set()
+        running.result(timeout=5)
+        accepted = pool.submit(lambda: "answer")
+
+        assert rejected is None
+        assert accepted.result(timeout=5) == "answer"
+
+    def test_saturated_query_reports_busy(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the tool answers at once when the pool is full."""
+        monkeypatch.setattr(rag_engine, "_query_pool", Mock())
+        rag_engine._query_pool.submit.return_value = None
+
+        with patch("src.tools.rag_engine._init_vertexai"):
+            result = rag_engine._query_corpus("fees", get_config())
+
+        assert result["message"] == "Knowledge base busy"
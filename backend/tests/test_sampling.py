@@ -0,0 +1,84 @@
+"""Unit tests for tail-based trace sampling."""
+
+import json
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.utils.sampling import TailSamplingSpanProcessor
+
+
+def _setup(**kwargs: float) -> tuple[
+    trace.Tracer, InMemorySpanExporter, TailSamplingSpanProcessor
+]:
+    """Build a tracer whose spans go through a tail sampler."""
+    memory = InMemorySpanExporter()
+    sampler = TailSamplingSpanProcessor(SimpleSpanProcessor(memory), **kwargs)
+    provider = TracerProvider()
+    provider.add_span_processor(sampler)
+    return provider.get_tracer("test"), memory, sampler
+
+
+class TestTailSamplingSpanProcessor:
+    """Test cases for TailSamplingSpanProcessor."""
+
+    def test_errors_are_kept_and_fast_traces_dropped(self) -> None:
+        """Test that error traces are exported and successful ones are not."""
+        tracer, memory, sampler = _setup(random_fn=lambda: 0.99)
+
+        with tracer.start_as_current_span("invocation"):
+            with tracer.start_as_current_span("execute_tool") as span:
+                span.set_attribute(
+                    "gcp.vertex.agent.tool_response",
+                    json.dumps({"error": "Network", "status_code": 500}),
+                )
+        with tracer.start_as_current_span("invocation"):
+            with tracer.start_as_current_span("execute_tool") as span:
+                span.set_attribute(
+                    "gcp.vertex.agent.tool_response",
+                    json.dumps({"status_code": 200, "ticket": {}}),
+                )
+
+        spans = memory.get_finished_spans()
+        assert [s.name for s in spans] == ["execute_tool", "invocation"]
+        stats = sampler.stats()
+        assert stats["kept_error"] == 1
+        assert stats["dropped"] == 1
+        assert stats["buffered_spans"] == 0
+
+    def test_slow_and_sampled_traces_are_kept(self) -> None:
+        """Test that slow traces and sampled traces are exported."""
+        tracer, memory, sampler = _setup(
+            slow_threshold_seconds=0, random_fn=lambda: 0.0
+        )
+        with tracer.start_as_current_span("invocation"):
+            pass
+        assert sampler.stats()["kept_slow"] == 1
+
+        tracer, memory, sampler = _setup(random_fn=lambda: 0.05)
+        with tracer.start_as_current_span("invocation"):
+            pass
+        assert sampler.stats()["kept_sampled"] == 1
+        assert len(memory.get_finished_spans()) == 1
+
+    def test_buffer_is_bounded(self) -> None:
+        """Test that unfinished traces are evicted beyond the size limit."""
+        tracer, memory, sampler = _setup(max_buffered_bytes=5000)
+
+        roots = [tracer.start_span(f"invocation {i}") for i in range(3)]
+        for root in roots:
+            context = trace.set_span_in_context(root)
+            for _ in range(3):
+                span = tracer.start_span("call_llm", context=context)
+                span.set_attribute("gcp.vertex.agent.llm_request", "p" * 1000)
+                span.end()
+
+        stats = sampler.stats()
+        assert stats["buffered_spans"] == 3
+        assert stats["buffered_bytes"] <= 5000
+        assert stats["evicted_dropped"] == 2
+        assert memory.get_finished_spans() == ()
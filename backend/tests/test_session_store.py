@@ -0,0 +1,185 @@
+"""Unit tests for the bounded session service."""
+
+import asyncio
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types
+
+from src.utils.session_store import BoundedSessionService
+
+APP = "agents"
+
+
+def _event(author: str, text: str = "hello", **state) -> Event:
+    """Create an event with text content and an optional state delta."""
+    return Event(
+        invocation_id="inv",
+        author=author,
+        content=types.Content(
+            role="user" if author == "user" else "model",
+            parts=[types.Part(text=text)],
+        ),
+        actions=EventActions(state_delta=state),
+    )
+
+
+def _run(coro):
+    """Run a coroutine to completion."""
+    return asyncio.run(coro)
+
+
+class TestBoundedSessionService:
+    """Test cases for BoundedSessionService."""
+
+    def test_keeps_whole_turns_within_event_cap(self) -> None:
+        """Test that the oldest turns are dropped beyond the event cap."""
+
+        async def run():
+            service = BoundedSessionService(max_events_per_session=4)
+            session = await service.create_session(app_name=APP, user_id="u")
+            for turn in range(3):
+                await service.append_event(session, _event("user", f"q{turn}"))
+                await service.append_event(session, _event("agent"))
+                await service.append_event(session, _event("agent"))
+            stored = await service.get_session(
+                app_name=APP, user_id="u", session_id=session.id
+            )
+            return stored, service.stats()
+
+        stored, stats = _run(run())
+        assert [e.content.parts[0].text for e in stored.events] == [
+            "q2",
+            "hello",
+            "hello",
+        ]
+        assert stats["trimmed_events"] == 6
+        assert stats["events"] == 3
+
+    def test_evicts_least_recently_used_over_memory_limit(self) -> None:
+        """Test that LRU sessions are dropped when over max_bytes."""
+
+        async def run():
+            service = BoundedSessionService(max_bytes=5000)
+            sessions = []
+            for user in ("a", "b", "c"):
+                session = await service.create_session(
+                    app_name=APP, user_id=user
+                )
+                await service.append_event(session, _event("user", "x" * 500))
+                await service.append_event(session, _event("agent", "ok"))
+                sessions.append(session)
+            # "a" is used again, so "b" is the least recently used
+            await service.get_session(
+                app_name=APP, user_id="a", session_id=sessions[0].id
+            )
+            for _ in range(3):
+                await service.append_event(
+                    sessions[2], _event("agent", "y" * 500)
+                )
+            found = [
+                await service.get_session(
+                    app_name=APP, user_id=s.user_id, session_id=s.id
+                )
+                is not None
+                for s in sessions
+            ]
+            return found, service.stats()
+
+        found, stats = _run(run())
+        assert found == [True, False, True]
+        assert stats["evicted_memory"] == 1
+        assert stats["estimated_bytes"] <= 5000
+
+    def test_session_with_turn_in_flight_is_not_evicted(self) -> None:
+        """Test that memory eviction skips a session mid-turn."""
+
+        async def run():
+            service = BoundedSessionService(max_bytes=3000)
+            waiting = await service.create_session(app_name=APP, user_id="a")
+            await service.append_event(waiting, _event("user", "x" * 500))
+            done = await service.create_session(app_name=APP, user_id="b")
+            await service.append_event(done, _event("user", "x" * 500))
+            await service.append_event(done, _event("agent", "y" * 500))
+            active = await service.create_session(app_name=APP, user_id="c")
+            await service.append_event(active, _event("user", "z" * 1500))
+            # The model answers the first customer after the others
+            await service.append_event(waiting, _event("agent", "answer"))
+            stored = await service.get_session(
+                app_name=APP, user_id="a", session_id=waiting.id
+            )
+            return stored, service.stats()
+
+        stored, stats = _run(run())
+        assert stored.events[-1].content.parts[0].text == "answer"
+        assert stats["evicted_memory"] >= 1
+        assert stats["in_flight"] == 1
+
+    def test_spills_idle_sessions_and_restores_them(self, tmp_path) -> None:
+        """Test that idle sessions are written to SQLite and reloaded."""
+
+        async def run():
+            service = BoundedSessionService(
+                idle_seconds=0, spill_path=str(tmp_path / "sessions.db")
+            )
+            first = await service.create_session(app_name=APP, user_id="a")
+            await service.append_event(
+                first, _event("agent", "answer", language="sinhala")
+            )
+            # Any access to another session evicts the idle one
+            await service.create_session(app_name=APP, user_id="b")
+            spilled = service.stats()
+            listed = await service.list_sessions(app_name=APP, user_id="a")
+            restored = await service.get_session(
+                app_name=APP, user_id="a", session_id=first.id
+            )
+            return spilled, listed, restored, service.stats()
+
+        spilled, listed, restored, stats = _run(run())
+        assert spilled["spilled_sessions"] == 1
+        assert spilled["sessions"] == 1
+        assert listed.sessions[0].state == {"language": "sinhala"}
+        assert restored.state["language"] == "sinhala"
+        assert restored.events[0].content.parts[0].text == "answer"
+        assert stats["restored"] == 1
+
+    def test_delete_removes_spilled_session(self, tmp_path) -> None:
+        """Test that deleting a spilled session removes it from SQLite."""
+
+        async def run():
+            service = BoundedSessionService(
+                idle_seconds=0, spill_path=str(tmp_path / "sessions.db")
+            )
+            first = await service.create_session(app_name=APP, user_id="a")
+            await service.create_session(app_name=APP, user_id="b")
+            await service.delete_session(
+                app_name=APP, user_id="a", session_id=first.id
+            )
+            found = await service.get_session(
+                app_name=APP, user_id="a", session_id=first.id
+            )
+            return found, service.stats()
+
+        found, stats = _run(run())
+        assert found is None
+        assert stats["spilled_sessions"] == 0
+
+    def test_interns_state_values(self) -> None:
+        """Test that short state values are shared between sessions."""
+
+        async def run():
+            service = BoundedSessionService()
+            states = []
+            for user in ("a", "b"):
+                session = await service.create_session(
+                    app_name=APP, user_id=user
+                )
+                await service.append_event(
+                    session,
+                    _event("agent", language="".join(["tam", "il"])),
+                )
+                states.append(service.sessions[APP][user][session.id].state)
+            return states
+
+        first, second = _run(run())
+        assert first["language"] is second["language"]
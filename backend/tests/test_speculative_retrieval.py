@@ -0,0 +1,139 @@
+"""Unit tests for speculative knowledge-base retrieval."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from google.genai import types
+
+from src.plugins.speculative_retrieval import SpeculativeRetrievalPlugin
+
+
+def _invocation(message: str, invocation_id: str = "inv-1") -> SimpleNamespace:
+    """Build a minimal invocation context for a user message."""
+    return SimpleNamespace(
+        invocation_id=invocation_id,
+        user_content=types.Content(
+            role="user", parts=[types.Part(text=message)]
+        ),
+    )
+
+
+class TestSpeculativeRetrievalPlugin:
+    """Test cases for SpeculativeRetrievalPlugin."""
+
+    def test_knowledge_base_agent_reuses_result(self) -> None:
+        """Test that the first retrieval of the turn is served speculatively."""
+        calls = []
+        plugin = SpeculativeRetrievalPlugin(
+            retrieve=lambda query: calls.append(query) or "Found 1 result"
+        )
+        tool = SimpleNamespace(name="query_knowledge_base")
+        tool_context = SimpleNamespace(
+            invocation_id="inv-1", agent_name="knowledge_base_agent"
+        )
+
+        async def run() -> object:
+            await plugin.before_run_callback(
+                invocation_context=_invocation("what are your pricing plans")
+            )
+            return await plugin.before_tool_callback(
+                tool=tool,
+                tool_args={"query": "What are your  pricing plans"},
+                tool_context=tool_context,
+            )
+
+        result = asyncio.run(run())
+
+        assert result == "Found 1 result"
+        assert calls == ["what are your pricing plans"]
+        assert plugin.stats()["reused"] == 1
+
+    def test_different_query_is_not_served(self) -> None:
+        """Test that a rephrased query runs the tool instead."""
+        release = threading.Event()
+        plugin = SpeculativeRetrievalPlugin(
+            retrieve=lambda query: release.wait(5) and "unused"
+        )
+        tool = SimpleNamespace(name="query_knowledge_base")
+        tool_context = SimpleNamespace(
+            invocation_id="inv-1", agent_name="knowledge_base_agent"
+        )
+
+        async def run() -> object:
+            await plugin.before_run_callback(
+                invocation_context=_invocation("what are your pricing plans")
+            )
+            return await plugin.before_tool_callback(
+                tool=tool,
+                tool_args={"query": "Genie Business pricing"},
+                tool_context=tool_context,
+            )
+
+        result = asyncio.run(run())
+        release.set()
+        plugin._executor.shutdown(wait=True)
+
+        stats = plugin.stats()
+        assert result is None
+        assert stats["reused"] == 0
+        assert stats["cancelled"] + stats["discarded"] == 1
+
+    def test_close_stops_retrievals(self) -> None:
+        """Test that closing cancels pending retrievals and the threads."""
+        release = threading.Event()
+        plugin = SpeculativeRetrievalPlugin(
+            retrieve=lambda query: release.wait(5) and "unused", max_workers=1
+        )
+
+        async def run() -> None:
+            for i in range(2):
+                await plugin.before_run_callback(
+                    invocation_context=_invocation(
+                        "fees for card payments", invocation_id=f"inv-{i}"
+                    )
+                )
+
+        asyncio.run(run())
+        plugin.close()
+        release.set()
+
+        assert plugin.stats()["cancelled"] == 1
+        assert plugin._pending == {}
+        assert plugin._executor._shutdown
+
+    def test_other_route_discards_speculation(self) -> None:
+        """Test that routing to another agent discards the retrieval."""
+        release = threading.Event()
+        plugin = SpeculativeRetrievalPlugin(
+            retrieve=lambda query: release.wait(5) and "unused"
+        )
+        agent = SimpleNamespace(
+            name="complaint_flow_agent", parent_agent=object()
+        )
+        callback_context = SimpleNamespace(invocation_id="inv-1")
+
+        async def run() -> None:
+            await plugin.before_run_callback(
+                invocation_context=_invocation("my settlement did not arrive")
+            )
+            await plugin.before_agent_callback(
+                agent=agent, callback_context=callback_context
+            )
+
+        asyncio.run(run())
+        release.set()
+        plugin._executor.shutdown(wait=True)
+
+        stats = plugin.stats()
+        assert stats["started"] == 1
+        assert stats["reused"] == 0
+        assert stats["cancelled"] + stats["discarded"] == 1
+
+    def test_short_messages_are_skipped(self) -> None:
+        """Test that greetings do not start a retrieval."""
+        plugin = SpeculativeRetrievalPlugin(retrieve=lambda query: "unused")
+
+        asyncio.run(plugin.before_run_callback(invocation_context=_invocation("hi")))
+
+        assert plugin.stats()["started"] == 0
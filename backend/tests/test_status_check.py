@@ -1,14 +1,39 @@
 """Unit tests for StatusCheck Agent."""
 
+from unittest.mock import Mock, patch
+
 import pytest
 
+from src.tools.status_fast_path import (
+    answer_status_request,
+    detect_language,
+    extract_ticket_key,
+    is_status_request,
+    render_status_reply,
+)
+
+TICKET = {
+    "ticket_id": "GEN-23",
+    "summary": "Settlement not received",
+    "status": "In Progress",
+    "resolution": None,
+}
+
 
 class TestStatusCheckAgent:
     """Test cases for StatusCheck Agent."""
 
     def test_ticket_id_extraction(self):
         """Test ticket ID extraction from message."""
-        pass
+        assert extract_ticket_key("status of GEN-23") == "GEN-23"
+        assert extract_ticket_key("gen 23 status?") == "GEN-23"
+        assert extract_ticket_key("what about ticket 23") == "GEN-23"
+        assert extract_ticket_key("GEN-23 and GEN-24") is None
+
+    def test_outbox_reference_extraction(self):
+        """Test that queued complaint references are extracted as-is."""
+        assert extract_ticket_key("status of ref-4f9a2c") == "REF-4F9A2C"
+        assert extract_ticket_key("GEN-23 or REF-4F9A2C?") is None
 
     def test_hubspot_api_call(self):
         """Test HubSpot API invocation."""
@@ -16,19 +41,35 @@ class TestStatusCheckAgent:
 
     def test_status_formatting_english(self):
         """Test status formatting in English."""
-        pass
+        reply = render_status_reply(TICKET, "english")
+
+        assert "GEN-23" in reply
+        assert "In Progress" in reply
 
     def test_status_formatting_sinhala(self):
         """Test status formatting in Sinhala."""
-        pass
+        reply = render_status_reply(
+            {**TICKET, "status": "Done", "resolution": "Fixed"}, "sinhala"
+        )
+
+        assert "GEN-23" in reply
+        assert "සම්පූර්ණ කළ" in reply
+        assert "Fixed" in reply
 
     def test_status_formatting_tamil(self):
         """Test status formatting in Tamil."""
-        pass
+        reply = render_status_reply(TICKET, "tamil")
+
+        assert "GEN-23" in reply
+        assert "செயல்பாட்டில் உள்ள" in reply
 
     def test_missing_ticket_id_handling(self):
         """Test handling when ticket ID is missing."""
-        pass
+        assert extract_ticket_key("what is the status of my complaint") is None
+        assert (
+            answer_status_request("status of my complaint", "user123", "english")
+            is None
+        )
 
     def test_output_schema_validation(self):
         """Test StatusOutput schema validation."""
@@ -37,3 +78,73 @@ class TestStatusCheckAgent:
     def test_state_management_via_output_key(self):
         """Test state updates via output_key."""
         pass
+
+
+class TestStatusFastPath:
+    """Test cases for the deterministic status fast path."""
+
+    def test_language_detection(self) -> None:
+        """Test reply language detection from script and romanization."""
+        assert detect_language("GEN-23 තත්ත්වය") == "sinhala"
+        assert detect_language("GEN-23 நிலை என்ன") == "tamil"
+        assert detect_language("GEN-23 status eka mokakda") == "sinhala"
+        assert detect_language("status of GEN-23", "tamil") == "tamil"
+
+    @patch("src.tools.status_fast_path.get_ticket_by_key")
+    def test_answers_plain_status_question(self, mock_get: Mock) -> None:
+        """Test that a plain status question is answered from the tool."""
+        mock_get.return_value = {"status_code": 200, "ticket": TICKET}
+
+        reply = answer_status_request("status of GEN-23", "user123", "english")
+
+        mock_get.assert_called_once_with("user123", "GEN-23")
+        assert "In Progress" in reply
+
+    @patch("src.tools.status_fast_path.get_ticket_by_key")
+    def test_answers_queued_complaint(self, mock_get: Mock) -> None:
+        """Test that a reference alone is answered, with a queued status."""
+        mock_get.return_value = {
+            "status_code": 200,
+            "ticket": {**TICKET, "ticket_id": "REF-4F9A2C", "status": "Queued"},
+        }
+
+        reply = answer_status_request("REF-4F9A2C", "user123", "tamil")
+
+        mock_get.assert_called_once_with("user123", "REF-4F9A2C")
+        assert "REF-4F9A2C" in reply
+        assert "வரிசையில்" in reply
+
+    @patch("src.tools.status_fast_path.get_ticket_by_key")
+    def test_falls_through_on_lookup_error(self, mock_get: Mock) -> None:
+        """Test that lookup failures are left to the agent."""
+        mock_get.return_value = {"error": "not found", "status_code": 404}
+
+        assert (
+            answer_status_request("status of GEN-99", "user123", "english")
+            is None
+        )
+
+    @patch("src.tools.status_fast_path.get_ticket_by_key")
+    def test_falls_through_on_long_message(self, mock_get: Mock) -> None:
+        """Test that messages asking for more than the status are skipped."""
+        message = (
+            "GEN-23 status is still open after two weeks, please escalate "
+            "this and tell me why the settlement is delayed"
+        )
+
+        assert answer_status_request(message, "user123", "english") is None
+        mock_get.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "message, expected",
+        [
+            ("any update on GEN-23?", True),
+            ("latest update for GEN-23", True),
+            ("please update GEN-23 with my new account number", False),
+        ],
+    )
+    def test_update_must_be_asked_for(
+        self, message: str, expected: bool
+    ) -> None:
+        """Test that asking to update a ticket is not a status question."""
+        assert is_status_request(message) is expected
@@ -1,18 +1,18 @@
 """Unit tests for Jira ticket operations."""
 
-import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
+
 from src.tools.ticket import (
     create_jira_ticket,
-    get_user_tickets,
     get_ticket_by_key,
+    get_user_tickets,
 )
 
 
 class TestCreateJiraTicket:
     """Test cases for create_jira_ticket function."""
 
-    @patch("src.tools.ticket.requests.post")
+    @patch("src.tools.ticket.requests.Session.post")
     def test_create_ticket_success(self, mock_post: Mock) -> None:
         """Test successful ticket creation."""
         mock_response = Mock()
@@ -32,7 +32,7 @@ class TestCreateJiraTicket:
         assert result["key"] == "GEN-23"
         assert "error" not in result
 
-    @patch("src.tools.ticket.requests.post")
+    @patch("src.tools.ticket.requests.Session.post")
     def test_create_ticket_failure(self, mock_post: Mock) -> None:
         """Test ticket creation failure."""
         mock_response = Mock()
@@ -46,7 +46,7 @@ class TestCreateJiraTicket:
         assert result["status_code"] == 400
         assert result["error"] == "Failed to create ticket"
 
-    @patch("src.tools.ticket.requests.post")
+    @patch("src.tools.ticket.requests.Session.post")
     def test_create_ticket_network_error(self, mock_post: Mock) -> None:
         """Test network error during ticket creation."""
         mock_post.side_effect = Exception("Network error")
@@ -62,7 +62,7 @@ class TestCreateJiraTicket:
 class TestGetUserTickets:
     """Test cases for get_user_tickets function."""
 
-    @patch("src.tools.ticket.requests.get")
+    @patch("src.tools.ticket.requests.Session.get")
     def test_get_tickets_success(self, mock_get: Mock) -> None:
         """Test successful retrieval of user tickets."""
         mock_response = Mock()
@@ -86,7 +86,7 @@ class TestGetUserTickets:
         assert len(result["tickets"]) == 1
         assert result["tickets"][0]["ticket_id"] == "GEN-23"
 
-    @patch("src.tools.ticket.requests.get")
+    @patch("src.tools.ticket.requests.Session.get")
     def test_get_tickets_failure(self, mock_get: Mock) -> None:
         """Test failure retrieving user tickets."""
         mock_response = Mock()
@@ -102,7 +102,7 @@ class TestGetUserTickets:
 class TestGetTicketByKey:
     """Test cases for get_ticket_by_key function."""
 
-    @patch("src.tools.ticket.requests.get")
+    @patch("src.tools.ticket.requests.Session.get")
     def test_get_ticket_success(self, mock_get: Mock) -> None:
         """Test successful retrieval of ticket by key."""
         mock_response = Mock()
@@ -137,7 +137,7 @@ class TestGetTicketByKey:
         assert result["ticket"]["ticket_id"] == "GEN-23"
         assert result["ticket"]["summary"] == "Test ticket"
 
-    @patch("src.tools.ticket.requests.get")
+    @patch("src.tools.ticket.requests.Session.get")
     def test_get_ticket_not_found(self, mock_get: Mock) -> None:
         """Test ticket not found."""
         mock_response = Mock()
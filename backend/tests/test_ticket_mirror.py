@@ -0,0 +1,334 @@
+"""Unit tests for the ticket mirror."""
+
+import hashlib
+import hmac
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.tools import ticket
+from src.tools.ticket import (
+    create_jira_ticket,
+    get_ticket_by_key,
+    get_user_tickets,
+)
+from src.tools.ticket_mirror import TicketMirror, _timestamp, serve_webhook
+from src.utils.local_clients import LocalJiraSession
+
+
+def _issue(
+    key: str,
+    user_id: str = "user123",
+    status: str = "Open",
+    updated: str = "2025-01-01T10:00:00.000+0000",
+) -> dict:
+    """Create a Jira issue as returned by a search."""
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Issue {key}",
+            "status": {"name": status},
+            "issuetype": {"name": "Task"},
+            "resolution": None,
+            "updated": updated,
+            "customfield_10088": user_id,
+        },
+    }
+
+
+@pytest.fixture
+def mirror(tmp_path: Path) -> TicketMirror:
+    """Create a mirror fetching from a mock."""
+    return TicketMirror(str(tmp_path / "mirror.db"), fetch=Mock())
+
+
+class TestTicketMirror:
+    """Test cases for TicketMirror."""
+
+    def test_incremental_sync_fetches_since_last_sync(
+        self, mirror: TicketMirror
+    ) -> None:
+        """Test that later syncs fetch only updates since the last one."""
+        mirror._fetch.side_effect = [[_issue("GEN-1")], [_issue("GEN-2")]]
+        with patch("src.tools.ticket_mirror.time.time") as now:
+            now.return_value = 1000.0
+            mirror.sync()
+            now.return_value = 1030.0
+            mirror.sync()
+
+        assert mirror._fetch.call_args_list[0].args == (None,)
+        assert mirror._fetch.call_args_list[1].args == (940.0,)
+        assert mirror.stats()["tickets"] == 2
+
+    def test_full_sync_drops_deleted_tickets(
+        self, mirror: TicketMirror
+    ) -> None:
+        """Test that a full sync removes tickets no longer in Jira."""
+        mirror._fetch.side_effect = [
+            [_issue("GEN-1"), _issue("GEN-2")],
+            [_issue("GEN-2")],
+        ]
+        mirror.sync()
+        mirror.sync(full=True)
+
+        assert mirror.user_tickets("user123") == [
+            {"ticket_id": "GEN-2", "summary": "Issue GEN-2"}
+        ]
+
+    def test_full_sync_keeps_webhook_updates(
+        self, mirror: TicketMirror
+    ) -> None:
+        """Test that events applied during a full sync are not undone."""
+        newer = "2025-01-02T10:00:00.000+0000"
+
+        def fetch(since: object) -> list:
+            mirror.apply_event(
+                {
+                    "webhookEvent": "jira:issue_updated",
+                    "issue": _issue("GEN-1", status="Done", updated=newer),
+                }
+            )
+            mirror.apply_event(
+                {
+                    "webhookEvent": "jira:issue_created",
+                    "issue": _issue("GEN-3", updated=newer),
+                }
+            )
+            return [_issue("GEN-1"), _issue("GEN-2")]
+
+        mirror._fetch.side_effect = fetch
+        with patch("src.tools.ticket_mirror.time.time") as now:
+            now.return_value = _timestamp(newer)
+            mirror.sync(full=True)
+
+            assert mirror.ticket("user123", "GEN-1")["status"] == "Done"
+            assert mirror.ticket("user123", "GEN-2") is not None
+            assert mirror.ticket("user123", "GEN-3") is not None
+
+    def test_not_served_when_stale(self, mirror: TicketMirror) -> None:
+        """Test that lookups return None past the staleness bound."""
+        mirror._fetch.return_value = [_issue("GEN-1")]
+        with patch("src.tools.ticket_mirror.time.time") as now:
+            now.return_value = 1000.0
+            mirror.sync()
+            now.return_value = 1100.0
+            fresh = mirror.ticket("user123", "gen-1")
+            now.return_value = 1200.0
+            stale = mirror.ticket("user123", "GEN-1")
+
+        assert fresh["status"] == "Open"
+        assert stale is None
+        assert mirror.stats()["stale"] == 1
+
+    def test_failed_sync_keeps_last_sync(self, mirror: TicketMirror) -> None:
+        """Test that a failed fetch does not make the mirror look fresh."""
+        mirror._fetch.side_effect = RuntimeError("Jira down")
+
+        assert mirror.sync() is False
+        assert not mirror.is_fresh()
+        assert mirror.stats()["sync_failures"] == 1
+
+    def test_tickets_are_per_user(self, mirror: TicketMirror) -> None:
+        """Test that a user cannot look up another user's ticket."""
+        mirror._fetch.return_value = [_issue("GEN-1", user_id="other")]
+        mirror.sync()
+
+        assert mirror.ticket("user123", "GEN-1") is None
+        assert mirror.user_tickets("user123") == []
+
+    def test_webhook_events(self, mirror: TicketMirror) -> None:
+        """Test that webhook events update and delete tickets."""
+        mirror._fetch.return_value = []
+        mirror.sync()
+
+        mirror.apply_event(
+            {"webhookEvent": "jira:issue_updated", "issue": _issue("GEN-1")}
+        )
+        assert mirror.ticket("user123", "GEN-1") is not None
+        mirror.apply_event(
+            {"webhookEvent": "jira:issue_deleted", "issue": _issue("GEN-1")}
+        )
+        assert mirror.ticket("user123", "GEN-1") is None
+
+    def test_older_event_is_ignored(self, mirror: TicketMirror) -> None:
+        """Test that an event older than the mirrored ticket is skipped."""
+        mirror._fetch.return_value = [
+            _issue(
+                "GEN-1", status="Done", updated="2025-01-02T10:00:00.000+0000"
+            )
+        ]
+        mirror.sync()
+
+        changed = mirror.apply_event(
+            {
+                "webhookEvent": "jira:issue_updated",
+                "issue": _issue(
+                    "GEN-1",
+                    user_id="attacker",
+                    updated="2025-01-01T12:00:00.000+0100",
+                ),
+            }
+        )
+
+        assert changed is False
+        assert mirror.ticket("user123", "GEN-1")["status"] == "Done"
+        assert mirror.stats()["webhook_events_ignored"] == 1
+
+
+class TestServeWebhook:
+    """Test cases for serve_webhook."""
+
+    def test_signed_event_is_applied(self, mirror: TicketMirror) -> None:
+        """Test that only events signed with the secret are applied."""
+        mirror._fetch.return_value = []
+        mirror.sync()
+        server = serve_webhook(mirror, 0, host="127.0.0.1", secret="s3cret")
+        url = f"http://127.0.0.1:{server.server_port}/jira/webhook"
+        body = json.dumps(
+            {"webhookEvent": "jira:issue_created", "issue": _issue("GEN-9")}
+        ).encode()
+        signature = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+        try:
+            with pytest.raises(urllib.error.HTTPError) as unsigned:
+                urllib.request.urlopen(urllib.request.Request(url, body))
+            request = urllib.request.Request(
+                url, body, headers={"X-Hub-Signature": f"sha256={signature}"}
+            )
+            with urllib.request.urlopen(request) as response:
+                status = response.status
+        finally:
+            server.shutdown()
+
+        assert unsigned.value.code == 401
+        assert status == 204
+        assert mirror.ticket("user123", "GEN-9") is not None
+
+    def test_requires_secret(self, mirror: TicketMirror) -> None:
+        """Test that the receiver does not start without a secret."""
+        with pytest.raises(ValueError):
+            serve_webhook(mirror, 0, host="127.0.0.1", secret="")
+
+    def test_rejects_oversized_body(self, mirror: TicketMirror) -> None:
+        """Test that a body above the size limit is not read."""
+        server = serve_webhook(mirror, 0, host="127.0.0.1", secret="s3cret")
+        url = f"http://127.0.0.1:{server.server_port}/jira/webhook"
+        request = urllib.request.Request(
+            url, b"{}", headers={"Content-Length": str(10 * 1024 * 1024)}
+        )
+        try:
+            with pytest.raises(urllib.error.HTTPError) as rejected:
+                urllib.request.urlopen(request)
+        finally:
+            server.shutdown()
+
+        assert rejected.value.code == 413
+
+
+class TestTicketMirrorSetup:
+    """Test cases for opening the mirror from the config."""
+
+    def test_webhook_bind_failure_keeps_mirror(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a port already in use opens the mirror only once."""
+        monkeypatch.setenv("TICKET_MIRROR_PATH", str(tmp_path / "mirror.db"))
+        monkeypatch.setenv("TICKET_WEBHOOK_PORT", "8085")
+        monkeypatch.setenv("TICKET_WEBHOOK_SECRET", "s3cret")
+        ticket.get_config.cache_clear()
+        monkeypatch.setattr(ticket, "_mirror", None)
+
+        with patch.object(TicketMirror, "start") as start, patch(
+            "src.tools.ticket.serve_webhook", side_effect=OSError("in use")
+        ) as serve:
+            mirrors = {id(ticket.ticket_mirror()) for _ in range(3)}
+
+        assert len(mirrors) == 1
+        assert start.call_count == 1
+        assert serve.call_count == 1
+
+    def test_no_webhook_without_secret(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the receiver is not started without a secret."""
+        monkeypatch.setenv("TICKET_MIRROR_PATH", str(tmp_path / "mirror.db"))
+        monkeypatch.setenv("TICKET_WEBHOOK_PORT", "8085")
+        ticket.get_config.cache_clear()
+        monkeypatch.setattr(ticket, "_mirror", None)
+
+        with patch.object(TicketMirror, "start"), patch(
+            "src.tools.ticket.serve_webhook"
+        ) as serve:
+            assert ticket.ticket_mirror() is not None
+
+        serve.assert_not_called()
+
+    def test_workers_share_the_webhook_port(
+        self, mirror: TicketMirror
+    ) -> None:
+        """Test that a second receiver can bind the same port."""
+        first = serve_webhook(mirror, 0, host="127.0.0.1", secret="s")
+        try:
+            second = serve_webhook(
+                mirror, first.server_port, host="127.0.0.1", secret="s"
+            )
+            second.shutdown()
+        finally:
+            first.shutdown()
+
+
+class TestMirrorMode:
+    """Test cases for the ticket tools serving from the mirror."""
+
+    @pytest.fixture
+    def jira(self) -> LocalJiraSession:
+        """Replace the Jira session with an in-memory one."""
+        session = LocalJiraSession()
+        with patch("src.tools.ticket._http", return_value=session):
+            yield session
+
+    @pytest.fixture
+    def tool_mirror(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        jira: LocalJiraSession,
+    ) -> TicketMirror:
+        """Enable the mirror; it syncs only when `sync` is called."""
+        path = str(tmp_path / "mirror.db")
+        monkeypatch.setenv("TICKET_MIRROR_PATH", path)
+        ticket.get_config.cache_clear()
+        mirror = TicketMirror(path, fetch=ticket._fetch_project_issues)
+        monkeypatch.setattr(ticket, "_mirror", mirror)
+        return mirror
+
+    def test_lookups_served_without_jira(
+        self, tool_mirror: TicketMirror, jira: LocalJiraSession
+    ) -> None:
+        """Test that fresh lookups do not search Jira."""
+        create_jira_ticket("user123", "Late settlement", "Unpaid", "Task")
+        tool_mirror.sync()
+        calls = jira.api_calls
+
+        tickets = get_user_tickets("user123")["tickets"]
+        found = get_ticket_by_key("user123", "GEN-1")["ticket"]
+
+        assert tickets == [{"ticket_id": "GEN-1", "summary": "Late settlement"}]
+        assert found["status"] == "Open"
+        assert jira.api_calls == calls
+
+    def test_falls_back_to_jira_when_stale(
+        self, tool_mirror: TicketMirror, jira: LocalJiraSession
+    ) -> None:
+        """Test that Jira is searched until the mirror has synced."""
+        create_jira_ticket("user123", "Late settlement", "Unpaid", "Task")
+        calls = jira.api_calls
+
+        result = get_ticket_by_key("user123", "GEN-1")
+
+        assert result["ticket"]["ticket_id"] == "GEN-1"
+        assert jira.api_calls == calls + 1
@@ -0,0 +1,193 @@
+"""Unit tests for the ticket outbox."""
+
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.tools import ticket
+from src.tools.ticket import (
+    create_jira_ticket,
+    get_ticket_by_key,
+    get_user_tickets,
+)
+from src.tools.ticket_outbox import TicketOutbox, is_local_reference
+from src.utils.local_clients import LocalJiraSession
+
+COMPLAINT = ("user123", "Late settlement", "Not paid since Monday", "Task")
+
+
+@pytest.fixture
+def jira() -> LocalJiraSession:
+    """Replace the Jira session with an in-memory one."""
+    session = LocalJiraSession()
+    with patch("src.tools.ticket._http", return_value=session):
+        yield session
+
+
+@pytest.fixture
+def outbox(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jira: LocalJiraSession
+) -> TicketOutbox:
+    """Enable outbox mode; entries are sent by calling `send_due`."""
+    path = str(tmp_path / "outbox.db")
+    monkeypatch.setenv("TICKET_OUTBOX_PATH", path)
+    ticket.get_config.cache_clear()
+    outbox = TicketOutbox(
+        path,
+        submit=ticket._post_ticket,
+        find=ticket._find_queued_ticket,
+        base_backoff_seconds=0,
+    )
+    monkeypatch.setattr(ticket, "_outbox", outbox)
+    return outbox
+
+
+def _outbox(tmp_path: Path, submit: Mock, **kwargs) -> TicketOutbox:
+    """Create an outbox whose Jira has no ticket for any reference."""
+    return TicketOutbox(
+        str(tmp_path / "outbox.db"),
+        submit=submit,
+        find=kwargs.pop("find", Mock(return_value=None)),
+        **kwargs,
+    )
+
+
+class TestTicketOutbox:
+    """Test cases for TicketOutbox."""
+
+    def test_retries_until_filed(self, tmp_path: Path) -> None:
+        """Test that failures are retried and the Jira key recorded."""
+        submit = Mock(
+            side_effect=[
+                {"error": "Network error", "status_code": 500},
+                {"key": "GEN-7", "status_code": 201},
+            ]
+        )
+        outbox = _outbox(tmp_path, submit, base_backoff_seconds=0)
+        reference = outbox.enqueue(*COMPLAINT)
+
+        assert outbox.send_due() == 0
+        assert outbox.send_due() == 1
+        entry = outbox.resolve(reference)
+        assert entry["jira_key"] == "GEN-7"
+        assert entry["attempts"] == 2
+        assert outbox.stats() == {
+            "pending": 0,
+            "submitted": 1,
+            "failed": 0,
+            "retries": 1,
+        }
+
+    def test_backoff_defers_retry(self, tmp_path: Path) -> None:
+        """Test that a failed entry is not retried before its backoff."""
+        submit = Mock(return_value={"error": "Down", "status_code": 503})
+        outbox = _outbox(tmp_path, submit)
+        outbox.enqueue(*COMPLAINT)
+
+        outbox.send_due()
+        outbox.send_due()
+
+        assert submit.call_count == 1
+
+    def test_rejected_entry_is_not_retried(self, tmp_path: Path) -> None:
+        """Test that an entry Jira rejects as invalid is marked failed."""
+        submit = Mock(return_value={"error": "Bad", "status_code": 400})
+        outbox = _outbox(tmp_path, submit, base_backoff_seconds=0)
+        reference = outbox.enqueue(*COMPLAINT)
+
+        outbox.send_due()
+        outbox.send_due()
+
+        assert submit.call_count == 1
+        assert outbox.resolve(reference)["state"] == "failed"
+
+    def test_workers_lease_each_entry_once(self, tmp_path: Path) -> None:
+        """Test that two workers sharing the file never send one entry."""
+        workers = [_outbox(tmp_path, Mock()) for _ in range(2)]
+        references = {workers[0].enqueue(*COMPLAINT) for _ in range(2)}
+
+        due_by = time.time() + 1
+        leased = [worker._lease_next(due_by) for worker in workers]
+
+        assert {entry["reference"] for entry in leased} == references
+        assert [entry["attempts"] for entry in leased] == [1, 1]
+        assert workers[1]._lease_next(due_by) is None
+
+    def test_entries_survive_reopening(self, tmp_path: Path) -> None:
+        """Test that queued complaints are sent after a restart."""
+        reference = _outbox(tmp_path, Mock()).enqueue(*COMPLAINT)
+        submit = Mock(return_value={"key": "GEN-1", "status_code": 201})
+
+        assert _outbox(tmp_path, submit).send_due() == 1
+        assert submit.call_args.kwargs["summary"] == "Late settlement"
+        assert submit.call_args.kwargs["reference"] == reference
+        assert is_local_reference(reference.lower())
+
+    def test_unknown_outcome_is_not_filed_twice(
+        self, outbox: TicketOutbox, jira: LocalJiraSession
+    ) -> None:
+        """Test that a retry finds the ticket an unanswered attempt filed."""
+
+        def post_then_time_out(**kwargs) -> dict:
+            ticket._post_ticket(**kwargs)
+            return dict(ticket.TIMED_OUT)
+
+        outbox._submit = post_then_time_out
+        reference = outbox.enqueue(*COMPLAINT)
+        outbox.send_due()
+        outbox._submit = Mock()
+        outbox.send_due()
+
+        outbox._submit.assert_not_called()
+        assert outbox.resolve(reference)["jira_key"] == "GEN-1"
+        assert len(jira.issues) == 1
+        assert jira.issues[0]["fields"]["labels"] == [reference]
+
+
+class TestOutboxMode:
+    """Test cases for the ticket tools in outbox mode."""
+
+    def test_create_returns_reference_without_calling_jira(
+        self, outbox: TicketOutbox, jira: LocalJiraSession
+    ) -> None:
+        """Test that creation is queued and answered at once."""
+        result = create_jira_ticket(*COMPLAINT)
+
+        assert result["status_code"] == 202
+        assert is_local_reference(result["key"])
+        assert jira.api_calls == 0
+
+    def test_queued_ticket_resolves(
+        self, outbox: TicketOutbox, jira: LocalJiraSession
+    ) -> None:
+        """Test that a reference resolves before and after filing."""
+        jira.fail = True
+        reference = create_jira_ticket(*COMPLAINT)["key"]
+        outbox.send_due()
+
+        queued = get_ticket_by_key("user123", reference)
+        assert queued["ticket"]["status"] == "Queued"
+        assert get_ticket_by_key("other", reference)["status_code"] == 404
+
+        jira.fail = False
+        outbox.send_due()
+        filed = get_ticket_by_key("user123", reference)
+
+        assert filed["ticket"]["ticket_id"] == "GEN-1"
+        assert filed["ticket"]["reference"] == reference
+        assert filed["ticket"]["status"] == "Open"
+        assert get_ticket_by_key("user123", "GEN-1")["status_code"] == 200
+
+    def test_user_tickets_include_queued(
+        self, outbox: TicketOutbox, jira: LocalJiraSession
+    ) -> None:
+        """Test that queued complaints are listed with filed tickets."""
+        reference = create_jira_ticket(*COMPLAINT)["key"]
+        ids = [t["ticket_id"] for t in get_user_tickets("user123")["tickets"]]
+        assert ids == [reference]
+
+        outbox.send_due()
+        ids = [t["ticket_id"] for t in get_user_tickets("user123")["tickets"]]
+        assert ids == ["GEN-1"]
@@ -0,0 +1,99 @@
+"""Unit tests for token-budget context compaction."""
+
+from google.genai import types
+
+from src.plugins.token_budget_compaction import (
+    TokenBudgetCompactionPlugin,
+    estimate_tokens,
+)
+
+
+def _turn(question: str, rag_result: str) -> list[types.Content]:
+    """Build one knowledge-base turn with a tool call and response."""
+    return [
+        types.Content(role="user", parts=[types.Part(text=question)]),
+        types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="query_knowledge_base", args={"query": question}
+                    )
+                )
+            ],
+        ),
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(
+                    function_response=types.FunctionResponse(
+                        name="query_knowledge_base",
+                        response={"result": rag_result},
+                    )
+                )
+            ],
+        ),
+        types.Content(role="model", parts=[types.Part(text="Here you go.")]),
+    ]
+
+
+class TestTokenBudgetCompactionPlugin:
+    """Test cases for TokenBudgetCompactionPlugin."""
+
+    def test_small_history_is_kept(self) -> None:
+        """Test that contents under budget are returned unchanged."""
+        plugin = TokenBudgetCompactionPlugin(max_tokens=10_000)
+        contents = _turn("pricing?", "short") + _turn("fees?", "short")
+
+        assert plugin.compact(contents) == contents
+
+    def test_large_tool_responses_are_compacted_first(self) -> None:
+        """Test that old RAG results are replaced by a preview."""
+        plugin = TokenBudgetCompactionPlugin(
+            max_tokens=1_000, tool_response_tokens=50, keep_recent_turns=1
+        )
+        contents = _turn("pricing?", "x" * 8_000) + _turn("fees?", "y" * 400)
+
+        compacted = plugin.compact(contents)
+
+        assert len(compacted) == len(contents)
+        old_response = compacted[2].parts[0].function_response.response
+        assert old_response["compacted"] is True
+        assert compacted[6] is contents[6]
+        assert sum(map(estimate_tokens, compacted)) <= 1_000
+
+    def test_oldest_turns_are_dropped_when_still_over_budget(self) -> None:
+        """Test that whole turns are dropped, keeping the recent ones."""
+        plugin = TokenBudgetCompactionPlugin(
+            max_tokens=50, tool_response_tokens=50, keep_recent_turns=1
+        )
+        contents = (
+            _turn("a " * 200, "x")
+            + _turn("b " * 200, "y")
+            + _turn("latest question", "z")
+        )
+
+        compacted = plugin.compact(contents)
+
+        assert compacted == contents[8:]
+        assert compacted[0].parts[0].text == "latest question"
+
+    def test_other_agents_turns_do_not_start_a_turn(self) -> None:
+        """Test that "For context:" user content stays with its turn."""
+        plugin = TokenBudgetCompactionPlugin(
+            max_tokens=50, tool_response_tokens=50, keep_recent_turns=1
+        )
+        context = types.Content(
+            role="user",
+            parts=[
+                types.Part(text="For context:"),
+                types.Part(text="[supervisor_agent] said: Transferring."),
+            ],
+        )
+        contents = _turn("a " * 200, "x") + _turn("latest question", "z")
+        contents.insert(5, context)
+
+        compacted = plugin.compact(contents)
+
+        assert compacted == contents[4:]
+        assert compacted[0].parts[0].text == "latest question"
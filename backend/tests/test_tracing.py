@@ -0,0 +1,266 @@
+"""Unit tests for the Cloud Logging span exporter."""
+
+import gzip
+import hashlib
+import json
+import time
+from typing import Callable
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, SpanLimits, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from src.utils.local_clients import LocalLoggingClient, LocalStorageClient
+from src.utils.tracing import (
+    PREVIEW_CHARS,
+    CloudTraceLoggingSpanExporter,
+    estimate_span_bytes,
+    span_to_dict,
+)
+
+SpanFactory = Callable[..., list[ReadableSpan]]
+
+
+def _finished_span(attributes: dict) -> ReadableSpan:
+    """Record one span with the given attributes."""
+    memory = InMemorySpanExporter()
+    limits = SpanLimits(max_span_attributes=len(attributes))
+    provider = TracerProvider(span_limits=limits)
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    with provider.get_tracer("test").start_as_current_span("span") as span:
+        span.set_attributes(attributes)
+    return memory.get_finished_spans()[0]
+
+
+def _exporter(
+    logging_client: LocalLoggingClient, **kwargs: int
+) -> CloudTraceLoggingSpanExporter:
+    """Build an exporter backed by local clients."""
+    return CloudTraceLoggingSpanExporter(
+        project_id="test-project",
+        logging_client=logging_client,
+        storage_client=LocalStorageClient(),
+        **kwargs,
+    )
+
+
+class TestCloudTraceLoggingSpanExporter:
+    """Test cases for CloudTraceLoggingSpanExporter."""
+
+    def test_export_writes_one_batch(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that one export call is written with one API request."""
+        client = LocalLoggingClient()
+        spans = make_turn_spans(turns=2, spans_per_turn=10, prompt_chars=100)
+
+        result = _exporter(client).export(spans)
+
+        assert result == SpanExportResult.SUCCESS
+        assert client.api_calls == 1
+        assert len(client.entries) == 20
+        entry = client.entries[0]
+        assert entry["jsonPayload"]["trace"].startswith(
+            "projects/test-project/traces/"
+        )
+        assert entry["labels"]["type"] == "agent_telemetry"
+
+    def test_export_respects_batch_limits(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that batches are split by entry count and size."""
+        spans = make_turn_spans(turns=1, spans_per_turn=10, prompt_chars=1000)
+
+        by_entries = LocalLoggingClient()
+        _exporter(by_entries, max_batch_entries=4).export(spans)
+        by_bytes = LocalLoggingClient()
+        _exporter(by_bytes, max_batch_bytes=1).export(spans)
+
+        assert by_entries.api_calls == 3
+        assert by_bytes.api_calls == 10
+        assert len(by_bytes.entries) == 10
+
+    def test_largest_attributes_are_offloaded(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that only the largest attributes are gzipped to GCS."""
+        client = LocalLoggingClient()
+        storage_client = LocalStorageClient()
+        exporter = CloudTraceLoggingSpanExporter(
+            project_id="test-project",
+            logging_client=client,
+            storage_client=storage_client,
+        )
+        spans = make_turn_spans(turns=1, spans_per_turn=2, prompt_chars=300_000)
+
+        exporter.export(spans)
+        assert exporter.force_flush()
+
+        attributes = client.entries[0]["jsonPayload"]["attributes"]
+        uri = attributes["uri_payload"]
+        assert uri.startswith("gs://test-project-agent-logs-data/spans/")
+        assert len(json.dumps(attributes)) < 10 * 1024
+        assert attributes["gen_ai.request.model"] == "gemini-2.5-flash"
+
+        prompt = attributes["gcp.vertex.agent.llm_request"]
+        assert prompt["preview"] == "p" * PREVIEW_CHARS
+        assert prompt["size_bytes"] == 300_000
+        assert prompt["sha256"] == hashlib.sha256(b"p" * 300_000).hexdigest()
+
+        blob = storage_client.blobs[uri.removeprefix("gs://")]
+        stored = json.loads(gzip.decompress(blob))
+        assert set(stored) == {
+            "gcp.vertex.agent.llm_request",
+            "gcp.vertex.agent.llm_response",
+        }
+        metrics = exporter.upload_metrics()
+        assert metrics["bytes_uploaded"] < metrics["bytes_raw"] / 100
+        assert "uri_payload" not in client.entries[1]["jsonPayload"][
+            "attributes"
+        ]
+
+    def test_uploads_do_not_block_export(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that spans are logged before their payloads are uploaded."""
+        client = LocalLoggingClient()
+        storage_client = LocalStorageClient(latency=0.2)
+        exporter = CloudTraceLoggingSpanExporter(
+            project_id="test-project",
+            logging_client=client,
+            storage_client=storage_client,
+        )
+        spans = make_turn_spans(turns=3, spans_per_turn=2, prompt_chars=300_000)
+
+        started = time.monotonic()
+        exporter.export(spans)
+        elapsed = time.monotonic() - started
+
+        # The bucket check is the only request made by the export thread
+        assert elapsed < 0.35
+        assert len(client.entries) == 6
+        assert storage_client.blobs == {}
+        assert exporter.force_flush()
+        assert len(storage_client.blobs) == 3
+        assert storage_client.api_calls == 4
+
+        metrics = exporter.upload_metrics()
+        assert metrics["uploads"] == 3
+        assert metrics["pending"] == 0
+        assert metrics["latency_seconds_max"] >= 0.2
+
+    def test_upload_failures_are_counted(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that failed uploads are recorded without failing export."""
+        client = LocalLoggingClient()
+        exporter = CloudTraceLoggingSpanExporter(
+            project_id="test-project",
+            logging_client=client,
+            storage_client=LocalStorageClient(fail=True),
+            max_pending_uploads=1,
+        )
+        spans = make_turn_spans(turns=2, spans_per_turn=2, prompt_chars=300_000)
+
+        result = exporter.export(spans)
+        exporter.shutdown()
+
+        assert result == SpanExportResult.SUCCESS
+        metrics = exporter.upload_metrics()
+        assert metrics["failures"] == 2
+        assert metrics["uploads"] == 0
+
+    def test_missing_bucket_is_checked_once(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that a missing bucket is cached and payloads stay inline."""
+        client = LocalLoggingClient()
+        storage_client = LocalStorageClient(bucket_exists=False)
+        exporter = CloudTraceLoggingSpanExporter(
+            project_id="test-project",
+            logging_client=client,
+            storage_client=storage_client,
+        )
+        spans = make_turn_spans(turns=3, spans_per_turn=2, prompt_chars=300_000)
+
+        exporter.export(spans)
+        exporter.export(spans)
+
+        assert storage_client.api_calls == 1
+        attributes = client.entries[0]["jsonPayload"]["attributes"]
+        assert "uri_payload" not in attributes
+        assert "url_payload" not in attributes
+        assert attributes["gcp.vertex.agent.llm_request"] == "p" * 300_000
+
+    def test_small_attributes_are_not_uploaded(self) -> None:
+        """Test that no blob is written when no attribute is worth moving."""
+        client = LocalLoggingClient()
+        storage_client = LocalStorageClient()
+        exporter = CloudTraceLoggingSpanExporter(
+            project_id="test-project",
+            logging_client=client,
+            storage_client=storage_client,
+        )
+        span = _finished_span({f"tag.{i}": "t" * 1000 for i in range(300)})
+
+        exporter.export([span])
+        assert exporter.force_flush()
+
+        assert storage_client.blobs == {}
+        assert exporter.upload_metrics()["uploads"] == 0
+        attributes = client.entries[0]["jsonPayload"]["attributes"]
+        assert "uri_payload" not in attributes
+        assert attributes["tag.0"] == "t" * 1000
+
+    def test_failed_batch_is_reported_once(
+        self, make_turn_spans: SpanFactory
+    ) -> None:
+        """Test that a failed write fails the export as a unit."""
+        client = LocalLoggingClient(fail=True)
+        spans = make_turn_spans(turns=1, spans_per_turn=5, prompt_chars=100)
+
+        result = _exporter(client).export(spans)
+
+        assert result == SpanExportResult.FAILURE
+        assert client.api_calls == 1
+
+
+class TestSpanToDict:
+    """Test cases for span_to_dict."""
+
+    def test_matches_to_json(self) -> None:
+        """Test that the dict matches the SDK's JSON for every field."""
+        memory = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(memory))
+        tracer = provider.get_tracer("test")
+        with tracer.start_as_current_span("root") as root:
+            link = trace.Link(root.get_span_context(), {"reason": "retry"})
+            with tracer.start_as_current_span("child", links=[link]) as span:
+                span.set_attributes(
+                    {
+                        "text": "ආයුබෝවන්",
+                        "count": 3,
+                        "ratio": 0.5,
+                        "flag": True,
+                        "tags": ("a", "b"),
+                    }
+                )
+                span.add_event("retry", {"attempt": 1})
+                span.set_status(trace.Status(trace.StatusCode.ERROR, "boom"))
+
+        for span in memory.get_finished_spans():
+            span_dict, attributes_bytes, size = span_to_dict(span)
+            assert json.loads(json.dumps(span_dict)) == json.loads(
+                span.to_json()
+            )
+            serialized = json.dumps(span_dict, ensure_ascii=False).encode()
+            attributes = json.dumps(
+                span_dict["attributes"], ensure_ascii=False
+            ).encode()
+            assert attributes_bytes >= len(attributes) * 0.9
+            assert size >= len(serialized) * 0.9
+            assert estimate_span_bytes(span) == size
@@ -0,0 +1,147 @@
+"""Unit tests for the per-turn deadline."""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.plugins.turn_deadline import DEADLINE_MESSAGES, TurnDeadlinePlugin
+from src.tools import deadline
+from src.tools.config import get_config
+from src.tools.rag_engine import _query_corpus
+from src.tools.ticket import get_user_tickets
+
+
+@pytest.fixture(autouse=True)
+def clear_deadline():
+    """Leave no deadline bound after a test."""
+    yield
+    deadline.set_deadline(None)
+
+
+class TestCallTimeout:
+    """Test cases for call_timeout."""
+
+    def test_default_without_deadline(self) -> None:
+        """Test that calls outside a turn use their default timeout."""
+        assert deadline.call_timeout(10) == 10
+
+    def test_shrinks_to_remaining_time(self) -> None:
+        """Test that the timeout shrinks to the time left."""
+        deadline.set_deadline(time.monotonic() + 2)
+        assert 1.5 < deadline.call_timeout(10) <= 2
+
+    def test_raises_when_expired(self) -> None:
+        """Test that no call starts once the deadline has passed."""
+        deadline.set_deadline(time.monotonic() - 1)
+        with pytest.raises(deadline.DeadlineExceeded):
+            deadline.call_timeout(10)
+
+
+class TestToolDeadlines:
+    """Test cases for tools reading the deadline."""
+
+    @patch("src.tools.ticket.requests.Session.get")
+    def test_jira_timeout_shrinks(self, mock_get: Mock) -> None:
+        """Test that Jira requests get the time left as their timeout."""
+        mock_get.return_value = Mock(status_code=200)
+        mock_get.return_value.json.return_value = {"issues": []}
+        deadline.set_deadline(time.monotonic() + 3)
+
+        get_user_tickets("user123")
+
+        assert mock_get.call_args.kwargs["timeout"] <= 3
+
+    @patch("src.tools.ticket.requests.Session.get")
+    def test_jira_skipped_after_deadline(self, mock_get: Mock) -> None:
+        """Test that no Jira request is made after the deadline."""
+        deadline.set_deadline(time.monotonic() - 1)
+
+        result = get_user_tickets("user123")
+
+        assert result["status_code"] == 504
+        mock_get.assert_not_called()
+
+    def test_rag_query_abandoned_at_deadline(self, monkeypatch) -> None:
+        """Test that a slow corpus query is abandoned at the deadline."""
+        monkeypatch.setenv("PROJECT", "test-project")
+        monkeypatch.setenv("CORPUS_ID", "123")
+        get_config.cache_clear()
+        deadline.set_deadline(time.monotonic() + 0.2)
+        started = time.monotonic()
+
+        with patch(
+            "vertexai.preview.rag.retrieval_query",
+            side_effect=lambda **kw: time.sleep(1),
+        ), patch("src.tools.rag_engine._init_vertexai"):
+            result = _query_corpus("fees", get_config())
+
+        assert result["message"] == "Knowledge base query timeout"
+        assert time.monotonic() - started < 0.9
+
+
+class TestTurnDeadlinePlugin:
+    """Test cases for TurnDeadlinePlugin."""
+
+    def test_expired_turn_ends_with_localized_apology(self) -> None:
+        """Test that a turn past its deadline ends with an apology."""
+        plugin = TurnDeadlinePlugin(deadline_seconds=-1, set_deadline=Mock())
+        context = Mock(invocation_id="inv", state={"language": "sinhala"})
+
+        async def run():
+            await plugin.before_run_callback(invocation_context=context)
+            response = await plugin.before_model_callback(
+                callback_context=context, llm_request=Mock()
+            )
+            tool_result = await plugin.before_tool_callback(
+                tool=Mock(), tool_args={}, tool_context=context
+            )
+            await plugin.after_run_callback(invocation_context=context)
+            return response, tool_result
+
+        response, tool_result = asyncio.run(run())
+        stats = plugin.stats()
+
+        assert response.content.parts[0].text == DEADLINE_MESSAGES["sinhala"]
+        assert tool_result["status"] == "error"
+        assert stats["expired"] == 1
+        assert stats["abandoned_model_calls"] == 1
+        assert stats["abandoned_tool_calls"] == 1
+        assert stats["overrun_seconds_max"] >= 1
+        assert plugin._deadlines == {}
+
+    def test_model_timeout_shrinks(self) -> None:
+        """Test that model requests get an HTTP timeout of the time left."""
+        bound = []
+        plugin = TurnDeadlinePlugin(
+            deadline_seconds=5, set_deadline=bound.append
+        )
+        context = Mock(invocation_id="inv")
+        request = Mock(config=None)
+
+        async def run():
+            await plugin.before_run_callback(invocation_context=context)
+            await plugin.before_model_callback(
+                callback_context=context, llm_request=request
+            )
+
+        asyncio.run(run())
+
+        assert 4000 < request.config.http_options.timeout <= 5000
+        assert bound[0] == bound[1]
+
+    def test_unfinished_turns_are_evicted(self) -> None:
+        """Test that runs that never finish do not grow the deadlines."""
+        plugin = TurnDeadlinePlugin(deadline_seconds=5, set_deadline=Mock())
+
+        async def run():
+            for i in range(5):
+                await plugin.before_run_callback(
+                    invocation_context=Mock(invocation_id=f"inv-{i}")
+                )
+
+        with patch("src.plugins.turn_deadline.MAX_TRACKED_TURNS", 3):
+            asyncio.run(run())
+
+        assert list(plugin._deadlines) == ["inv-2", "inv-3", "inv-4"]
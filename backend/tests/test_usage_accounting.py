@@ -0,0 +1,149 @@
+"""Unit tests for per-agent usage accounting."""
+
+import asyncio
+import json
+import logging
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from src.plugins.usage_accounting import UsageAccountingPlugin
+
+
+def _callback_context(
+    agent_name: str, invocation_id: str = "inv-1"
+) -> SimpleNamespace:
+    """Build a minimal callback context for an agent."""
+    return SimpleNamespace(invocation_id=invocation_id, agent_name=agent_name)
+
+
+def _invocation_context(invocation_id: str = "inv-1") -> SimpleNamespace:
+    """Build a minimal invocation context for a Sinhala session."""
+    return SimpleNamespace(
+        invocation_id=invocation_id,
+        session=SimpleNamespace(state={"language": "sinhala"}),
+    )
+
+
+async def _model_call(
+    plugin: UsageAccountingPlugin,
+    agent_name: str,
+    invocation_id: str = "inv-1",
+) -> None:
+    """Simulate one non-streaming model call."""
+    context = _callback_context(agent_name, invocation_id)
+    await plugin.before_model_callback(
+        callback_context=context,
+        llm_request=LlmRequest(model="gemini-2.5-flash"),
+    )
+    await plugin.after_model_callback(
+        callback_context=context,
+        llm_response=LlmResponse(
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=1200,
+                candidates_token_count=80,
+                cached_content_token_count=1000,
+            )
+        ),
+    )
+
+
+class TestUsageAccountingPlugin:
+    """Test cases for UsageAccountingPlugin."""
+
+    def test_groups_by_agent_language_and_intent(self) -> None:
+        """Test that supervisor usage is attributed to the routed intent."""
+        plugin = UsageAccountingPlugin(log_interval_seconds=0)
+        tool_context = SimpleNamespace(
+            invocation_id="inv-1",
+            function_call_id="call-1",
+            agent_name="status_check_agent",
+        )
+        tool = SimpleNamespace(name="get_ticket_by_key")
+        invocation_context = _invocation_context()
+
+        async def run() -> None:
+            await _model_call(plugin, "supervisor_agent")
+            await _model_call(plugin, "status_check_agent")
+            await plugin.before_tool_callback(
+                tool=tool, tool_args={}, tool_context=tool_context
+            )
+            await plugin.after_tool_callback(
+                tool=tool,
+                tool_args={},
+                tool_context=tool_context,
+                result={"error": "not found", "status_code": 404},
+            )
+            await plugin.after_run_callback(
+                invocation_context=invocation_context
+            )
+
+        asyncio.run(run())
+        groups = {g["agent"]: g for g in plugin.snapshot()}
+
+        supervisor = groups["supervisor_agent"]
+        assert supervisor["intent"] == "check_status"
+        assert supervisor["language"] == "sinhala"
+        assert supervisor["input_tokens"] == 1200
+        assert supervisor["cached_tokens"] == 1000
+        assert supervisor["models"] == {"gemini-2.5-flash": 1}
+
+        status = groups["status_check_agent"]
+        assert status["model_calls"] == 1
+        assert status["tool_calls"] == 1
+        assert status["errors"] == 1
+        assert status["tools"] == {"get_ticket_by_key": 1}
+
+    def test_unfinished_runs_are_evicted(self) -> None:
+        """Test that runs that never finish do not grow the buffers."""
+        plugin = UsageAccountingPlugin()
+
+        async def run() -> None:
+            for i in range(5):
+                context = _callback_context("supervisor_agent", f"inv-{i}")
+                await _model_call(plugin, "supervisor_agent", f"inv-{i}")
+                await plugin.before_model_callback(
+                    callback_context=context,
+                    llm_request=LlmRequest(model="gemini-2.5-flash"),
+                )
+
+        with (
+            patch("src.plugins.usage_accounting.MAX_TRACKED_RUNS", 3),
+            patch("src.plugins.usage_accounting.MAX_TRACKED_CALLS", 2),
+        ):
+            asyncio.run(run())
+
+        assert list(plugin._records) == ["inv-2", "inv-3", "inv-4"]
+        assert [key[0] for key in plugin._started] == ["inv-3", "inv-4"]
+
+    def test_usage_is_logged_on_a_timer(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that usage is logged by the thread, not at the run's end."""
+        plugin = UsageAccountingPlugin(log_interval_seconds=0.2)
+        invocation_context = _invocation_context()
+
+        async def run() -> None:
+            await plugin.before_run_callback(
+                invocation_context=invocation_context
+            )
+            await _model_call(plugin, "supervisor_agent")
+            await plugin.after_run_callback(
+                invocation_context=invocation_context
+            )
+
+        with caplog.at_level(logging.INFO, "src.plugins.usage_accounting"):
+            asyncio.run(run())
+            assert not caplog.records
+            time.sleep(0.5)
+            plugin.close()
+
+        # Logged once: later intervals without new runs are skipped
+        assert len(caplog.records) == 1
+        usage = json.loads(caplog.records[0].getMessage())
+        assert usage["groups"][0]["agent"] == "supervisor_agent"
@@ -0,0 +1,92 @@
+"""Unit tests for the warm-up steps."""
+
+import threading
+import time
+
+from src.prompts import render
+from src.prompts.knowledge_base_prompt import KNOWLEDGE_BASE_PROMPT
+from src.prompts.render import prerender_prompts, render_prompt
+from src.prompts.status_check_prompt import STATUS_CHECK_PROMPT
+from src.utils.warmup import WarmUp
+
+
+class TestWarmUp:
+    """Test cases for WarmUp."""
+
+    def test_records_each_step(self) -> None:
+        """Test that steps run in order and their durations are reported."""
+        calls = []
+        warm_up = WarmUp()
+        warm_up.add_step("first", lambda: calls.append("first") or 1)
+        warm_up.add_step("second", lambda: calls.append("second") or 2)
+
+        assert warm_up.run(budget_seconds=5)
+
+        report = warm_up.report()
+        assert calls == ["first", "second"]
+        assert [s["status"] for s in report["steps"]] == ["ok", "ok"]
+        assert report["steps"][1]["result"] == 2
+        assert all(s["seconds"] >= 0 for s in report["steps"])
+        assert report["total_seconds"] is not None
+
+    def test_failed_step_does_not_stop_others(self) -> None:
+        """Test that a failing step is reported and the rest still run."""
+
+        def fail() -> None:
+            raise ConnectionError("jira down")
+
+        warm_up = WarmUp()
+        warm_up.add_step("jira_connection", fail)
+        warm_up.add_step("prompts", lambda: 3)
+
+        assert warm_up.run(budget_seconds=5)
+
+        steps = warm_up.report()["steps"]
+        assert steps[0]["status"] == "failed"
+        assert "jira down" in steps[0]["result"]
+        assert steps[1]["status"] == "ok"
+
+    def test_budget_limits_readiness(self) -> None:
+        """Test that run returns at the budget and later steps are skipped."""
+        release = threading.Event()
+        warm_up = WarmUp()
+        warm_up.add_step("slow", lambda: release.wait(5))
+        warm_up.add_step("after", lambda: None)
+
+        started = time.perf_counter()
+        assert not warm_up.run(budget_seconds=0.1)
+        assert time.perf_counter() - started < 1
+
+        release.set()
+        time.sleep(0.05)
+        steps = warm_up.report()["steps"]
+        assert steps[1]["status"] == "skipped"
+
+
+class TestPromptRendering:
+    """Test cases for cached prompt rendering."""
+
+    def test_prerendered_prompts_are_reused(self) -> None:
+        """Test that pre-rendered prompts are served from the cache."""
+        render._render_language.cache_clear()
+
+        assert prerender_prompts([KNOWLEDGE_BASE_PROMPT]) == 3
+        rendered = render_prompt(KNOWLEDGE_BASE_PROMPT, "sinhala")
+
+        assert render._render_language.cache_info().hits == 1
+        assert rendered == KNOWLEDGE_BASE_PROMPT.format(language="sinhala")
+
+    def test_user_prompts_share_one_rendering(self) -> None:
+        """Test that the cache holds one rendering for all users."""
+        render._render_language.cache_clear()
+
+        first = render_prompt(STATUS_CHECK_PROMPT, "tamil", "user-1")
+        second = render_prompt(STATUS_CHECK_PROMPT, "tamil", "user-2")
+
+        assert render._render_language.cache_info().currsize == 1
+        assert first == STATUS_CHECK_PROMPT.format(
+            language="tamil", user_id="user-1"
+        )
+        assert second == STATUS_CHECK_PROMPT.format(
+            language="tamil", user_id="user-2"
+        )